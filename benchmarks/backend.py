@@ -0,0 +1,220 @@
+"""Fake Twitch GQL, usher playlist, QuadStream, and webhook server for benchmarks."""
+
+import asyncio
+import json
+import math
+import random
+import re
+import socket
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Any
+
+from aiohttp import web
+
+CATEGORIES = ["Just Chatting", "Music", "Chess", "Speedrunning", "Art", "Science & Technology"]
+
+# alias index in queries built by TwitchGQLFetcher._query_batch
+ALIAS_PATTERN = re.compile(r"\bc(\d+): ")
+
+MASTER_PLAYLIST = (
+    "#EXTM3U\n"
+    '#EXT-X-STREAM-INF:BANDWIDTH=6000000,RESOLUTION=1920x1080,CODECS="avc1.64002A,mp4a.40.2"\n'
+    "https://video.invalid/{login}/chunked.m3u8\n"
+)
+
+
+@dataclass
+class BackendOptions:
+    """Simulated backend behaviour.
+
+    Attributes:
+        live_ratio: Fraction of channels live at any time.
+        churn: Probability that a lookup redraws the channel's liveness and category.
+        latency_median: Median response latency in seconds.
+        latency_sigma: Sigma of the lognormal latency distribution (0 for constant).
+        failure_rate: Fraction of requests answered with HTTP 500.
+        seed: Random seed for channel state, latency, and failures.
+    """
+
+    live_ratio: float = 0.3
+    churn: float = 0.01
+    latency_median: float = 0.05
+    latency_sigma: float = 0.5
+    failure_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class _Channel:
+    """Simulated channel state."""
+
+    live: bool
+    category: str
+    stream_id: int
+
+
+@dataclass
+class FakeBackend:
+    """Serves just enough of Twitch and QuadStream for a daemon cycle.
+
+    Channels are created on first lookup, live with probability live_ratio
+    and with a random category. Every request sleeps for a lognormal latency
+    and then fails with probability failure_rate. Request counters are served
+    at ``GET /stats``.
+    """
+
+    options: BackendOptions
+    counters: dict[str, int] = field(default_factory=dict)
+    _channels: dict[str, _Channel] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.options.seed)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_post("/gql", self.gql)
+        app.router.add_get("/api/channel/hls/{login}.m3u8", self.playlist)
+        app.router.add_post("/stream/api/login", self.login)
+        app.router.add_post("/stream/api/stream/{short_id}/update", self.update)
+        app.router.add_post("/webhook", self.webhook)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+    async def gql(self, request: web.Request) -> web.Response:
+        """Answer a batched metadata or playback access token query."""
+        body = await request.json()
+        query: str = body["query"]
+        variables: dict[str, str] = body["variables"]
+        tokens = "streamPlaybackAccessToken" in query
+        aliases = ALIAS_PATTERN.findall(query)
+
+        self._count("gql_requests")
+        self._count("token_lookups" if tokens else "metadata_lookups", len(aliases))
+        if failure := await self._simulate():
+            return failure
+
+        data: dict[str, Any] = {}
+        for index in aliases:
+            login = variables[f"l{index}"]
+            channel = self._channel(login)
+            if tokens:
+                data[f"c{index}"] = (
+                    {"value": json.dumps({"channel": login}), "signature": "0" * 40}
+                    if channel.live
+                    else None
+                )
+            else:
+                data[f"c{index}"] = {
+                    "login": login,
+                    "displayName": login,
+                    "stream": (
+                        {
+                            "id": str(channel.stream_id),
+                            "title": f"{login} benchmark stream",
+                            "game": {"name": channel.category},
+                        }
+                        if channel.live
+                        else None
+                    ),
+                }
+        return web.json_response({"data": data})
+
+    async def playlist(self, request: web.Request) -> web.Response:
+        """Serve a master playlist for a live channel."""
+        login = request.match_info["login"]
+        self._count("playlists")
+        if failure := await self._simulate():
+            return failure
+        if not self._channel(login).live:
+            return web.Response(status=404)
+        return web.Response(
+            text=MASTER_PLAYLIST.format(login=login),
+            content_type="application/vnd.apple.mpegurl",
+        )
+
+    async def login(self, request: web.Request) -> web.Response:
+        """Accept any QuadStream login and set a one hour session cookie."""
+        self._count("logins")
+        if failure := await self._simulate():
+            return failure
+        response = web.json_response({"short_id": "bench"})
+        response.set_cookie("session", "bench", max_age=3600)
+        return response
+
+    async def update(self, request: web.Request) -> web.Response:
+        """Accept a quad update."""
+        await request.read()
+        self._count("quad_updates")
+        if failure := await self._simulate():
+            return failure
+        return web.json_response({"ok": True})
+
+    async def webhook(self, request: web.Request) -> web.Response:
+        """Accept a webhook notification."""
+        await request.read()
+        self._count("webhooks")
+        if failure := await self._simulate():
+            return failure
+        return web.Response(status=204)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """Report request counters, without simulated latency or failures."""
+        return web.json_response(self.counters)
+
+    def _channel(self, login: str) -> _Channel:
+        """Get a channel's state, creating or churning it."""
+        channel = self._channels.get(login)
+        if channel is None or self._random.random() < self.options.churn:
+            channel = _Channel(
+                live=self._random.random() < self.options.live_ratio,
+                category=self._random.choice(CATEGORIES),
+                stream_id=self._random.randrange(1 << 40),
+            )
+            self._channels[login] = channel
+        return channel
+
+    async def _simulate(self) -> web.Response | None:
+        """Sleep for a sampled latency, then return a failure response or None."""
+        options = self.options
+        if options.latency_median > 0:
+            delay = options.latency_median
+            if options.latency_sigma > 0:
+                delay = self._random.lognormvariate(math.log(delay), options.latency_sigma)
+            await asyncio.sleep(delay)
+        if self._random.random() < options.failure_rate:
+            self._count("failures")
+            return web.Response(status=500, text="simulated failure")
+        return None
+
+    def _count(self, name: str, n: int = 1) -> None:
+        """Increment a request counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+
+async def _serve(options: BackendOptions, conn: Connection) -> None:
+    """Run the fake backend on a free local port until the parent sends a stop message."""
+    runner = web.AppRunner(FakeBackend(options).app(), access_log=None)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    await web.SockSite(runner, sock).start()
+    conn.send(sock.getsockname()[1])
+
+    try:
+        await asyncio.to_thread(conn.recv)
+    except EOFError:
+        pass
+    finally:
+        await runner.cleanup()
+
+
+def serve(options: BackendOptions, conn: Connection) -> None:
+    """Process entry point: serve the fake backend and send the bound port over conn.
+
+    Args:
+        options: Simulated backend behaviour.
+        conn: Pipe end; the port is sent once listening, and any message received stops it.
+    """
+    asyncio.run(_serve(options, conn))
@@ -0,0 +1,279 @@
+"""Benchmark full daemon cycles against a simulated Twitch and QuadStream backend.
+
+Runs the real Daemon, StreamProcessor, and QuadBuilder with the gql fetcher
+backend, pointed at a fake backend (see backend.py) served from a child
+process over local HTTP. Each cycle's wall time, CPU time, and backend
+requests are recorded, along with peak RSS, and written as JSON. Given a
+baseline result, the run fails if a summary metric regressed past the
+tolerance.
+
+Usage:
+    python benchmarks/cycle.py --channels 1000 --live-ratio 0.3 --output bench.json
+    python benchmarks/cycle.py --channels 1000 --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+from backend import BackendOptions, serve
+
+from quadlink import __version__
+from quadlink.__main__ import setup_logging
+from quadlink.daemon import Daemon
+from quadlink.quadstream import QuadStreamClient
+from quadlink.scheduler import CycleScheduler
+from quadlink.stream.gql import TwitchGQLFetcher
+
+RESULT_VERSION = 1
+
+# summary metrics compared against a baseline (lower is better)
+COMPARED = ["wall_median", "wall_p95", "cpu_mean", "peak_rss_kb"]
+
+
+class CycleRecorder(CycleScheduler):
+    """Scheduler that records each cycle instead of sleeping on a fixed grid.
+
+    wait() marks the end of a cycle: it records wall time, CPU time, and the
+    backend requests made since the previous cycle, then sleeps for the
+    interval (not counted in the cycle) and stops the daemon after the
+    requested number of cycles.
+    """
+
+    def __init__(self, daemon: Daemon, client: httpx.AsyncClient, cycles: int, interval: float):
+        super().__init__(interval)
+        self.daemon = daemon
+        self.client = client
+        self.cycles = cycles
+        self.results: list[dict[str, Any]] = []
+        self._counters: dict[str, int] = {}
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    async def wait(self) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        counters = (await self.client.get("/stats")).json()
+        requests = {name: count - self._counters.get(name, 0) for name, count in counters.items()}
+        self._counters = counters
+
+        self.results.append({"wall": wall, "cpu": cpu, "requests": requests})
+        if len(self.results) >= self.cycles:
+            self.daemon.running = False
+            return
+
+        await asyncio.sleep(self.interval)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+
+def make_config(args: argparse.Namespace, base_url: str) -> dict[str, Any]:
+    """Build a config with the channels split evenly across priority levels."""
+    logins = [f"bench{i:05d}" for i in range(args.channels)]
+    per_level = -(-len(logins) // args.levels)
+    return {
+        "credentials": {"username": "bench", "secret": "bench"},
+        "fetcher_backend": "gql",
+        "max_concurrent": args.max_concurrent,
+        "gql_batch_size": args.batch_size,
+        "early_exit": args.early_exit,
+        "two_phase_fetch": args.two_phase,
+        "offline_cache": {"enabled": args.offline_cache},
+        "refresh_tiers": {"enabled": args.refresh_tiers},
+        "webhook": {"enabled": args.webhook, "url": f"{base_url}/webhook"},
+        "logging": {"level": args.log_level},
+        "rulesets": [{"name": "bench", "filters": {"block_categories": ["^Just Chatting$"]}}],
+        "priorities": {
+            (args.levels - level) * 100: [
+                {
+                    "urls": logins[level * per_level : (level + 1) * per_level],
+                    "rulesets": ["bench"],
+                }
+            ]
+            for level in range(args.levels)
+        },
+    }
+
+
+@contextmanager
+def fake_backend(options: BackendOptions) -> Iterator[str]:
+    """Serve the fake backend from a child process, yielding its base URL."""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(options, child), daemon=True)
+    process.start()
+    child.close()
+    try:
+        if not parent.poll(30):
+            raise RuntimeError("fake backend did not start")
+        yield f"http://127.0.0.1:{parent.recv()}"
+    finally:
+        parent.send(None)
+        parent.close()
+        process.join(timeout=10)
+        if process.is_alive():
+            process.kill()
+
+
+async def run_cycles(args: argparse.Namespace, base_url: str) -> list[dict[str, Any]]:
+    """Run the daemon against the fake backend for the requested cycles."""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "config.yaml"
+        # yaml is a superset of json
+        config_path.write_text(json.dumps(make_config(args, base_url)))
+
+        with (
+            patch.object(TwitchGQLFetcher, "GQL_URL", f"{base_url}/gql"),
+            patch.object(
+                TwitchGQLFetcher, "USHER_URL", f"{base_url}/api/channel/hls/{{login}}.m3u8"
+            ),
+            patch.object(QuadStreamClient, "BASE_URL", base_url),
+        ):
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                daemon = Daemon(
+                    interval=args.interval,
+                    config_path=str(config_path),
+                    retry_delay=1,
+                    max_retry_delay=1,
+                )
+                recorder = CycleRecorder(daemon, client, args.cycles, args.interval)
+                daemon.scheduler = recorder
+                await daemon.start()
+                return recorder.results
+
+
+def summarize(cycles: list[dict[str, Any]]) -> dict[str, float]:
+    """Summarize cycles after the first, which includes warm-up and login."""
+    steady = cycles[1:] or cycles
+    walls = sorted(c["wall"] for c in steady)
+    lookups = [
+        c["requests"].get("metadata_lookups", 0) + c["requests"].get("token_lookups", 0)
+        for c in steady
+    ]
+    return {
+        "first_wall": cycles[0]["wall"],
+        "wall_mean": statistics.fmean(walls),
+        "wall_median": statistics.median(walls),
+        "wall_p95": walls[min(len(walls) - 1, round(0.95 * (len(walls) - 1)))],
+        "cpu_mean": statistics.fmean(c["cpu"] for c in steady),
+        "gql_requests_mean": statistics.fmean(c["requests"].get("gql_requests", 0) for c in steady),
+        "lookups_mean": statistics.fmean(lookups),
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        // (1024 if sys.platform == "darwin" else 1),
+    }
+
+
+def compare(summary: dict[str, float], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """List summary metrics that regressed past the tolerance."""
+    regressions = []
+    for name in COMPARED:
+        old = baseline.get("summary", {}).get(name)
+        if old and summary[name] > old * (1 + tolerance):
+            regressions.append(f"{name}: {old:.4g} -> {summary[name]:.4g}")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=100, help="Configured channels")
+    parser.add_argument("--levels", type=int, default=4, help="Priority levels")
+    parser.add_argument("--cycles", type=int, default=10, help="Cycles to run")
+    parser.add_argument(
+        "--interval", type=int, default=0, help="Seconds between cycles (not measured)"
+    )
+    parser.add_argument("--live-ratio", type=float, default=0.3, help="Fraction of channels live")
+    parser.add_argument(
+        "--churn", type=float, default=0.01, help="Chance a lookup changes a channel's state"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Median backend latency in seconds"
+    )
+    parser.add_argument(
+        "--latency-sigma", type=float, default=0.5, help="Lognormal latency sigma (0: constant)"
+    )
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="Fraction of requests that fail"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Backend random seed")
+    parser.add_argument("--max-concurrent", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=30)
+    parser.add_argument("--early-exit", action="store_true")
+    parser.add_argument("--two-phase", action="store_true")
+    parser.add_argument("--offline-cache", action="store_true")
+    parser.add_argument("--refresh-tiers", action="store_true")
+    parser.add_argument("--webhook", action="store_true")
+    parser.add_argument("--log-level", choices=["debug", "info", "warn", "error"], default="error")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--baseline", type=Path, help="Fail if slower than this JSON result")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed regression over the baseline"
+    )
+    args = parser.parse_args()
+    if args.channels < 1 or args.levels < 1 or args.cycles < 1:
+        parser.error("--channels, --levels, and --cycles must be at least 1")
+    return args
+
+
+def main() -> int:
+    """Run the benchmark and return the exit code."""
+    args = parse_args()
+    setup_logging(args.log_level)
+
+    options = BackendOptions(
+        live_ratio=args.live_ratio,
+        churn=args.churn,
+        latency_median=args.latency,
+        latency_sigma=args.latency_sigma,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    with fake_backend(options) as base_url:
+        cycles = asyncio.run(run_cycles(args, base_url))
+
+    summary = summarize(cycles)
+    result = {
+        "version": RESULT_VERSION,
+        "quadlink": __version__,
+        "python": platform.python_version(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "params": {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("output", "baseline", "tolerance", "log_level")
+        },
+        "backend": asdict(options),
+        "summary": summary,
+        "cycles": cycles,
+    }
+
+    report = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(report + "\n")
+    print(json.dumps(summary, indent=2))
+
+    if args.baseline:
+        regressions = compare(summary, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"regression: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
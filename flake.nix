@@ -22,6 +22,7 @@
 
         dependencies = with pythonPackages; [
           aiohttp
+          h2
           httpx
           pydantic
           pydantic-settings
@@ -99,6 +99,18 @@ def parse_args() -> argparse.Namespace:
         default=30,
         help="Seconds between quad updates (default: 30)",
     )
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=30,
+        help="Seconds to wait after a failed config load, login, or cycle (default: 30)",
+    )
+    parser.add_argument(
+        "--max-retry-delay",
+        type=float,
+        default=300,
+        help="Upper bound on the retry delay, which doubles per failure (default: 300)",
+    )
     parser.add_argument(
         "--log-level",
         choices=["debug", "info", "warn", "error"],
@@ -131,6 +143,8 @@ def main() -> None:
                 interval=args.interval,
                 enable_health_server=enable_health_server,
                 config_path=args.config,
+                retry_delay=args.retry_delay,
+                max_retry_delay=args.max_retry_delay,
             )
         )
     except KeyboardInterrupt:
@@ -1,6 +1,8 @@
 """Configuration loading with caching fallback."""
 
 import asyncio
+import hashlib
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import structlog
@@ -15,14 +17,81 @@ class ConfigNotFoundError(Exception):
     """Raised when no configuration file is found in any search path."""
 
 
+@dataclass(frozen=True)
+class ConfigFingerprint:
+    """Identity of a config file's contents, used to skip unchanged reloads.
+
+    Attributes:
+        path: Resolved config file path.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+        sha256: Hex digest of the file contents.
+        credentials: (mtime_ns, size) of the referenced credentials file, if any.
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    credentials: tuple[int, int] | None = None
+
+
+@dataclass(frozen=True)
+class ConfigDiff:
+    """Top-level config fields that changed between two loads.
+
+    Attributes:
+        changed: Names of changed top-level Config fields.
+    """
+
+    changed: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def between(cls, old: Config | None, new: Config) -> "ConfigDiff":
+        """Compare two configs field by field.
+
+        Args:
+            old: Previous config (None if there was none).
+            new: Newly loaded config.
+
+        Returns:
+            ConfigDiff listing every field when old is None.
+        """
+        if old is None:
+            return cls(frozenset(Config.model_fields))
+        return cls(
+            frozenset(
+                name for name in Config.model_fields if getattr(old, name) != getattr(new, name)
+            )
+        )
+
+    def __bool__(self) -> bool:
+        """True if anything changed."""
+        return bool(self.changed)
+
+    def affects(self, *fields: str) -> bool:
+        """Check whether any of the given fields changed.
+
+        Args:
+            fields: Top-level Config field names.
+
+        Returns:
+            True if at least one of them changed.
+        """
+        return not self.changed.isdisjoint(fields)
+
+
 class ConfigLoader:
     """Loads configuration from YAML files with caching fallback.
 
     Searches multiple paths for config files and caches the last successful
-    load to provide resilience against transient file access errors.
+    load to provide resilience against transient file access errors. Files
+    whose fingerprint (mtime, size, content hash, and credentials file stat)
+    is unchanged are not parsed or validated again.
 
     Attributes:
         SEARCH_PATHS: Ordered list of config file locations to try.
+        last_diff: Fields changed by the most recent load (empty if unchanged).
     """
 
     SEARCH_PATHS = [
@@ -39,8 +108,10 @@ class ConfigLoader:
             explicit_path: If provided, only load from this path (skip search).
         """
         self._cached_config: Config | None = None
+        self._fingerprint: ConfigFingerprint | None = None
         self._lock = asyncio.Lock()
         self._explicit_path = explicit_path
+        self.last_diff = ConfigDiff()
 
     async def load_or_cache(self) -> Config:
         """Load configuration from file or use cached version on failure.
@@ -54,9 +125,8 @@ class ConfigLoader:
         async with self._lock:
             try:
                 config = await self._load_from_file()
-                self._cached_config = config
-                return config
             except Exception as e:
+                self.last_diff = ConfigDiff()
                 if self._cached_config is not None:
                     logger.warning(
                         "config load failed, using cached version",
@@ -65,11 +135,20 @@ class ConfigLoader:
                     return self._cached_config
                 raise
 
+            if config is self._cached_config:
+                self.last_diff = ConfigDiff()
+            else:
+                self.last_diff = ConfigDiff.between(self._cached_config, config)
+                if self._cached_config is not None:
+                    logger.info("config changed", fields=sorted(self.last_diff.changed))
+                self._cached_config = config
+            return config
+
     async def _load_from_file(self) -> Config:
         """Load configuration from first available YAML file.
 
         Returns:
-            Parsed Config object.
+            Parsed Config object, or the cached one if the file is unchanged.
 
         Raises:
             ConfigNotFoundError: If no config file found in search paths.
@@ -82,9 +161,13 @@ class ConfigLoader:
         for path_str in search_paths:
             path = Path(path_str).expanduser().resolve()
             if path.exists():
+                content = path.read_bytes()
+                fingerprint = self._fingerprint_of(path, content)
+                if self._cached_config is not None and fingerprint == self._fingerprint:
+                    return self._cached_config
+
                 logger.debug("config loaded", path=str(path))
-                with open(path) as f:
-                    data = yaml.load(f)
+                data = yaml.load(content)
 
                 config = Config(**data)
 
@@ -98,6 +181,8 @@ class ConfigLoader:
                             reason=f"must be >= diversity_bonus ({config.diversity_bonus}) + 1",
                         )
 
+                # credentials file may only be known after parsing
+                self._fingerprint = self._fingerprint_of(path, content, config)
                 return config
 
         if self._explicit_path:
@@ -107,6 +192,38 @@ class ConfigLoader:
                 f"No config file found. Searched: {', '.join(self.SEARCH_PATHS)}"
             )
 
+    def _fingerprint_of(
+        self, path: Path, content: bytes, config: Config | None = None
+    ) -> ConfigFingerprint:
+        """Fingerprint a config file and the credentials file it references.
+
+        Args:
+            path: Resolved config file path.
+            content: File contents.
+            config: Config whose credentials file to stat (default: cached config).
+
+        Returns:
+            ConfigFingerprint for the current file state.
+        """
+        stat = path.stat()
+        config = config or self._cached_config
+
+        credentials = None
+        if config is not None and config.credentials.file:
+            try:
+                cred_stat = Path(config.credentials.file).expanduser().stat()
+                credentials = (cred_stat.st_mtime_ns, cred_stat.st_size)
+            except OSError:
+                pass
+
+        return ConfigFingerprint(
+            path=str(path),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=hashlib.sha256(content).hexdigest(),
+            credentials=credentials,
+        )
+
     async def has_config(self) -> bool:
         """Check if configuration is available (loaded or cached).
 
@@ -1,8 +1,11 @@
 """Configuration models using Pydantic."""
 
+import re
+from datetime import time
 from pathlib import Path
+from typing import Literal
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -53,6 +56,9 @@ class Credentials(BaseModel):
 class Filters(BaseModel):
     """Regex filters for stream categories and titles.
 
+    Patterns are compiled once during validation, so invalid patterns fail
+    at config load time.
+
     Attributes:
         allow_categories: Patterns that categories must match (allowlist).
         allow_titles: Patterns that titles must match (allowlist).
@@ -65,6 +71,53 @@ class Filters(BaseModel):
     block_categories: list[str] = Field(default_factory=list)
     block_titles: list[str] = Field(default_factory=list)
 
+    _compiled: dict[str, tuple[re.Pattern[str], ...]] = PrivateAttr(default_factory=dict)
+
+    @field_validator("allow_categories", "allow_titles", "block_categories", "block_titles")
+    @classmethod
+    def validate_patterns(cls, v: list[str]) -> list[str]:
+        """Ensure every pattern is a valid regex.
+
+        Args:
+            v: Input pattern list.
+
+        Returns:
+            Unchanged pattern list.
+
+        Raises:
+            ValueError: If a pattern does not compile.
+        """
+        for pattern in v:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex pattern {pattern!r}: {e}") from e
+        return v
+
+    @model_validator(mode="after")
+    def compile_patterns(self) -> "Filters":
+        """Store compiled patterns alongside the pattern strings.
+
+        Returns:
+            Filters instance with compiled patterns.
+        """
+        self._compiled = {
+            name: tuple(re.compile(pattern) for pattern in getattr(self, name))
+            for name in ("allow_categories", "allow_titles", "block_categories", "block_titles")
+        }
+        return self
+
+    def compiled(self, name: str) -> tuple[re.Pattern[str], ...]:
+        """Get the compiled patterns of a filter list.
+
+        Args:
+            name: Filter list name (e.g. "block_titles").
+
+        Returns:
+            Compiled patterns, in configured order.
+        """
+        return self._compiled[name]
+
 
 class Ruleset(BaseModel):
     """Named collection of filters.
@@ -98,12 +151,157 @@ class Webhook(BaseModel):
     Attributes:
         enabled: Whether webhook notifications are active.
         url: Webhook endpoint URL.
+        urls: Additional webhook endpoint URLs.
         timeout: Request timeout in seconds.
+        max_retries: Retries per notification after a failed delivery.
+        backoff: Seconds before the first retry, doubled for each retry.
+        max_backoff: Upper bound on the delay between retries.
     """
 
     enabled: bool = False
     url: str = ""
+    urls: list[str] = Field(default_factory=list)
     timeout: int = 10
+    max_retries: int = Field(default=3, ge=0)
+    backoff: float = Field(default=1.0, gt=0)
+    max_backoff: float = Field(default=60.0, gt=0)
+
+    @property
+    def endpoints(self) -> list[str]:
+        """All configured endpoint URLs, deduplicated in order."""
+        return list(dict.fromkeys(url for url in [self.url, *self.urls] if url))
+
+
+class OfflineCache(BaseModel):
+    """Cache of channels recently seen offline, to skip re-probing them.
+
+    Attributes:
+        enabled: Whether offline results are cached between cycles.
+        ttl: Seconds to skip a channel after it is seen offline.
+        jitter: Fraction the TTL is randomized by, to spread re-probes.
+        max_ttl: Upper bound on the TTL after backoff.
+        backoff_after: Seconds offline after which the TTL doubles.
+        bypass_priority: Priorities at or above this are always probed.
+    """
+
+    enabled: bool = False
+    ttl: int = Field(default=120, ge=0)
+    jitter: float = Field(default=0.2, ge=0, lt=1)
+    max_ttl: int = Field(default=900, ge=0)
+    backoff_after: int = Field(default=3600, gt=0)
+    bypass_priority: int | None = None
+
+
+class RefreshTiers(BaseModel):
+    """Per-channel refresh scheduling, so stable live channels are not probed every cycle.
+
+    Attributes:
+        enabled: Whether live results are reused until their tier is due.
+        max_age: Seconds a live result is reused at the lowest priority level;
+            higher levels get a proportionally shorter age.
+        settle: Seconds after going live or changing category that a channel is always probed.
+        slow_fetch: Probe duration in seconds above which results are reused twice as long.
+        bypass_priority: Priorities at or above this are always probed.
+    """
+
+    enabled: bool = False
+    max_age: int = Field(default=120, ge=0)
+    settle: int = Field(default=300, ge=0)
+    slow_fetch: float = Field(default=1.0, gt=0)
+    bypass_priority: int | None = None
+
+
+class IntervalWindow(BaseModel):
+    """Interval bounds for a time-of-day window.
+
+    Attributes:
+        start: Local time the window starts.
+        end: Local time the window ends; earlier than start wraps past midnight.
+        min_interval: Shortest interval in seconds during the window.
+        max_interval: Longest interval in seconds during the window.
+    """
+
+    start: time
+    end: time
+    min_interval: int = Field(ge=1)
+    max_interval: int = Field(ge=1)
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "IntervalWindow":
+        """Ensure min_interval does not exceed max_interval.
+
+        Returns:
+            Validated IntervalWindow instance.
+
+        Raises:
+            ValueError: If min_interval is greater than max_interval.
+        """
+        if self.min_interval > self.max_interval:
+            raise ValueError("min_interval must not exceed max_interval")
+        return self
+
+    def contains(self, moment: time) -> bool:
+        """Check whether a local time falls within the window.
+
+        Args:
+            moment: Local time of day.
+
+        Returns:
+            True if start <= moment < end, wrapping past midnight if needed.
+        """
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+class AdaptiveInterval(BaseModel):
+    """Polling interval that adapts to quad churn.
+
+    The interval drops to min_interval whenever the quad or the candidate
+    set changes, and grows by growth each stable cycle up to max_interval.
+
+    Attributes:
+        enabled: Whether the interval adapts instead of staying at --interval.
+        min_interval: Shortest interval in seconds, used right after a change.
+        max_interval: Longest interval in seconds, reached after stable cycles.
+        growth: Factor the interval is multiplied by after each stable cycle.
+        schedule: Time-of-day windows overriding min_interval and max_interval.
+    """
+
+    enabled: bool = False
+    min_interval: int = Field(default=15, ge=1)
+    max_interval: int = Field(default=120, ge=1)
+    growth: float = Field(default=1.5, gt=1)
+    schedule: list[IntervalWindow] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "AdaptiveInterval":
+        """Ensure min_interval does not exceed max_interval.
+
+        Returns:
+            Validated AdaptiveInterval instance.
+
+        Raises:
+            ValueError: If min_interval is greater than max_interval.
+        """
+        if self.min_interval > self.max_interval:
+            raise ValueError("min_interval must not exceed max_interval")
+        return self
+
+    def bounds(self, moment: time) -> tuple[int, int]:
+        """Get the interval bounds in effect at a local time.
+
+        Args:
+            moment: Local time of day.
+
+        Returns:
+            Tuple of (min_interval, max_interval) from the first matching
+            window, or the defaults if no window matches.
+        """
+        for window in self.schedule:
+            if window.contains(moment):
+                return window.min_interval, window.max_interval
+        return self.min_interval, self.max_interval
 
 
 class Logging(BaseModel):
@@ -170,10 +368,21 @@ class Config(BaseSettings):
         category_continuity_bonus: Points for replacing departed category.
         skip_hosted: Whether to skip hosted/raided streams.
         hosted_offset: Priority reduction for hosted streams (if not skipped).
+        early_exit: Skip lower priority fetches once the quad is provably decided.
         webhook: Webhook notification settings.
         logging: Logging configuration.
         proxy_playlist: Twitch playlist proxy URL for ad-free streams.
         low_latency: Enable low-latency streaming mode.
+        fetcher_backend: Stream fetcher (streamlink thread pool or native asyncio gql).
+        max_concurrent: Maximum stream fetches in flight across all priority levels.
+        gql_batch_size: Channels looked up per request by the gql fetcher backend.
+        two_phase_fetch: Resolve playlists for quad winners only, not every accepted stream.
+        offline_cache: Skip re-probing channels recently seen offline.
+        refresh_tiers: Reuse recent results for live channels outside the quad.
+        adaptive_interval: Adapt the polling interval to quad churn and time of day.
+        state_file: JSON file for quad history and fetch caches kept across restarts.
+        playlist_refresh: Seconds after which a quad whose authors are unchanged but
+            whose playlist URLs changed is pushed again (None: only on author changes).
     """
 
     model_config = SettingsConfigDict(
@@ -191,12 +400,22 @@ class Config(BaseSettings):
     category_continuity_bonus: int = 10
     skip_hosted: bool = True
     hosted_offset: int = 50
+    early_exit: bool = False
 
     webhook: Webhook = Field(default_factory=Webhook)
     logging: Logging = Field(default_factory=Logging)
 
     proxy_playlist: str = "https://eu.luminous.dev"
     low_latency: bool = True
+    fetcher_backend: Literal["streamlink", "gql"] = "streamlink"
+    max_concurrent: int = Field(default=4, ge=1)
+    gql_batch_size: int = Field(default=30, ge=1)
+    two_phase_fetch: bool = False
+    offline_cache: OfflineCache = Field(default_factory=OfflineCache)
+    refresh_tiers: RefreshTiers = Field(default_factory=RefreshTiers)
+    adaptive_interval: AdaptiveInterval = Field(default_factory=AdaptiveInterval)
+    state_file: str | None = None
+    playlist_refresh: int | None = Field(default=None, ge=0)
 
     @model_validator(mode="after")
     def validate_bonuses(self) -> "Config":
@@ -2,18 +2,31 @@
 
 import asyncio
 import signal
+import time
 from collections.abc import Callable
+from datetime import datetime
+from typing import Any
 
 import structlog
 
 from quadlink.config.loader import ConfigLoader
+from quadlink.config.models import Config
 from quadlink.health import HealthServer
+from quadlink.metrics import Metrics
+from quadlink.publisher import QuadPublisher
 from quadlink.quad import QuadBuilder
 from quadlink.quadstream import QuadStreamClient
+from quadlink.scheduler import CycleScheduler
+from quadlink.state import StateStore
 from quadlink.stream.processor import StreamProcessor
+from quadlink.types import PrioritizedStream, Quad
+from quadlink.webhook import WebhookDispatcher
 
 logger = structlog.get_logger()
 
+# seconds a one-shot run waits for a pending quad push before exiting
+PUSH_FLUSH_TIMEOUT = 60
+
 
 class Daemon:
     """Main daemon for QuadLink stream curation.
@@ -24,6 +37,8 @@ class Daemon:
     Attributes:
         interval: Seconds between quad update cycles.
         one_shot: If True, run once and exit instead of looping.
+        retry_delay: Seconds to wait after the first consecutive failure.
+        max_retry_delay: Upper bound on the doubling delay between failures.
     """
 
     def __init__(
@@ -32,6 +47,8 @@ class Daemon:
         one_shot: bool = False,
         enable_health_server: bool = False,
         config_path: str | None = None,
+        retry_delay: float = 30,
+        max_retry_delay: float = 300,
     ):
         """Initialize daemon.
 
@@ -40,44 +57,117 @@ class Daemon:
             one_shot: If True, run once and exit.
             enable_health_server: If True, start health check server on port 8080.
             config_path: Optional explicit path to config file (default: auto-discover).
+            retry_delay: Seconds to wait after a failed config load, login, or cycle.
+            max_retry_delay: Upper bound on the retry delay, which doubles per failure.
         """
-        self.interval = interval
+        self.scheduler = CycleScheduler(interval)
+        self.base_interval: float = interval
         self.one_shot = one_shot
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.failures = 0
         self.enable_health_server = enable_health_server
         self.config_loader = ConfigLoader(explicit_path=config_path)
-        self.health_server = HealthServer() if enable_health_server else None
+        self.metrics = Metrics()
+        self.health_server = HealthServer(metrics=self.metrics) if enable_health_server else None
         self.running = False
+        self.config: Config | None = None
         self.processor: StreamProcessor | None = None
         self.quad_builder: QuadBuilder | None = None
         self.quadstream_client: QuadStreamClient | None = None
+        self.webhook_dispatcher: WebhookDispatcher | None = None
+        self._last_candidates: frozenset[str] | None = None
+        self._cycle_started = 0.0
+        self._phase_started = 0.0
+        self._state_lock = asyncio.Lock()
+        self.publisher = QuadPublisher(self._push_quad, on_published=self._on_quad_published)
+
+    @property
+    def interval(self) -> float:
+        """Seconds until the next quad update cycle, adapted if enabled."""
+        return self.scheduler.interval
+
+    @interval.setter
+    def interval(self, interval: float) -> None:
+        self.base_interval = interval
+        self.scheduler.interval = interval
 
     async def start(self) -> None:
-        """Start the daemon and optional health server."""
+        """Start the daemon and optional health server.
+
+        The health server runs on the same event loop and is stopped when
+        the daemon stops or is cancelled.
+        """
         if self.health_server:
-            self.health_server.start()
+            await self.health_server.start()
         self.running = True
         try:
+            await self._warm_up()
             await self._main_loop()
         except asyncio.CancelledError:
             raise
+        finally:
+            if self.health_server:
+                await self.health_server.stop()
+            await self.publisher.close()
+            if self.processor:
+                await self.processor.close()
+            if self.quadstream_client:
+                await self.quadstream_client.close()
+            if self.webhook_dispatcher:
+                await self.webhook_dispatcher.close()
+
+    async def _warm_up(self) -> None:
+        """Create the stream processor and warm up its fetcher before the first cycle.
+
+        Failures are logged and left for the main loop to retry.
+        """
+        started = time.monotonic()
+        try:
+            config = await self.config_loader.load_or_cache()
+            if not config:
+                return
+
+            self.config = config
+            self._create_components(config)
+            assert self.processor is not None
+            await self.processor.warm_up()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("warm-up failed", error=str(e))
+            return
+
+        logger.info(
+            "warm-up complete",
+            backend=config.fetcher_backend,
+            duration=round(time.monotonic() - started, 3),
+        )
 
     async def _main_loop(self) -> None:
-        """Main daemon loop - processes streams and updates quad repeatedly."""
+        """Main daemon loop - processes streams and updates quad repeatedly.
+
+        Cycles start on a fixed schedule (see CycleScheduler); failures back
+        off exponentially and re-anchor the schedule once they clear.
+        """
+        self.scheduler.reset()
         while self.running:
             try:
+                self._cycle_started = self._phase_started = time.perf_counter()
                 config = await self.config_loader.load_or_cache()
 
                 if not config:
-                    logger.error("failed to load config, retrying in 30s")
-                    await asyncio.sleep(30)
+                    await self._back_off("failed to load config")
                     continue
 
-                if self.health_server:
-                    self.health_server.mark_ready()
-
                 if not self.processor or not self.quad_builder:
-                    self.processor = StreamProcessor(config)
-                    self.quad_builder = QuadBuilder(config)
+                    self._create_components(config)
+                    assert self.processor is not None
+                    assert self.quad_builder is not None
+                elif config is not self.config:
+                    await self._apply_config(config)
+                self.config = config
+                self._end_phase("config")
 
                 if not self.quadstream_client:
                     assert config.credentials.username is not None
@@ -86,53 +176,374 @@ class Daemon:
                         username=config.credentials.username,
                         secret=config.credentials.secret,
                     )
+                    if config.state_file:
+                        StateStore(config.state_file).restore_client(self.quadstream_client)
 
                     login_success = await self.quadstream_client.login()
                     if not login_success:
-                        logger.error("quadstream login failed, retrying in 30s")
+                        await self.quadstream_client.close()
                         self.quadstream_client = None
-                        await asyncio.sleep(30)
+                        await self._back_off("quadstream login failed")
                         continue
+                    self._end_phase("login")
 
-                candidates = await self.processor.process_stream_groups()
+                candidates = await self.processor.process_stream_groups(self.quad_builder)
+                self.failures = 0
+                filter_time = self.processor.filter_time
+                self._end_phase("fetch", excluded=filter_time)
+                self.metrics.phase_seconds.observe(filter_time, phase="filter")
 
                 if not candidates:
                     logger.info("no stream candidates available")
-                    await asyncio.sleep(self.interval)
+                    await self._save_state(config)
+                    self._end_phase("save")
+                    self._record_cycle(candidates, quad_changed=False)
+                    self._adapt_interval(config, candidates, quad_changed=False)
+                    await self.scheduler.wait()
                     continue
 
                 quad = self.quad_builder.build_quad(candidates)
+                self._end_phase("build")
+                await self._save_state(config)
+                self._end_phase("save")
 
                 if quad.is_empty():
                     logger.info("quad is empty, skipping update")
-                    await asyncio.sleep(self.interval)
+                    self._record_cycle(candidates, quad_changed=False)
+                    self._adapt_interval(config, candidates, quad_changed=False)
+                    await self.scheduler.wait()
                     continue
 
-                # only send updates if quad changed
-                if self.quad_builder.quad_changed:
-                    update_success = await self.quadstream_client.update_quad(quad)
-
-                    if not update_success:
-                        logger.error("quadstream update failed")
-                    elif config.webhook.enabled and config.webhook.url:
-                        await self.quadstream_client.send_webhook(config.webhook.url, quad)
+                # pushed in the background
+                if self._should_push(config, quad):
+                    self.publisher.submit(quad)
+                self._record_cycle(candidates, self.quad_builder.quad_changed)
+                self._adapt_interval(config, candidates, self.quad_builder.quad_changed)
 
                 if self.one_shot:
+                    await self.publisher.flush(timeout=PUSH_FLUSH_TIMEOUT)
+                    if self.webhook_dispatcher:
+                        await self.webhook_dispatcher.flush()
                     self.running = False
                     break
 
-                logger.debug("sleeping", interval=self.interval)
-                await asyncio.sleep(self.interval)
+                await self.scheduler.wait()
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(
-                    "unexpected error in main loop",
-                    error=str(e),
-                    exc_info=True,
+                await self._back_off("unexpected error in main loop", error=str(e), exc_info=True)
+
+    def _create_components(self, config: Config) -> None:
+        """Create the stream processor and quad builder, resuming saved state if configured.
+
+        Args:
+            config: Current config.
+        """
+        self.processor = StreamProcessor(config, metrics=self.metrics)
+        self.quad_builder = QuadBuilder(config)
+        if config.state_file:
+            StateStore(config.state_file).restore(self.quad_builder, self.processor)
+
+    async def _save_state(self, config: Config) -> None:
+        """Snapshot quad history, fetch caches, and the last push, if a state file is configured.
+
+        Saved once per cycle and again after each confirmed push, so the
+        last push on disk is only ever one QuadStream accepted. Saves are
+        serialized so an older snapshot never replaces a newer one.
+
+        Args:
+            config: Current config.
+        """
+        if config.state_file and self.processor and self.quad_builder:
+            async with self._state_lock:
+                await StateStore(config.state_file).save(
+                    self.quad_builder, self.processor, self.quadstream_client
                 )
-                await asyncio.sleep(30)
+
+    def _should_push(self, config: Config, quad: Quad) -> bool:
+        """Decide whether a built quad is sent to QuadStream.
+
+        The decision compares against the last quad QuadStream accepted, not
+        the builder's previous selection, so a quad whose push failed or was
+        never confirmed is sent again on later cycles. A quad identical to the
+        last push is never sent. A quad whose authors differ from the last
+        push is always sent, as is any quad when nothing is known to be pushed
+        to this stream yet. A quad with the same authors but new playlist URLs
+        is only sent once the last push is older than playlist_refresh
+        seconds, since pushing it reloads every player.
+
+        Args:
+            config: Current config with the playlist refresh setting.
+            quad: Quad built this cycle.
+
+        Returns:
+            True if the quad should be submitted to the publisher.
+        """
+        client = self.quadstream_client
+        if client is None:
+            return True
+        if client.is_current(quad):
+            logger.debug("quad matches last push, not pushing")
+            return False
+        if (
+            client.pushed_digest is None
+            or client.pushed_authors is None
+            or quad.authors != client.pushed_authors
+        ):
+            return True
+
+        age = client.pushed_age()
+        if config.playlist_refresh is not None and age >= config.playlist_refresh:
+            logger.info("refreshing playlist urls", pushed_age=round(age))
+            return True
+        logger.debug("playlist urls changed, keeping pushed quad", pushed_age=round(age))
+        return False
+
+    def _adapt_interval(
+        self, config: Config, candidates: list[PrioritizedStream], quad_changed: bool
+    ) -> None:
+        """Set the interval for the next cycle from this cycle's churn.
+
+        With adaptive_interval enabled, any change to the quad or the set of
+        candidates drops the interval to the minimum, and each stable cycle
+        multiplies it by the growth factor up to the maximum. Bounds come from
+        the time-of-day schedule if a window matches. Otherwise the interval
+        stays at the --interval value.
+
+        Args:
+            config: Current config with adaptive interval settings.
+            candidates: Candidates found this cycle.
+            quad_changed: Whether this cycle changed the quad.
+        """
+        urls = frozenset(c.stream.url for c in candidates)
+        changed = quad_changed or urls != self._last_candidates
+        self._last_candidates = urls
+
+        adaptive = config.adaptive_interval
+        if not adaptive.enabled:
+            self.scheduler.interval = self.base_interval
+            return
+
+        min_interval, max_interval = adaptive.bounds(datetime.now().time())
+        interval = min_interval if changed else self.scheduler.interval * adaptive.growth
+        interval = max(min_interval, min(interval, max_interval))
+
+        if interval != self.scheduler.interval:
+            logger.debug("interval adapted", interval=round(interval, 1), churn=changed)
+        self.scheduler.interval = interval
+
+    def _end_phase(self, phase: str, excluded: float = 0.0) -> None:
+        """Record the time since the previous phase ended as this phase's duration.
+
+        Args:
+            phase: Phase name.
+            excluded: Seconds of the phase recorded separately (e.g. filtering during fetch).
+        """
+        now = time.perf_counter()
+        self.metrics.phase_seconds.observe(now - self._phase_started - excluded, phase=phase)
+        self._phase_started = now
+
+    def _record_cycle(self, candidates: list[PrioritizedStream], quad_changed: bool) -> None:
+        """Record a completed cycle for readiness and copy component counters into the metrics.
+
+        Args:
+            candidates: Candidates found this cycle.
+            quad_changed: Whether this cycle changed the quad.
+        """
+        duration = time.perf_counter() - self._cycle_started
+        if self.health_server:
+            self.health_server.record_success(self.scheduler.interval, duration)
+
+        metrics = self.metrics
+        metrics.cycle_seconds.observe(duration)
+        metrics.inc("quadlink_cycles_total", "Completed quad update cycles.")
+        metrics.set("quadlink_candidates", "Stream candidates in the last cycle.", len(candidates))
+        if quad_changed:
+            metrics.inc("quadlink_quad_changes_total", "Cycles that changed the quad.")
+        self._copy_counters()
+
+    def _copy_counters(self) -> None:
+        """Copy the counters kept by the scheduler, caches, publisher, and webhooks."""
+        metrics = self.metrics
+        scheduler = self.scheduler
+        metrics.set(
+            "quadlink_interval_seconds", "Seconds between cycle starts.", scheduler.interval
+        )
+        metrics.set(
+            "quadlink_scheduler_overruns_total",
+            "Cycles that ran past their next tick.",
+            scheduler.overruns,
+            kind="counter",
+        )
+        metrics.set(
+            "quadlink_scheduler_skipped_ticks_total",
+            "Ticks skipped because a cycle overran them.",
+            scheduler.skipped,
+            kind="counter",
+        )
+        metrics.set(
+            "quadlink_scheduler_lag_seconds",
+            "Seconds the last wake-up was later than its tick.",
+            scheduler.last_lag,
+        )
+
+        if self.processor:
+            caches = {
+                "filter": self.processor.filter,
+                "offline": self.processor.offline_cache,
+                "refresh": self.processor.refresh,
+            }
+            for name, cache in caches.items():
+                if cache is None:
+                    continue
+                stats = cache.stats()
+                metrics.set(
+                    "quadlink_cache_hits_total",
+                    "Cache lookups answered from the cache.",
+                    stats["hits"],
+                    kind="counter",
+                    cache=name,
+                )
+                metrics.set(
+                    "quadlink_cache_misses_total",
+                    "Cache lookups that required work.",
+                    stats["misses"],
+                    kind="counter",
+                    cache=name,
+                )
+                metrics.set(
+                    "quadlink_cache_hit_ratio",
+                    "Fraction of cache lookups answered from the cache.",
+                    stats["hit_rate"],
+                    cache=name,
+                )
+                metrics.set("quadlink_cache_entries", "Cached entries.", stats["size"], cache=name)
+
+        publisher = self.publisher
+        pushes = {
+            "ok": publisher.pushed,
+            "failed": publisher.failed,
+            "superseded": publisher.superseded,
+        }
+        for result, count in pushes.items():
+            metrics.set(
+                "quadlink_quad_pushes_total",
+                "Quad pushes to QuadStream, by result.",
+                count,
+                kind="counter",
+                result=result,
+            )
+
+        if self.quadstream_client:
+            metrics.set(
+                "quadlink_session_renewals_total",
+                "Re-logins to renew an expiring or expired QuadStream session.",
+                self.quadstream_client.renewals,
+                kind="counter",
+            )
+
+        dispatcher = self.webhook_dispatcher
+        if dispatcher:
+            webhooks = {
+                "sent": dispatcher.sent,
+                "failed": dispatcher.failed,
+                "coalesced": dispatcher.coalesced,
+            }
+            for result, count in webhooks.items():
+                metrics.set(
+                    "quadlink_webhooks_total",
+                    "Webhook notifications, by result.",
+                    count,
+                    kind="counter",
+                    result=result,
+                )
+
+    async def _back_off(self, event: str, **fields: Any) -> None:
+        """Log a failure and sleep, doubling the delay for each consecutive failure.
+
+        The cycle schedule is re-anchored afterwards, so the time spent
+        backing off is not reported as an overrun.
+
+        Args:
+            event: Log event describing the failure.
+            **fields: Extra fields for the log event.
+        """
+        delay = min(self.retry_delay * (1 << min(self.failures, 16)), self.max_retry_delay)
+        self.failures += 1
+        self.metrics.inc("quadlink_failures_total", "Failed config loads, logins, and cycles.")
+        logger.error(event, retry_in=delay, failures=self.failures, **fields)
+        await asyncio.sleep(delay)
+        self.scheduler.reset()
+
+    async def _apply_config(self, config: Config) -> None:
+        """Hot-apply a reloaded config to the running components.
+
+        The processor and quad builder are updated in place so warm sessions,
+        caches, and quad history survive. A credentials change closes the
+        QuadStream client so the next cycle logs in again, and a webhook
+        change replaces the webhook dispatcher.
+
+        Args:
+            config: Newly loaded config.
+        """
+        assert self.processor is not None
+        assert self.quad_builder is not None
+
+        diff = self.config_loader.last_diff
+        await self.processor.apply_config(config, diff)
+        self.quad_builder.apply_config(config)
+
+        if diff.affects("credentials") and self.quadstream_client:
+            await self.quadstream_client.close()
+            self.quadstream_client = None
+
+        if diff.affects("webhook") and self.webhook_dispatcher:
+            await self.webhook_dispatcher.close()
+            self.webhook_dispatcher = None
+
+        logger.info("config applied", fields=sorted(diff.changed))
+
+    async def _push_quad(self, quad: Quad) -> bool:
+        """Push a quad with the current QuadStream client, saving state once it is accepted.
+
+        Args:
+            quad: Quad to push.
+
+        Returns:
+            True if the update succeeded, False if it failed or no client is logged in.
+        """
+        if not self.quadstream_client:
+            return False
+        started = time.monotonic()
+        updated = await self.quadstream_client.update_quad(quad)
+        self.metrics.quadstream_update_seconds.observe(
+            time.monotonic() - started, outcome="ok" if updated else "error"
+        )
+        if updated and self.config:
+            await self._save_state(self.config)
+        return updated
+
+    def _on_quad_published(self, quad: Quad) -> None:
+        """Notify webhooks once a quad has been pushed.
+
+        Args:
+            quad: Quad that was pushed to QuadStream.
+        """
+        config = self.config
+        if config and config.webhook.enabled and config.webhook.endpoints:
+            self._notify_webhook(config, quad)
+
+    def _notify_webhook(self, config: Config, quad: Quad) -> None:
+        """Queue a webhook notification for background delivery.
+
+        Args:
+            config: Current config with webhook settings.
+            quad: Quad that was pushed to QuadStream.
+        """
+        if not self.webhook_dispatcher:
+            self.webhook_dispatcher = WebhookDispatcher(config.webhook, metrics=self.metrics)
+        self.webhook_dispatcher.submit(quad)
 
 
 async def run_daemon(
@@ -140,6 +551,8 @@ async def run_daemon(
     interval: int = 30,
     enable_health_server: bool = False,
     config_path: str | None = None,
+    retry_delay: float = 30,
+    max_retry_delay: float = 300,
 ) -> None:
     """Entry point for running the daemon.
 
@@ -150,20 +563,22 @@ async def run_daemon(
         interval: Seconds between quad updates.
         enable_health_server: If True, start health check server on port 8080.
         config_path: Optional explicit path to config file (default: auto-discover).
+        retry_delay: Seconds to wait after a failed config load, login, or cycle.
+        max_retry_delay: Upper bound on the retry delay, which doubles per failure.
     """
     daemon = Daemon(
         interval=interval,
         one_shot=one_shot,
         enable_health_server=enable_health_server,
         config_path=config_path,
+        retry_delay=retry_delay,
+        max_retry_delay=max_retry_delay,
     )
     task = asyncio.create_task(daemon.start())
 
     def handle_shutdown(sig: signal.Signals) -> None:
         logger.info("shutting down", signal=sig.name)
         daemon.running = False
-        if daemon.health_server:
-            daemon.health_server.stop()
         task.cancel()
 
     def make_handler(sig: signal.Signals) -> Callable[[], None]:
@@ -177,6 +592,3 @@ async def run_daemon(
         await task
     except asyncio.CancelledError:
         pass
-    finally:
-        if daemon.health_server:
-            daemon.health_server.stop()
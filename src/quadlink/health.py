@@ -1,117 +1,130 @@
-"""Health check HTTP server for monitoring."""
+"""Health check and metrics HTTP server on the daemon's event loop."""
 
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from threading import Thread
-from typing import Any
+import time
 
 import structlog
+from aiohttp import web
 
-logger = structlog.get_logger()
-
-
-class HealthCheckHandler(BaseHTTPRequestHandler):
-    """HTTP request handler for health and readiness checks.
-
-    Attributes:
-        config_loaded: Class variable tracking if config has been loaded.
-    """
-
-    config_loaded = False
-
-    def log_message(self, format: str, *args: Any) -> None:
-        """Suppress default HTTP request logging (too noisy for health checks)."""
-        pass
+from quadlink.metrics import Metrics
 
-    def do_GET(self) -> None:
-        """Route GET requests to health or readiness endpoints."""
-        if self.path == "/health":
-            self._health_check()
-        elif self.path == "/ready":
-            self._readiness_check()
-        else:
-            self.send_response(404)
-            self.end_headers()
-
-    def _health_check(self) -> None:
-        """Handle /health endpoint - always returns 200 OK.
-
-        Indicates the process is running regardless of readiness state.
-        """
-        self.send_response(200)
-        self.send_header("Content-Type", "text/plain")
-        self.end_headers()
-        self.wfile.write(b"OK")
+logger = structlog.get_logger()
 
-    def _readiness_check(self) -> None:
-        """Handle /ready endpoint - returns 200 if config loaded, 503 otherwise.
+# content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
 
-        Indicates whether the daemon is ready to process streams.
-        """
-        if HealthCheckHandler.config_loaded:
-            self.send_response(200)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"READY")
-        else:
-            self.send_response(503)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"NOT READY")
+# the last successful cycle keeps the daemon ready for this many cycle periods
+READY_INTERVALS = 3
 
 
 class HealthServer:
-    """HTTP server for health and readiness checks.
-
-    Runs in a background thread to avoid blocking the main async loop.
+    """HTTP server for health and readiness checks and metrics.
+
+    Served by aiohttp on the daemon's event loop, so handlers read daemon
+    state directly and concurrent probes are answered without blocking each
+    other or the loop. Readiness reflects recent cycle success: /ready
+    answers 200 while the last successful cycle is younger than
+    READY_INTERVALS cycle periods, so a daemon stuck retrying failed
+    cycles drops out of readiness on its own. A period is the interval
+    plus the last cycle's duration, since the next cycle can only finish
+    that long after the last one did; a slow cycle widens the window
+    instead of making /ready flap.
 
     Attributes:
         host: Host address to bind to.
         port: Port number to listen on.
+        metrics: Metrics served at /metrics, if any.
+        last_success: Monotonic time of the last successful cycle, if any.
+        ready_for: Seconds after last_success that the daemon counts as ready.
     """
 
-    def __init__(self, host: str = "0.0.0.0", port: int = 8080):
+    def __init__(self, host: str = "0.0.0.0", port: int = 8080, metrics: Metrics | None = None):
         """Initialize health server.
 
         Args:
             host: Host address to bind to.
             port: Port number to listen on.
+            metrics: Optional metrics registry to serve at /metrics.
         """
         self.host = host
         self.port = port
-        self.server: HTTPServer | None = None
-        self.thread: Thread | None = None
+        self.metrics = metrics
+        self.last_success: float | None = None
+        self.ready_for = 0.0
+        self.runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        """Start serving on the running event loop.
 
-    def start(self) -> None:
-        """Start the health server in a background thread."""
-        if self.server is not None:
+        Raises:
+            OSError: If the address cannot be bound.
+        """
+        if self.runner is not None:
             logger.warning("health server already running")
             return
 
-        self.server = HTTPServer((self.host, self.port), HealthCheckHandler)
-        self.thread = Thread(target=self.server.serve_forever, daemon=True)
-        self.thread.start()
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_get("/ready", self._ready)
+        app.router.add_get("/metrics", self._metrics)
+
+        runner = web.AppRunner(app, access_log=None, handle_signals=False, shutdown_timeout=1.0)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except BaseException:
+            await runner.cleanup()
+            raise
+        self.runner = runner
 
         logger.debug("health server started", host=self.host, port=self.port)
 
-    def stop(self) -> None:
-        """Stop the health server and wait for thread to finish."""
-        if self.server is None:
+    async def stop(self) -> None:
+        """Stop listening and close open connections."""
+        if self.runner is None:
             return
+        runner, self.runner = self.runner, None
+        await runner.cleanup()
 
-        self.server.shutdown()
-        self.server.server_close()
+    def record_success(self, interval: float, duration: float = 0.0) -> None:
+        """Mark a cycle as successful, keeping the daemon ready for a few cycle periods.
 
-        if self.thread:
-            self.thread.join(timeout=5)
+        Args:
+            interval: Seconds between cycle starts.
+            duration: Seconds the successful cycle took.
+        """
+        self.last_success = time.monotonic()
+        self.ready_for = (interval + duration) * READY_INTERVALS
 
-        self.server = None
-        self.thread = None
+    def is_ready(self) -> bool:
+        """Check whether a cycle succeeded recently."""
+        if self.last_success is None:
+            return False
+        return time.monotonic() - self.last_success <= self.ready_for
 
-    def mark_ready(self) -> None:
-        """Mark the daemon as ready (config loaded successfully)."""
-        HealthCheckHandler.config_loaded = True
+    async def _health(self, request: web.Request) -> web.Response:
+        """Handle /health endpoint - always returns 200 OK.
 
-    def mark_not_ready(self) -> None:
-        """Mark the daemon as not ready (config not loaded)."""
-        HealthCheckHandler.config_loaded = False
-        logger.debug("health server marked not ready")
+        Indicates the process is running regardless of readiness state.
+        """
+        return web.Response(text="OK")
+
+    async def _ready(self, request: web.Request) -> web.Response:
+        """Handle /ready endpoint - returns 200 if a cycle succeeded recently, 503 otherwise.
+
+        Indicates whether the daemon is processing streams.
+        """
+        if self.is_ready():
+            return web.Response(text="READY")
+        return web.Response(status=503, text="NOT READY")
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        """Handle /metrics endpoint - returns metrics in the Prometheus text format.
+
+        Returns 404 if the server was created without a metrics registry.
+        """
+        if self.metrics is None:
+            raise web.HTTPNotFound()
+        return web.Response(
+            body=self.metrics.render().encode(),
+            headers={"Content-Type": METRICS_CONTENT_TYPE},
+        )
@@ -0,0 +1,233 @@
+"""In-process metrics in the Prometheus text exposition format."""
+
+import math
+from bisect import bisect_left
+from collections.abc import Sequence
+
+# seconds, from a cached lookup to a slow QuadStream update
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet) -> str:
+    """Render a label set as {name="value",...}, or an empty string."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, using Prometheus spellings for infinities."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """Histogram of observed values, one series per label combination.
+
+    Observing a value is one bisect and two additions, so it is cheap enough
+    to call for every fetch.
+
+    Attributes:
+        name: Metric name.
+        help: Metric description.
+        labels: Label names, in the order their values are keyed.
+        buckets: Upper bounds of the buckets, ascending.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name
+            help: Metric description
+            labels: Label names
+            buckets: Upper bounds of the buckets, ascending (+Inf is implied)
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> (per-bucket counts with a final +Inf bucket, sum)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            **labels: Value for each label name
+        """
+        key = tuple(labels[name] for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, **labels: str) -> int:
+        """
+        Get the number of observations of one series.
+
+        Args:
+            **labels: Value for each label name
+
+        Returns:
+            Observations recorded with these label values
+        """
+        key = tuple(labels[name] for name in self.labels)
+        series = self._series.get(key)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        """
+        Render the histogram's samples.
+
+        Returns:
+            Exposition lines, starting with HELP and TYPE
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self._series.items()):
+            labels = tuple(zip(self.labels, key, strict=True))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = _format_labels((*labels, ("le", _format_value(bound))))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """Registry of the daemon's metrics, rendered for the /metrics endpoint.
+
+    Timings are histograms observed by the components as they run. Counters
+    and gauges are either incremented by the daemon (quad changes, cycles) or
+    copied once per cycle from the counters the components already keep
+    (scheduler, caches, publisher, webhooks), so serving /metrics only
+    formats values already collected.
+
+    Attributes:
+        cycle_seconds: Duration of whole cycles.
+        phase_seconds: Duration of each cycle phase (config, login, fetch, filter, build, save).
+        fetch_seconds: Latency of channel probes, by outcome (live, offline, error).
+        quadstream_update_seconds: Latency of QuadStream quad updates, by outcome.
+        webhook_seconds: Latency of webhook requests, by outcome.
+    """
+
+    def __init__(self) -> None:
+        """Initialize metrics registry."""
+        self.cycle_seconds = Histogram("quadlink_cycle_seconds", "Duration of quad update cycles.")
+        self.phase_seconds = Histogram(
+            "quadlink_cycle_phase_seconds",
+            "Duration of each cycle phase.",
+            labels=("phase",),
+        )
+        self.fetch_seconds = Histogram(
+            "quadlink_fetch_seconds",
+            "Latency of channel liveness and metadata probes.",
+            labels=("outcome",),
+        )
+        self.quadstream_update_seconds = Histogram(
+            "quadlink_quadstream_update_seconds",
+            "Latency of QuadStream quad updates.",
+            labels=("outcome",),
+        )
+        self.webhook_seconds = Histogram(
+            "quadlink_webhook_seconds",
+            "Latency of webhook requests.",
+            labels=("outcome",),
+        )
+        self._histograms = [
+            self.cycle_seconds,
+            self.phase_seconds,
+            self.fetch_seconds,
+            self.quadstream_update_seconds,
+            self.webhook_seconds,
+        ]
+        # name -> (type, help, label set -> value)
+        self._values: dict[str, tuple[str, str, dict[LabelSet, float]]] = {}
+
+    def inc(self, name: str, help: str, amount: float = 1, **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Metric name (ending in _total)
+            help: Metric description
+            amount: Amount to add
+            **labels: Label values
+        """
+        key = tuple(sorted(labels.items()))
+        samples = self._family(name, "counter", help)
+        samples[key] = samples.get(key, 0) + amount
+
+    def set(self, name: str, help: str, value: float, kind: str = "gauge", **labels: str) -> None:
+        """
+        Set a gauge, or a counter mirrored from a component's own counter.
+
+        Args:
+            name: Metric name
+            help: Metric description
+            value: Current value
+            kind: "gauge" or "counter"
+            **labels: Label values
+        """
+        self._family(name, kind, help)[tuple(sorted(labels.items()))] = value
+
+    def value(self, name: str, **labels: str) -> float | None:
+        """
+        Get the current value of a counter or gauge.
+
+        Args:
+            name: Metric name
+            **labels: Label values
+
+        Returns:
+            The value, or None if it was never set
+        """
+        family = self._values.get(name)
+        return family[2].get(tuple(sorted(labels.items()))) if family else None
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text, ending in a newline
+        """
+        lines = []
+        for name, (kind, help, samples) in sorted(self._values.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples.items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+    def _family(self, name: str, kind: str, help: str) -> dict[LabelSet, float]:
+        """Get a metric's samples, registering it on first use."""
+        family = self._values.get(name)
+        if family is None:
+            family = self._values[name] = (kind, help, {})
+        return family[2]
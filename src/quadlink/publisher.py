@@ -0,0 +1,162 @@
+"""Background QuadStream updates, decoupled from the fetch cycle."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+from quadlink.types import Quad
+
+logger = structlog.get_logger()
+
+
+class QuadPublisher:
+    """Pushes quads to QuadStream from a background task, latest value wins.
+
+    The main loop hands each new quad to submit() and moves on. Only the
+    newest quad is kept: one that is still waiting when a newer one arrives
+    is dropped, since pushing it would be immediately undone. Failed pushes
+    are retried with capped exponential backoff and full jitter, and a newer
+    quad cuts the wait short.
+
+    Attributes:
+        pushed: Quads pushed successfully.
+        failed: Push attempts that failed.
+        superseded: Quads dropped because a newer one arrived before they were pushed.
+    """
+
+    def __init__(
+        self,
+        push: Callable[[Quad], Awaitable[bool]],
+        on_published: Callable[[Quad], None] | None = None,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Initialize quad publisher.
+
+        Args:
+            push: Coroutine that pushes a quad, returning True on success
+            on_published: Called with each quad after it is pushed
+            backoff: Seconds before the first retry, doubled for each retry
+            max_backoff: Upper bound on the delay between retries
+        """
+        self.push = push
+        self.on_published = on_published
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pushed = 0
+        self.failed = 0
+        self.superseded = 0
+        self._latest: Quad | None = None
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task[None] | None = None
+
+    def submit(self, quad: Quad) -> None:
+        """
+        Queue a quad for pushing, replacing any quad not yet pushed.
+
+        Args:
+            quad: Quad to push
+        """
+        if self._latest is not None:
+            self.superseded += 1
+            logger.debug("quad superseded before push")
+        self._latest = quad
+        self._idle.clear()
+        self._wakeup.set()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the latest quad is pushed.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if nothing is left to push, False on timeout
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            logger.warning("quad push still pending", failed=self.failed)
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Stop the background task, abandoning any unpushed quad."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        """Push the latest quad whenever one is submitted, until cancelled."""
+        attempt = 0
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            quad, self._latest = self._latest, None
+            if quad is None:
+                attempt = 0
+                if self._latest is None:
+                    self._idle.set()
+                continue
+
+            if await self._push(quad):
+                attempt = 0
+                self.pushed += 1
+                if self.on_published:
+                    self.on_published(quad)
+                if self._latest is None:
+                    self._idle.set()
+                else:
+                    self._wakeup.set()
+                continue
+
+            self.failed += 1
+            if self._latest is not None:
+                # a newer quad arrived during the push; try it right away
+                attempt = 0
+                self._wakeup.set()
+                continue
+
+            self._latest = quad
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.warning("quadstream update failed, retrying", delay=round(delay, 2))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+                attempt = 0
+            except TimeoutError:
+                self._wakeup.set()
+
+    async def _push(self, quad: Quad) -> bool:
+        """Push one quad, treating errors as a failed attempt."""
+        try:
+            return await self.push(quad)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("quadstream update error", error=str(e))
+            return False
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Compute the delay before a retry.
+
+        Args:
+            attempt: Zero-based count of consecutive failed pushes
+
+        Returns:
+            Delay in seconds, drawn uniformly up to the capped exponential backoff
+        """
+        ceiling = min(self.backoff * (1 << min(attempt, 16)), self.max_backoff)
+        return random.uniform(0, ceiling)
@@ -1,5 +1,7 @@
 """Quad selection algorithm with stability, diversity, and saturation."""
 
+from typing import Any
+
 import structlog
 
 from quadlink.config.models import Config
@@ -24,6 +26,42 @@ class QuadBuilder:
         self.previous_positions: dict[str, int] = {}  # author -> position (0-3)
         self.quad_changed: bool = False
 
+    def apply_config(self, config: Config) -> None:
+        """
+        Swap in a reloaded config, keeping the previous quad and positions.
+
+        Args:
+            config: New application configuration
+        """
+        self.config = config
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get the quad history that carries over between cycles.
+
+        Returns:
+            JSON-serializable dict of the previous quad, categories, and positions
+        """
+        return {
+            "quad": self.previous_quad.to_dict() if self.previous_quad else None,
+            "categories": dict(self.previous_categories),
+            "positions": dict(self.previous_positions),
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Resume from a snapshot, so the next quad keeps its streams and positions.
+
+        Args:
+            state: Dict returned by snapshot()
+        """
+        quad = state.get("quad")
+        self.previous_quad = Quad(**quad) if quad else None
+        self.previous_categories = dict(state.get("categories", {}))
+        self.previous_positions = {
+            author: int(position) for author, position in state.get("positions", {}).items()
+        }
+
     def build_quad(self, candidates: list[PrioritizedStream]) -> Quad:
         """
         Build optimal quad from stream candidates.
@@ -47,6 +85,43 @@ class QuadBuilder:
             logger.info("no stream candidates available")
             return Quad()
 
+        selected, existing_streams = self._select(candidates)
+        quad = self._build_quad_with_positions(selected, existing_streams)
+        self._log_changes(quad, selected)
+
+        self.previous_quad = quad
+        self.previous_categories = {
+            s.stream.metadata.author.lower(): s.stream.metadata.category for s in selected
+        }
+        self.previous_positions = self._build_position_map(quad, selected)
+
+        return quad
+
+    def select(self, candidates: list[PrioritizedStream]) -> list[PrioritizedStream]:
+        """
+        Select the top 4 streams without updating quad state.
+
+        Args:
+            candidates: List of PrioritizedStream objects
+
+        Returns:
+            Selected streams with adjusted priorities (sharing Stream objects with candidates)
+        """
+        selected, _ = self._select(candidates)
+        return selected
+
+    def _select(
+        self, candidates: list[PrioritizedStream]
+    ) -> tuple[list[PrioritizedStream], list[PrioritizedStream]]:
+        """
+        Apply adjustments and select the top 4 streams.
+
+        Args:
+            candidates: List of PrioritizedStream objects
+
+        Returns:
+            Tuple of (selected streams, existing streams with positions)
+        """
         candidate_map = {s.stream.metadata.author.lower(): s for s in candidates}
         existing_streams = self._get_existing_streams(candidate_map)
         existing_authors = {s.stream.metadata.author.lower() for s in existing_streams}
@@ -63,17 +138,76 @@ class QuadBuilder:
             candidates, existing_authors, existing_streams, departed_categories
         )
         adjusted_candidates.sort(key=lambda s: (s.priority, s.tiebreaker), reverse=True)
-        selected = self._select_top_4(adjusted_candidates)
-        quad = self._build_quad_with_positions(selected, existing_streams)
-        self._log_changes(quad, selected)
+        return self._select_top_4(adjusted_candidates), existing_streams
 
-        self.previous_quad = quad
-        self.previous_categories = {
-            s.stream.metadata.author.lower(): s.stream.metadata.category for s in selected
-        }
-        self.previous_positions = self._build_position_map(quad, selected)
+    def is_decided(self, candidates: list[PrioritizedStream], next_priority: int) -> bool:
+        """
+        Check whether the quad selection can no longer change.
 
-        return quad
+        Every adjustment is bounded: stability and diversity/continuity bonuses
+        add at most a fixed amount, saturation penalties subtract at most
+        diversity_bonus. The selection is decided when the 4th best author's
+        lowest possible score beats the highest possible score of every other
+        fetched author and of any unfetched stream at or below next_priority.
+
+        Args:
+            candidates: Candidates accepted so far
+            next_priority: Highest priority level not yet fetched
+
+        Returns:
+            True if no remaining stream can change the selected authors
+        """
+        floors: dict[str, int] = {}
+        ceilings: dict[str, int] = {}
+        for candidate in candidates:
+            author = candidate.stream.metadata.author.lower()
+            floor, ceiling = self._score_bounds(author, candidate.priority)
+            floors[author] = max(floors.get(author, floor), floor)
+            ceilings[author] = max(ceilings.get(author, ceiling), ceiling)
+
+        if len(floors) < 4:
+            return False
+
+        ranked = sorted(floors, key=lambda a: floors[a], reverse=True)
+        fourth_floor = floors[ranked[3]]
+        unfetched_ceiling = next_priority + self._max_bonus()
+        others_ceiling = max((ceilings[a] for a in ranked[4:]), default=unfetched_ceiling)
+
+        return fourth_floor > max(unfetched_ceiling, others_ceiling)
+
+    def _score_bounds(self, author: str, priority: int) -> tuple[int, int]:
+        """
+        Get the lowest and highest adjusted priority a candidate can reach.
+
+        Args:
+            author: Candidate author (lowercase)
+            priority: Candidate base priority
+
+        Returns:
+            Tuple of (floor, ceiling)
+        """
+        if author in self.previous_positions:
+            # existing streams always get the stability bonus and never a penalty
+            bonus = priority + self.config.stability_bonus
+            return bonus, bonus
+
+        # bonuses may be configured negative, which flips them into penalties
+        # (and the saturation penalty into a bonus), so bound by magnitude
+        spread = abs(self.config.diversity_bonus) + abs(self.config.category_continuity_bonus)
+        return priority - spread, priority + spread
+
+    def _max_bonus(self) -> int:
+        """
+        Get the largest total bonus any single candidate can receive.
+
+        Returns:
+            Upper bound on adjusted priority minus base priority
+        """
+        return max(
+            self.config.stability_bonus,
+            abs(self.config.diversity_bonus) + abs(self.config.category_continuity_bonus),
+            0,
+        )
 
     def _build_position_map(self, quad: Quad, selected: list[PrioritizedStream]) -> dict[str, int]:
         """
@@ -291,6 +425,7 @@ class QuadBuilder:
             Quad with URLs in proper positions
         """
         quad_urls = ["", "", "", ""]
+        quad_authors = ["", "", "", ""]
 
         # prefer playlist over front-facing URL for playback
         selected_map = {
@@ -302,6 +437,7 @@ class QuadBuilder:
             author = stream.stream.metadata.author.lower()
             if author in selected_map and stream.position is not None:
                 quad_urls[stream.position] = selected_map[author]
+                quad_authors[stream.position] = author
                 existing_authors.add(author)
 
         new_streams = [
@@ -315,6 +451,7 @@ class QuadBuilder:
             if not quad_urls[i] and new_stream_index < len(new_streams):
                 new_stream = new_streams[new_stream_index].stream
                 quad_urls[i] = new_stream.master_url or new_stream.url
+                quad_authors[i] = new_stream.metadata.author.lower()
                 new_stream_index += 1
 
         return Quad(
@@ -322,6 +459,7 @@ class QuadBuilder:
             stream2=quad_urls[1],
             stream3=quad_urls[2],
             stream4=quad_urls[3],
+            authors=tuple(quad_authors),
         )
 
     def _log_changes(self, new_quad: Quad, selected: list[PrioritizedStream]) -> None:
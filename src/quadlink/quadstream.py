@@ -1,6 +1,10 @@
 """QuadStream API client for authentication and quad updates."""
 
+import hashlib
+import importlib.util
+import json
 import time
+from http.cookiejar import CookieJar
 from typing import Any
 
 import httpx
@@ -13,9 +17,29 @@ logger = structlog.get_logger()
 # renew session at 50% of lifetime (like DHCP T1)
 SESSION_RENEWAL_RATIO = 0.5
 
+# negotiate HTTP/2 only when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class QuadStreamClient:
-    """Client for QuadStream API operations."""
+    """Client for QuadStream API operations.
+
+    Logins and updates share one pooled HTTP client, so connections to
+    QuadStream are kept alive between updates instead of paying a TCP and TLS
+    handshake each time. Session cookies live in a single jar owned by the client and
+    are replaced in place on every login.
+
+    The client remembers a digest of the last quad it pushed, so pushing the
+    same quad again (for example after a re-login) is skipped. The digest is
+    tied to the stream's short_id and is dropped when a login returns a
+    different one.
+
+    Attributes:
+        pushed_digest: SHA-256 of the last successfully pushed quad, if any.
+        pushed_authors: Slot authors of the last successfully pushed quad, if any.
+        pushed_at: Wall-clock time of the last successful push, if any.
+        renewals: Re-logins to renew an expiring or expired session.
+    """
 
     BASE_URL = "https://quadstream.tv"
 
@@ -35,6 +59,93 @@ class QuadStreamClient:
         self.short_id: str | None = None
         self._session_started_at: float | None = None
         self._session_expires_at: float | None = None
+        self._cookie_jar = CookieJar()
+        self._client: httpx.AsyncClient | None = None
+        self.pushed_digest: str | None = None
+        self.pushed_authors: tuple[str, ...] | None = None
+        self.renewals = 0
+        self.pushed_at: float | None = None
+
+    @staticmethod
+    def digest(quad: Quad) -> str:
+        """
+        Hash the quad as it is sent to QuadStream.
+
+        Args:
+            quad: Quad to hash
+
+        Returns:
+            Hex SHA-256 of the canonical JSON of quad.to_dict()
+        """
+        payload = json.dumps(quad.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def is_current(self, quad: Quad) -> bool:
+        """
+        Check whether a quad is identical to the last one pushed.
+
+        Args:
+            quad: Quad to compare
+
+        Returns:
+            True if the quad was already pushed and nothing differs
+        """
+        return self.pushed_digest is not None and self.pushed_digest == self.digest(quad)
+
+    def pushed_age(self) -> float:
+        """
+        Get seconds since the last successful push.
+
+        Returns:
+            Seconds since the last push, or infinity if nothing was pushed
+        """
+        if self.pushed_at is None:
+            return float("inf")
+        return time.time() - self.pushed_at
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get the last push, for persisting across restarts.
+
+        Returns:
+            Dict with short_id, digest, authors, and pushed_at
+        """
+        return {
+            "short_id": self.short_id,
+            "digest": self.pushed_digest,
+            "authors": list(self.pushed_authors) if self.pushed_authors is not None else None,
+            "pushed_at": self.pushed_at,
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Resume the last push from a snapshot; login() drops it if the short_id differs.
+
+        Args:
+            state: Dict returned by snapshot()
+        """
+        self.short_id = state.get("short_id")
+        self.pushed_digest = state.get("digest")
+        authors = state.get("authors")
+        self.pushed_authors = tuple(str(a) for a in authors) if authors is not None else None
+        pushed_at = state.get("pushed_at")
+        self.pushed_at = float(pushed_at) if pushed_at is not None else None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared pooled HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                cookies=self._cookie_jar,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _extract_session_expiry(self) -> None:
         """Extract earliest cookie expiration time from session cookies."""
@@ -84,30 +195,37 @@ class QuadStreamClient:
             "secret": self.secret,
         }
 
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, json=payload)
+        # drop the old session so the jar holds only cookies from this login
+        self._cookie_jar.clear()
 
-                if response.status_code != 200:
-                    logger.error(
-                        "quadstream login failed",
-                        status=response.status_code,
-                        response=response.text,
-                    )
-                    return False
+        try:
+            response = await self._get_client().post(url, json=payload)
+
+            if response.status_code != 200:
+                logger.error(
+                    "quadstream login failed",
+                    status=response.status_code,
+                    response=response.text,
+                )
+                return False
 
-                self.cookies = response.cookies
-                self._extract_session_expiry()
+            self.cookies = httpx.Cookies(self._cookie_jar)
+            self._extract_session_expiry()
 
-                data = response.json()
-                self.short_id = data.get("short_id")
+            data = response.json()
+            previous_short_id, self.short_id = self.short_id, data.get("short_id")
+            if self.short_id != previous_short_id:
+                # a different stream: nothing is known to be pushed to it
+                self.pushed_digest = None
+                self.pushed_authors = None
+                self.pushed_at = None
 
-                if not self.short_id:
-                    logger.error("quadstream login response missing short_id")
-                    return False
+            if not self.short_id:
+                logger.error("quadstream login response missing short_id")
+                return False
 
-                logger.info("quadstream logged in", short_id=self.short_id)
-                return True
+            logger.info("quadstream logged in", short_id=self.short_id)
+            return True
 
         except httpx.TimeoutException:
             logger.error("quadstream login timeout")
@@ -121,7 +239,7 @@ class QuadStreamClient:
 
     async def update_quad(self, quad: Quad, _retry: bool = True) -> bool:
         """
-        Update quad on QuadStream.
+        Update quad on QuadStream, skipping a quad identical to the last one pushed.
 
         Args:
             quad: Quad with stream URLs
@@ -134,9 +252,15 @@ class QuadStreamClient:
             logger.error("not logged in to quadstream")
             return False
 
+        digest = self.digest(quad)
+        if digest == self.pushed_digest:
+            logger.debug("quad matches last push, skipping update")
+            return True
+
         # proactively re-auth if session is about to expire
         if self._session_needs_refresh():
             logger.info("session expiring soon, re-authenticating")
+            self.renewals += 1
             if not await self.login():
                 logger.error("proactive re-authentication failed")
                 return False
@@ -153,76 +277,36 @@ class QuadStreamClient:
         )
 
         try:
-            async with httpx.AsyncClient(cookies=self.cookies, timeout=self.timeout) as client:
-                response = await client.post(url, json=quad_dict)
-
-                # session expired unexpectedly - re-auth and retry once
-                if response.status_code == 403 and _retry:
-                    logger.warning("quadstream session expired, re-authenticating")
-                    if await self.login():
-                        return await self.update_quad(quad, _retry=False)
-                    return False
-
-                if response.status_code != 200:
-                    logger.error(
-                        "quadstream update failed",
-                        status=response.status_code,
-                        response=response.text,
-                    )
-                    return False
-
-                logger.info("quadstream updated")
-                return True
-
-        except httpx.TimeoutException:
-            logger.error("quadstream update timeout")
-            return False
-        except httpx.RequestError as e:
-            logger.error("quadstream update request error", error=str(e))
-            return False
-        except Exception as e:
-            logger.error("quadstream update unexpected error", error=str(e))
-            return False
-
-    async def send_webhook(self, webhook_url: str, quad: Quad | None = None) -> bool:
-        """
-        Send webhook notification with quad data.
+            response = await self._get_client().post(url, json=quad_dict)
+
+            # session expired unexpectedly - re-auth and retry once
+            if response.status_code == 403 and _retry:
+                logger.warning("quadstream session expired, re-authenticating")
+                self.renewals += 1
+                if await self.login():
+                    return await self.update_quad(quad, _retry=False)
+                return False
 
-        Args:
-            webhook_url: Webhook URL to trigger
-            quad: Optional quad to include in payload
+            if response.status_code != 200:
+                logger.error(
+                    "quadstream update failed",
+                    status=response.status_code,
+                    response=response.text,
+                )
+                return False
 
-        Returns:
-            True if webhook sent successfully, False otherwise
-        """
-        if not webhook_url:
+            self.pushed_digest = digest
+            self.pushed_authors = quad.authors
+            self.pushed_at = time.time()
+            logger.info("quadstream updated")
             return True
 
-        try:
-            payload: dict[str, Any] = {"event": "quad_updated"}
-            if quad:
-                payload["quad"] = quad.to_dict()
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(webhook_url, json=payload)
-
-                if response.status_code not in (200, 201, 202, 204):
-                    logger.warning(
-                        "webhook failed",
-                        status=response.status_code,
-                        url=webhook_url,
-                    )
-                    return False
-
-                logger.info("webhook sent")
-                return True
-
         except httpx.TimeoutException:
-            logger.warning("webhook timeout", url=webhook_url)
+            logger.error("quadstream update timeout")
             return False
         except httpx.RequestError as e:
-            logger.warning("webhook error", url=webhook_url, error=str(e))
+            logger.error("quadstream update request error", error=str(e))
             return False
         except Exception as e:
-            logger.warning("webhook error", url=webhook_url, error=str(e))
+            logger.error("quadstream update unexpected error", error=str(e))
             return False
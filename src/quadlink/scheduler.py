@@ -0,0 +1,95 @@
+"""Fixed-rate cycle scheduling on the monotonic clock."""
+
+import asyncio
+import math
+import time
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class CycleScheduler:
+    """Starts cycles on a fixed grid of monotonic tick times.
+
+    Sleeping for the interval after each cycle makes the real period
+    interval plus processing time, which drifts. Instead, each wait()
+    sleeps until the next tick after the start of the previous cycle. A
+    cycle that runs past one or more ticks skips them rather than running
+    back-to-back cycles to catch up.
+
+    Attributes:
+        interval: Seconds between cycle starts.
+        overruns: Cycles that ran past their next tick.
+        skipped: Ticks skipped because a cycle overran them.
+        last_overrun: Seconds the last overrunning cycle ran past its tick.
+        last_lag: Seconds the last wake-up was later than its tick.
+        max_lag: Largest wake-up lag seen.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Initialize cycle scheduler.
+
+        Args:
+            interval: Seconds between cycle starts
+        """
+        self.interval = interval
+        self.overruns = 0
+        self.skipped = 0
+        self.last_overrun = 0.0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._tick: float | None = None
+
+    def reset(self) -> None:
+        """Anchor the tick grid at the current time, e.g. after an error backoff."""
+        self._tick = time.monotonic()
+
+    async def wait(self) -> None:
+        """Sleep until the next tick, skipping ticks the last cycle overran."""
+        if self._tick is None:
+            self.reset()
+        assert self._tick is not None
+
+        now = time.monotonic()
+        target = self._tick + self.interval
+        if now > target:
+            missed = math.ceil((now - target) / self.interval)
+            self.overruns += 1
+            self.skipped += missed
+            self.last_overrun = now - target
+            logger.warning(
+                "cycle overran interval",
+                overrun=round(self.last_overrun, 3),
+                skipped_ticks=missed,
+            )
+            target += missed * self.interval
+
+        delay = target - now
+        logger.debug(
+            "sleeping",
+            delay=round(delay, 3),
+            interval=self.interval,
+            scheduler=self.stats(),
+        )
+        await asyncio.sleep(delay)
+
+        self.last_lag = max(0.0, time.monotonic() - target)
+        self.max_lag = max(self.max_lag, self.last_lag)
+        self._tick = target
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get scheduling counters for tuning.
+
+        Returns:
+            Dict with overruns, skipped ticks, last overrun, and wake-up lag
+        """
+        return {
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "last_overrun": round(self.last_overrun, 3),
+            "last_lag": round(self.last_lag, 3),
+            "max_lag": round(self.max_lag, 3),
+        }
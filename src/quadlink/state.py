@@ -0,0 +1,152 @@
+"""On-disk snapshot of quad history and fetch caches, kept across restarts."""
+
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from quadlink.quad import QuadBuilder
+from quadlink.quadstream import QuadStreamClient
+from quadlink.stream.processor import StreamProcessor
+
+logger = structlog.get_logger()
+
+
+class StateStore:
+    """Saves and restores daemon state as a JSON file.
+
+    The snapshot holds the quad builder's previous quad, categories, and
+    positions, the processor's offline cache and refresh tracker, and the
+    digest and authors of the last quad pushed to QuadStream. After a
+    restart, the first cycle then keeps the current streams in place and
+    skips the push if the quad matches what QuadStream last accepted. Writes
+    go to a temporary file that replaces the snapshot, so a crash mid-write
+    never leaves a truncated file. Unreadable or incompatible snapshots are
+    ignored.
+
+    Attributes:
+        VERSION: Snapshot format version; other versions are ignored on load.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str | Path):
+        """
+        Initialize state store.
+
+        Args:
+            path: Snapshot file path
+        """
+        self.path = Path(path)
+
+    def restore(self, builder: QuadBuilder, processor: StreamProcessor) -> bool:
+        """
+        Load the snapshot into the quad builder and processor.
+
+        Args:
+            builder: Quad builder to resume
+            processor: Stream processor whose caches to warm
+
+        Returns:
+            True if a snapshot was restored, False if none was usable
+        """
+        state = self._read()
+        if state is None:
+            return False
+
+        try:
+            builder.restore(state.get("quad_builder", {}))
+            processor.restore(state.get("processor", {}))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("failed to restore state", path=str(self.path), error=str(e))
+            builder.restore({})
+            return False
+
+        logger.info(
+            "state restored",
+            path=str(self.path),
+            quad_authors=len(builder.previous_positions),
+        )
+        return True
+
+    def restore_client(self, client: QuadStreamClient) -> bool:
+        """
+        Load the last push into a QuadStream client before it logs in.
+
+        Args:
+            client: QuadStream client to resume
+
+        Returns:
+            True if a last push was restored
+        """
+        state = self._read()
+        if state is None or not state.get("quadstream"):
+            return False
+        try:
+            client.restore(state["quadstream"])
+        except (TypeError, ValueError) as e:
+            logger.warning("failed to restore state", path=str(self.path), error=str(e))
+            client.restore({})
+            return False
+        return True
+
+    async def save(
+        self,
+        builder: QuadBuilder,
+        processor: StreamProcessor,
+        client: QuadStreamClient | None = None,
+    ) -> None:
+        """
+        Write a snapshot of the quad builder, processor, and last push, logging failures.
+
+        The snapshot is taken on the event loop and written from a worker thread.
+
+        Args:
+            builder: Quad builder to snapshot
+            processor: Stream processor whose caches to snapshot
+            client: QuadStream client whose last push to snapshot
+        """
+        state = {
+            "version": self.VERSION,
+            "quad_builder": builder.snapshot(),
+            "processor": processor.snapshot(),
+            "quadstream": client.snapshot() if client else None,
+        }
+        try:
+            await asyncio.to_thread(self._write, state)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("failed to write state file", path=str(self.path), error=str(e))
+
+    def _read(self) -> dict[str, Any] | None:
+        """Read the snapshot, or None if it is missing, unreadable, or incompatible."""
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("failed to read state file", path=str(self.path), error=str(e))
+            return None
+
+        if not isinstance(state, dict) or state.get("version") != self.VERSION:
+            logger.warning("ignoring incompatible state file", path=str(self.path))
+            return None
+        return state
+
+    def _write(self, state: dict[str, Any]) -> None:
+        """Write state to a temporary file and atomically replace the snapshot."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
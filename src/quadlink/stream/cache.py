@@ -0,0 +1,177 @@
+"""Negative-result cache for offline channels."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _OfflineEntry:
+    """Cached offline result for one channel.
+
+    Attributes:
+        offline_since: Monotonic time the channel was first seen offline.
+        expires_at: Monotonic time after which the channel is probed again.
+    """
+
+    offline_since: float
+    expires_at: float
+
+
+class NegativeCache:
+    """Remembers offline channels so they are not probed every cycle.
+
+    The TTL starts at ``ttl`` and doubles for every ``backoff_after`` seconds a
+    channel has stayed offline, capped at ``max_ttl``. Each TTL is spread by
+    +/- ``jitter`` so channels that went offline together are not re-probed in
+    the same cycle. Thread-safe, since Streamlink fetches run in worker threads.
+
+    Attributes:
+        hits: Lookups answered from the cache (probe skipped).
+        misses: Lookups that required a probe.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 120,
+        jitter: float = 0.2,
+        max_ttl: float = 900,
+        backoff_after: float = 3600,
+    ):
+        """
+        Initialize negative cache.
+
+        Args:
+            ttl: Base seconds to skip a channel after it is seen offline
+            jitter: Fraction of the TTL to randomize by (0.2 = +/-20%)
+            max_ttl: Upper bound on the TTL after backoff
+            backoff_after: Seconds offline after which the TTL doubles
+        """
+        self.ttl = ttl
+        self.jitter = jitter
+        self.max_ttl = max_ttl
+        self.backoff_after = backoff_after
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, _OfflineEntry] = {}
+        self._lock = threading.Lock()
+
+    def is_offline(self, url: str) -> bool:
+        """
+        Check whether a channel is cached as offline, counting a hit or miss.
+
+        Args:
+            url: Stream URL or username
+
+        Returns:
+            True if the channel was seen offline and its TTL has not expired
+        """
+        key = self._key(url)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+
+    def mark_offline(self, url: str) -> None:
+        """
+        Record that a channel is offline, extending its TTL with backoff.
+
+        Args:
+            url: Stream URL or username
+        """
+        key = self._key(url)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            offline_since = entry.offline_since if entry else now
+            self._entries[key] = _OfflineEntry(
+                offline_since=offline_since,
+                expires_at=now + self._next_ttl(now - offline_since),
+            )
+
+    def mark_live(self, url: str) -> None:
+        """
+        Forget a channel's offline state once it is seen live.
+
+        Args:
+            url: Stream URL or username
+        """
+        with self._lock:
+            self._entries.pop(self._key(url), None)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """
+        Get cached channels with wall-clock times, for persisting across restarts.
+
+        Returns:
+            Dict mapping channel key to offline_since and expires_at (epoch seconds)
+        """
+        offset = time.time() - time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    "offline_since": entry.offline_since + offset,
+                    "expires_at": entry.expires_at + offset,
+                }
+                for key, entry in self._entries.items()
+            }
+
+    def restore(self, entries: dict[str, Any]) -> None:
+        """
+        Load channels from a snapshot, skipping entries that have expired.
+
+        Args:
+            entries: Dict returned by snapshot()
+        """
+        offset = time.time() - time.monotonic()
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in entries.items():
+                expires_at = float(entry["expires_at"]) - offset
+                if expires_at > now:
+                    self._entries[key] = _OfflineEntry(
+                        offline_since=float(entry["offline_since"]) - offset,
+                        expires_at=expires_at,
+                    )
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get cache counters for tuning.
+
+        Returns:
+            Dict with hits, misses, hit_rate, and number of cached channels
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def _next_ttl(self, offline_for: float) -> float:
+        """
+        Compute the TTL for a channel that has been offline for a while.
+
+        Args:
+            offline_for: Seconds since the channel was first seen offline
+
+        Returns:
+            TTL in seconds with backoff and jitter applied
+        """
+        doublings = int(offline_for // self.backoff_after) if self.backoff_after > 0 else 0
+        ttl = min(self.ttl * (1 << min(doublings, 16)), self.max_ttl)
+        return ttl * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _key(self, url: str) -> str:
+        """Normalize usernames and URLs to one cache key."""
+        if not url.startswith("http"):
+            url = f"https://twitch.tv/{url}"
+        return url.lower().rstrip("/")
@@ -4,14 +4,16 @@ import asyncio
 import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 import structlog
 from streamlink import Streamlink
 from streamlink.exceptions import NoPluginError, PluginError, StreamlinkError
 from streamlink.options import Options
 
+from quadlink.stream.cache import NegativeCache
 from quadlink.types import Metadata, Stream
 
 # plugin directory (ttvlol twitch.py fetched by nix)
@@ -22,6 +24,51 @@ logger = structlog.get_logger()
 # suppress Streamlink logging, we handle errors ourselves
 logging.getLogger("streamlink").setLevel(logging.CRITICAL)
 
+# plugin error messages that mean the channel is simply not live
+OFFLINE_ERRORS = [
+    "offline",
+    "not streaming",
+    "channel not found",
+    "user not found",
+    "no playable streams found",
+]
+
+
+class StreamFetcher(Protocol):
+    """Interface shared by stream fetcher backends."""
+
+    async def fetch_stream_info(self, url: str) -> Stream | None:
+        """Fetch stream metadata and playlist URL."""
+        ...
+
+    async def probe_stream_info(self, url: str) -> Stream | None:
+        """Fetch liveness and metadata only."""
+        ...
+
+    async def resolve_stream(self, stream: Stream) -> Stream | None:
+        """Resolve the playlist URL for a probed stream."""
+        ...
+
+    async def fetch_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """Fetch stream metadata and playlist URLs for many URLs."""
+        ...
+
+    async def probe_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """Fetch liveness and metadata only for many URLs."""
+        ...
+
+    async def resolve_many(self, streams: list[Stream]) -> list[Stream | None]:
+        """Resolve playlist URLs for many probed streams."""
+        ...
+
+    async def warm_up(self) -> None:
+        """Prepare sessions or connections ahead of the first fetch."""
+        ...
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        ...
+
 
 class StreamlinkFetcher:
     """Fetches Twitch stream metadata using Streamlink."""
@@ -31,6 +78,7 @@ class StreamlinkFetcher:
         proxy_playlist: str = "https://eu.luminous.dev",
         low_latency: bool = True,
         max_workers: int = 3,
+        offline_cache: NegativeCache | None = None,
     ):
         """
         Initialize Streamlink fetcher.
@@ -39,11 +87,82 @@ class StreamlinkFetcher:
             proxy_playlist: Twitch playlist proxy URL
             low_latency: Enable low-latency mode
             max_workers: Maximum thread pool workers for blocking Streamlink calls
+            offline_cache: Optional cache updated with each channel's liveness
+        """
+        self._proxy_playlist = proxy_playlist
+        self._low_latency = low_latency
+        self.offline_cache = offline_cache
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._thread_local = threading.local()
+        self._options: Options | None = None  # rebuilt when proxy/latency settings change
+        self._resolved: dict[str, tuple[str, Any, str]] = {}  # url -> resolve_url() result
+
+    @property
+    def proxy_playlist(self) -> str:
+        """Twitch playlist proxy URL."""
+        return self._proxy_playlist
+
+    @proxy_playlist.setter
+    def proxy_playlist(self, value: str) -> None:
+        self._proxy_playlist = value
+        self._options = None
+
+    @property
+    def low_latency(self) -> bool:
+        """Whether low-latency mode is enabled."""
+        return self._low_latency
+
+    @low_latency.setter
+    def low_latency(self, value: bool) -> None:
+        self._low_latency = value
+        self._options = None
+
+    async def warm_up(self, timeout: float = 30.0) -> None:
+        """
+        Build a Streamlink session in every worker thread, in parallel.
+
+        Each task holds its worker at a barrier until all workers have a
+        session, so every thread in the pool gets exactly one task.
+
+        Args:
+            timeout: Seconds to wait for all workers before giving up
+        """
+        barrier = threading.Barrier(self.max_workers)
+
+        def build_session() -> None:
+            self._get_session()
+            try:
+                barrier.wait(timeout)
+            except threading.BrokenBarrierError:
+                pass
+
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self.executor, build_session) for _ in range(self.max_workers))
+        )
+
+    async def close(self) -> None:
+        """Shut down the worker thread pool without waiting for running fetches."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def resize(self, max_workers: int) -> None:
         """
-        self.proxy_playlist = proxy_playlist
-        self.low_latency = low_latency
+        Replace the worker thread pool with one of a different size.
+
+        Sessions are thread-local, so workers of the new pool build fresh
+        sessions; plugin resolutions and options are kept.
+
+        Args:
+            max_workers: New maximum thread pool workers
+        """
+        if max_workers == self.max_workers:
+            return
+        old_executor = self.executor
+        self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self._thread_local = threading.local()
+        old_executor.shutdown(wait=False)
 
     async def fetch_stream_info(self, url: str) -> Stream | None:
         """
@@ -55,12 +174,83 @@ class StreamlinkFetcher:
         Returns:
             Stream object with metadata, or None if stream is offline/unavailable
         """
-        if not url.startswith("http"):
-            url = f"https://twitch.tv/{url}"
-
+        url = self._normalize_url(url)
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.executor, self._fetch_stream_info_sync, url)
 
+    async def probe_stream_info(self, url: str) -> Stream | None:
+        """
+        Fetch liveness and metadata only, without resolving the playlist.
+
+        Args:
+            url: Twitch stream URL (e.g., https://twitch.tv/streamer or just 'streamer')
+
+        Returns:
+            Stream object without master_url, or None if stream is offline/unavailable
+        """
+        url = self._normalize_url(url)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self._probe_stream_info_sync, url)
+
+    async def resolve_stream(self, stream: Stream) -> Stream | None:
+        """
+        Resolve the master playlist for a probed stream.
+
+        Args:
+            stream: Stream returned by probe_stream_info
+
+        Returns:
+            Copy of stream with master_url set, or None if it is no longer available
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, self._resolve_stream_sync, stream)
+
+    async def fetch_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """
+        Fetch many streams concurrently through the worker thread pool.
+
+        Streamlink has no batch lookup, so this is one fetch per URL.
+
+        Args:
+            urls: Twitch stream URLs or usernames
+
+        Returns:
+            Mapping of each input URL to its Stream, or None if offline/unavailable
+        """
+        results = await asyncio.gather(*(self.fetch_stream_info(url) for url in urls))
+        return dict(zip(urls, results, strict=True))
+
+    async def probe_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """
+        Probe many streams concurrently through the worker thread pool.
+
+        Args:
+            urls: Twitch stream URLs or usernames
+
+        Returns:
+            Mapping of each input URL to a Stream without master_url, or None
+        """
+        results = await asyncio.gather(*(self.probe_stream_info(url) for url in urls))
+        return dict(zip(urls, results, strict=True))
+
+    async def resolve_many(self, streams: list[Stream]) -> list[Stream | None]:
+        """
+        Resolve playlists for many probed streams through the worker thread pool.
+
+        Args:
+            streams: Streams returned by probe_stream_info
+
+        Returns:
+            Streams with master_url set (None where unavailable), in input order
+        """
+        return list(await asyncio.gather(*(self.resolve_stream(stream) for stream in streams)))
+
+    def _normalize_url(self, url: str) -> str:
+        """Expand bare usernames to full Twitch URLs."""
+        if not url.startswith("http"):
+            url = f"https://twitch.tv/{url}"
+        return url
+
     def _get_session(self) -> Streamlink:
         """
         Get or create a thread-local Streamlink session.
@@ -78,21 +268,14 @@ class StreamlinkFetcher:
 
         return self._thread_local.session
 
-    def _fetch_stream_info_sync(self, url: str) -> Stream | None:
+    def _get_options(self) -> Options:
         """
-        Fetch stream metadata synchronously.
-
-        Args:
-            url: Normalized Twitch stream URL
+        Get the plugin options for the current fetcher settings.
 
-        Returns:
-            Stream object with metadata, or None if stream is offline/unavailable
+        Built once and shared by every plugin; plugins copy the options they
+        are given, so the shared instance is never mutated.
         """
-        try:
-            session = self._get_session()
-            plugin_name, plugin_class, resolved_url = session.resolve_url(url)
-
-            # pass options to constructor for ttvlol __init__
+        if self._options is None:
             opts = Options()
             opts.set("disable-ads", True)
             opts.set("low-latency", self.low_latency)
@@ -100,55 +283,198 @@ class StreamlinkFetcher:
             if self.proxy_playlist:
                 opts.set("proxy-playlist", [self.proxy_playlist])
                 opts.set("proxy-playlist-fallback", False)
+            self._options = opts
 
-            plugin = plugin_class(session, resolved_url, options=opts)
-            streams = plugin.streams()
+        return self._options
 
-            if not streams:
-                logger.debug("stream unavailable", url=url)
-                return None
+    def _create_plugin(self, url: str) -> Any:
+        """
+        Resolve the plugin for a URL and instantiate it with fetcher options.
+
+        Plugin resolution matches the URL against every loaded plugin, so the
+        result is memoized per URL. All sessions load the same plugins, so a
+        resolution from one worker thread is valid in the others.
+
+        Args:
+            url: Normalized Twitch stream URL
 
-            if "best" not in streams:
-                logger.debug("no 'best' stream available", url=url, available=list(streams.keys()))
+        Returns:
+            Streamlink plugin instance
+        """
+        session = self._get_session()
+        resolved = self._resolved.get(url)
+        if resolved is None:
+            resolved = self._resolved[url] = session.resolve_url(url)
+        plugin_name, plugin_class, resolved_url = resolved
+
+        # pass options to constructor for ttvlol __init__
+        return plugin_class(session, resolved_url, options=self._get_options())
+
+    def _fetch_stream_info_sync(self, url: str) -> Stream | None:
+        """
+        Fetch stream metadata synchronously.
+
+        Args:
+            url: Normalized Twitch stream URL
+
+        Returns:
+            Stream object with metadata, or None if stream is offline/unavailable
+        """
+        try:
+            plugin = self._create_plugin(url)
+            stream = self._get_best_stream(plugin, url)
+            if stream is None:
                 return None
 
-            stream = streams["best"]
             metadata = self._extract_metadata(plugin, url)
 
             if not metadata:
                 logger.warning("could not extract metadata", url=url)
                 return None
 
+            self._record_liveness(url, live=True)
             master_url = stream.url if hasattr(stream, "url") else None
 
             return Stream(url=url, metadata=metadata, master_url=master_url)
 
-        except NoPluginError:
-            logger.debug("no plugin for url", url=url)
+        except Exception as e:
+            self._log_fetch_error(url, e)
             return None
-        except PluginError as e:
-            error_msg = str(e).lower()
-            if any(
-                msg in error_msg
-                for msg in [
-                    "offline",
-                    "not streaming",
-                    "channel not found",
-                    "user not found",
-                    "no playable streams found",
-                ]
-            ):
-                logger.debug("stream unavailable", url=url, reason=str(e))
+
+    def _probe_stream_info_sync(self, url: str) -> Stream | None:
+        """
+        Fetch liveness and metadata synchronously, skipping the playlist.
+
+        Plugins without a stream id accessor cannot report liveness from
+        metadata alone, so they fall back to a full fetch. The Twitch plugin
+        swallows errors from its metadata query, so a missing stream id only
+        means offline when the query resolved the channel; otherwise the
+        probe falls back to a full fetch, which decides liveness from the
+        playlist, rather than caching a transient failure as offline.
+
+        Args:
+            url: Normalized Twitch stream URL
+
+        Returns:
+            Stream object without master_url, or None if stream is offline/unavailable
+        """
+        try:
+            plugin = self._create_plugin(url)
+
+            if not hasattr(plugin, "get_id"):
+                return self._fetch_stream_info_sync(url)
+
+            # twitch metadata only carries a stream id while the channel is live
+            if not plugin.get_id():
+                if not plugin.get_author():
+                    logger.debug("stream metadata unavailable, fetching playlist", url=url)
+                    return self._fetch_stream_info_sync(url)
+                logger.debug("stream unavailable", url=url)
+                self._record_liveness(url, live=False)
                 return None
-            logger.warning("streamlink plugin error", url=url, error=str(e))
-            return None
-        except StreamlinkError as e:
-            logger.warning("streamlink error", url=url, error=str(e))
+
+            metadata = self._extract_metadata(plugin, url)
+
+            if not metadata:
+                logger.warning("could not extract metadata", url=url)
+                return None
+
+            self._record_liveness(url, live=True)
+            return Stream(url=url, metadata=metadata)
+
+        except Exception as e:
+            self._log_fetch_error(url, e)
             return None
+
+    def _resolve_stream_sync(self, stream: Stream) -> Stream | None:
+        """
+        Resolve the master playlist for a probed stream synchronously.
+
+        Args:
+            stream: Stream returned by a probe
+
+        Returns:
+            Copy of stream with master_url set, or None if it is no longer available
+        """
+        try:
+            plugin = self._create_plugin(stream.url)
+            best = self._get_best_stream(plugin, stream.url)
+            if best is None:
+                return None
+
+            self._record_liveness(stream.url, live=True)
+            master_url = best.url if hasattr(best, "url") else None
+
+            return replace(stream, master_url=master_url)
+
         except Exception as e:
-            logger.error("unexpected error fetching stream", url=url, error=str(e))
+            self._log_fetch_error(stream.url, e)
             return None
 
+    def _get_best_stream(self, plugin: Any, url: str) -> Any | None:
+        """
+        Fetch the stream list and pick the best quality.
+
+        Args:
+            plugin: Streamlink plugin instance
+            url: Stream URL (for logging)
+
+        Returns:
+            Streamlink stream for the best quality, or None if unavailable
+        """
+        streams = plugin.streams()
+
+        if not streams:
+            logger.debug("stream unavailable", url=url)
+            self._record_liveness(url, live=False)
+            return None
+
+        if "best" not in streams:
+            logger.debug("no 'best' stream available", url=url, available=list(streams.keys()))
+            return None
+
+        return streams["best"]
+
+    def _record_liveness(self, url: str, live: bool) -> None:
+        """
+        Update the offline cache with a channel's observed state.
+
+        Args:
+            url: Normalized Twitch stream URL
+            live: Whether the channel was seen live
+        """
+        if self.offline_cache is None:
+            return
+        if live:
+            self.offline_cache.mark_live(url)
+        else:
+            self.offline_cache.mark_offline(url)
+
+    def _log_fetch_error(self, url: str, error: Exception) -> None:
+        """
+        Log a fetch error at a level matching its cause.
+
+        Errors that mean the channel is offline are also recorded in the
+        offline cache; transient errors are not, so the channel is retried.
+
+        Args:
+            url: Stream URL
+            error: Exception raised while fetching
+        """
+        if isinstance(error, NoPluginError):
+            logger.debug("no plugin for url", url=url)
+        elif isinstance(error, PluginError):
+            error_msg = str(error).lower()
+            if any(msg in error_msg for msg in OFFLINE_ERRORS):
+                logger.debug("stream unavailable", url=url, reason=str(error))
+                self._record_liveness(url, live=False)
+            else:
+                logger.warning("streamlink plugin error", url=url, error=str(error))
+        elif isinstance(error, StreamlinkError):
+            logger.warning("streamlink error", url=url, error=str(error))
+        else:
+            logger.error("unexpected error fetching stream", url=url, error=str(error))
+
     def _extract_metadata(self, plugin: Any, url: str) -> Metadata | None:
         """
         Extract metadata from Streamlink plugin.
@@ -1,6 +1,8 @@
 """Regex-based stream filtering system."""
 
 import re
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import StrEnum
 
 import structlog
@@ -10,6 +12,12 @@ from quadlink.types import Stream
 
 logger = structlog.get_logger()
 
+# leading global inline flags, e.g. "(?i)", which must become scoped when combined
+GLOBAL_FLAGS = re.compile(r"^\(\?([aimsux]+)\)")
+
+# numbered backreferences and conditionals break when groups are renumbered
+GROUP_REFERENCES = re.compile(r"\\[1-9]|\(\?\(")
+
 
 class RejectReason(StrEnum):
     """Machine-readable rejection reasons."""
@@ -20,31 +28,159 @@ class RejectReason(StrEnum):
     TITLE_BLOCK_MATCH = "TITLE_BLOCK_MATCH"
 
 
-class FilterCache:
-    """Cache compiled regex patterns for performance."""
+@dataclass(frozen=True)
+class AllowList:
+    """One allow list merged across rulesets.
+
+    Attributes:
+        sources: Comma-separated names of the contributing rulesets.
+        combined: Single alternation of all patterns, if they could be combined.
+        patterns: Individually compiled patterns, used when combining failed.
+    """
+
+    sources: str
+    combined: re.Pattern[str] | None
+    patterns: tuple[re.Pattern[str], ...]
+
+    @property
+    def configured(self) -> bool:
+        """Whether any ruleset defines this list."""
+        return bool(self.patterns)
+
+    def matches(self, text: str) -> bool:
+        """Check if text matches any pattern in the list."""
+        if self.combined is not None:
+            return self.combined.search(text) is not None
+        return any(pattern.search(text) for pattern in self.patterns)
+
+
+@dataclass(frozen=True)
+class BlockList:
+    """One block list merged across rulesets, reporting the first matching ruleset.
+
+    Attributes:
+        names: Ruleset name for each named group (r0, r1, ...) in combined.
+        combined: Anchored alternation with one lookahead per ruleset, tried in
+            ruleset order, so the first ruleset with any match wins regardless
+            of where in the text its pattern matches.
+        patterns: Individually compiled (pattern, ruleset) pairs, used when
+            combining failed.
+    """
+
+    names: tuple[str, ...]
+    combined: re.Pattern[str] | None
+    patterns: tuple[tuple[re.Pattern[str], str], ...]
+
+    def first_match(self, text: str) -> str | None:
+        """Find the first ruleset (in order) with a pattern matching text."""
+        if self.combined is not None:
+            match = self.combined.match(text)
+            if match is None or match.lastgroup is None:
+                return None
+            return self.names[int(match.lastgroup[1:])]
+        for pattern, name in self.patterns:
+            if pattern.search(text):
+                return name
+        return None
 
-    def __init__(self) -> None:
-        self._cache: dict[str, re.Pattern[str]] = {}
 
-    def get_pattern(self, regex: str) -> re.Pattern[str]:
-        """Get or compile and cache regex pattern."""
-        if regex not in self._cache:
-            self._cache[regex] = re.compile(regex)
-        return self._cache[regex]
+@dataclass(frozen=True)
+class FilterProgram:
+    """Filters of a stream group's rulesets, compiled once for repeated evaluation.
+
+    Attributes:
+        allow_categories: Merged category allow list.
+        allow_titles: Merged title allow list.
+        block_categories: Merged category block list.
+        block_titles: Merged title block list.
+    """
+
+    allow_categories: AllowList
+    allow_titles: AllowList
+    block_categories: BlockList
+    block_titles: BlockList
+
+    def evaluate(self, category: str, title: str) -> tuple[bool, str, str]:
+        """
+        Check a category and title against the program.
+
+        Logic:
+        1. If any allow_categories exist: category must match at least one
+        2. If no allow_categories: check block_categories
+        3. Same logic for titles
+        4. Return which ruleset caused the rejection
+
+        Returns:
+            Tuple of (passed, reason, ruleset)
+        """
+        if self.allow_categories.configured:
+            if not self.allow_categories.matches(category):
+                return False, RejectReason.CATEGORY_ALLOW_MISS, self.allow_categories.sources
+        else:
+            matched_ruleset = self.block_categories.first_match(category)
+            if matched_ruleset:
+                return False, RejectReason.CATEGORY_BLOCK_MATCH, matched_ruleset
+
+        if self.allow_titles.configured:
+            if not self.allow_titles.matches(title):
+                return False, RejectReason.TITLE_ALLOW_MISS, self.allow_titles.sources
+        else:
+            matched_ruleset = self.block_titles.first_match(title)
+            if matched_ruleset:
+                return False, RejectReason.TITLE_BLOCK_MATCH, matched_ruleset
+
+        return True, "", ""
 
 
 class StreamFilter:
-    """Filters streams based on category and title regex patterns."""
+    """Filters streams based on category and title regex patterns.
+
+    Verdicts are memoized in a bounded LRU keyed on (category, title,
+    rulesets), since a live channel's category and title rarely change
+    between cycles.
 
-    def __init__(self, config: Config):
+    Attributes:
+        hits: Verdicts served from the memo.
+        misses: Verdicts computed by running the filter program.
+    """
+
+    def __init__(self, config: Config, verdict_cache_size: int = 4096):
         """
         Initialize stream filter.
 
         Args:
             config: Application configuration with rulesets
+            verdict_cache_size: Maximum memoized verdicts
+        """
+        self.config = config
+        self.verdict_cache_size = verdict_cache_size
+        self.hits = 0
+        self.misses = 0
+        self._programs: dict[tuple[str, ...], FilterProgram | None] = {}
+        self._verdicts: OrderedDict[tuple[str, str, tuple[str, ...]], tuple[bool, str, str]] = (
+            OrderedDict()
+        )
+
+    def apply_config(self, config: Config) -> None:
+        """
+        Swap in a reloaded config.
+
+        Programs and memoized verdicts are dropped only for ruleset
+        combinations that include a changed ruleset.
+
+        Args:
+            config: New application configuration
         """
+        old_config = self.config
         self.config = config
-        self.cache = FilterCache()
+        self._programs = {
+            names: program
+            for names, program in self._programs.items()
+            if all(old_config.get_ruleset(name) == config.get_ruleset(name) for name in names)
+        }
+        stale = {key for key in self._verdicts if key[2] not in self._programs}
+        for key in stale:
+            del self._verdicts[key]
 
     def apply_filters(self, stream: Stream, ruleset_names: list[str]) -> tuple[bool, str, str]:
         """
@@ -57,100 +193,140 @@ class StreamFilter:
         Returns:
             Tuple of (passed, reason, ruleset) - reason/ruleset are empty if passed
         """
-        maybe_rulesets = [(name, self.config.get_ruleset(name)) for name in ruleset_names]
-        rulesets: list[tuple[str, Ruleset]] = [
-            (name, r) for name, r in maybe_rulesets if r is not None
-        ]
+        names = tuple(ruleset_names)
+        key = (stream.metadata.category, stream.metadata.title, names)
+        verdict = self._verdicts.get(key)
+        if verdict is not None:
+            self.hits += 1
+            self._verdicts.move_to_end(key)
+            return verdict
+
+        self.misses += 1
+        if names in self._programs:
+            program = self._programs[names]
+        else:
+            program = self._programs[names] = self._compile(names)
 
-        if not rulesets:
-            return True, "", ""
+        if program is None:
+            verdict = (True, "", "")
+        else:
+            verdict = program.evaluate(stream.metadata.category, stream.metadata.title)
 
-        return self._check_filters_with_attribution(stream, rulesets)
+        self._verdicts[key] = verdict
+        if len(self._verdicts) > self.verdict_cache_size:
+            self._verdicts.popitem(last=False)
+        return verdict
 
-    def _check_filters_with_attribution(
-        self, stream: Stream, rulesets: list[tuple[str, Ruleset]]
-    ) -> tuple[bool, str, str]:
+    def stats(self) -> dict[str, float]:
         """
-        Check if stream passes filter rules, tracking which ruleset caused rejection.
-
-        Logic:
-        1. Collect all allow/block patterns with their source ruleset
-        2. If any allow_categories exist: category must match at least one
-        3. If no allow_categories: check block_categories
-        4. Same logic for titles
-        5. Return which ruleset caused the rejection
+        Get verdict memo counters for tuning.
 
         Returns:
-            Tuple of (passed, reason, ruleset)
+            Dict with hits, misses, hit_rate, and number of memoized verdicts
         """
-        category = stream.metadata.category
-        title = stream.metadata.title
-
-        # (pattern, ruleset_name) tuples for attribution
-        allow_categories: list[tuple[str, str]] = []
-        allow_titles: list[tuple[str, str]] = []
-        block_categories: list[tuple[str, str]] = []
-        block_titles: list[tuple[str, str]] = []
-
-        for name, ruleset in rulesets:
-            for pattern in ruleset.filters.allow_categories:
-                allow_categories.append((pattern, name))
-            for pattern in ruleset.filters.allow_titles:
-                allow_titles.append((pattern, name))
-            for pattern in ruleset.filters.block_categories:
-                block_categories.append((pattern, name))
-            for pattern in ruleset.filters.block_titles:
-                block_titles.append((pattern, name))
-
-        if allow_categories:
-            if not self._matches_any(category, [p for p, _ in allow_categories]):
-                sources = ", ".join(sorted({name for _, name in allow_categories}))
-                return False, RejectReason.CATEGORY_ALLOW_MISS, sources
-        else:
-            matched_ruleset = self._find_matching_ruleset(category, block_categories)
-            if matched_ruleset:
-                return False, RejectReason.CATEGORY_BLOCK_MATCH, matched_ruleset
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._verdicts),
+        }
+
+    def _compile(self, ruleset_names: tuple[str, ...]) -> FilterProgram | None:
+        """
+        Compile the filters of the named rulesets into one program.
 
-        if allow_titles:
-            if not self._matches_any(title, [p for p, _ in allow_titles]):
-                sources = ", ".join(sorted({name for _, name in allow_titles}))
-                return False, RejectReason.TITLE_ALLOW_MISS, sources
-        else:
-            matched_ruleset = self._find_matching_ruleset(title, block_titles)
-            if matched_ruleset:
-                return False, RejectReason.TITLE_BLOCK_MATCH, matched_ruleset
+        Args:
+            ruleset_names: Ruleset names, in group order
 
-        return True, "", ""
+        Returns:
+            FilterProgram, or None if none of the rulesets exist
+        """
+        maybe_rulesets = [(name, self.config.get_ruleset(name)) for name in ruleset_names]
+        rulesets: list[tuple[str, Ruleset]] = [
+            (name, r) for name, r in maybe_rulesets if r is not None
+        ]
 
-    def _find_matching_ruleset(self, text: str, patterns: list[tuple[str, str]]) -> str | None:
-        """Find which ruleset's pattern matched the text."""
-        for pattern_str, ruleset_name in patterns:
-            try:
-                pattern = self.cache.get_pattern(pattern_str)
-                if pattern.search(text):
-                    return ruleset_name
-            except re.error:
+        if not rulesets:
+            return None
+
+        return FilterProgram(
+            allow_categories=self._compile_allow(
+                [(name, r.filters.compiled("allow_categories")) for name, r in rulesets]
+            ),
+            allow_titles=self._compile_allow(
+                [(name, r.filters.compiled("allow_titles")) for name, r in rulesets]
+            ),
+            block_categories=self._compile_block(
+                [(name, r.filters.compiled("block_categories")) for name, r in rulesets]
+            ),
+            block_titles=self._compile_block(
+                [(name, r.filters.compiled("block_titles")) for name, r in rulesets]
+            ),
+        )
+
+    def _compile_allow(self, lists: list[tuple[str, tuple[re.Pattern[str], ...]]]) -> AllowList:
+        """Merge allow lists into a single alternation."""
+        patterns = tuple(pattern for _, compiled in lists for pattern in compiled)
+        return AllowList(
+            sources=", ".join(sorted({name for name, compiled in lists if compiled})),
+            combined=self._combine(
+                "|".join(f"(?:{self._embed(pattern)})" for pattern in patterns), patterns
+            ),
+            patterns=patterns,
+        )
+
+    def _compile_block(self, lists: list[tuple[str, tuple[re.Pattern[str], ...]]]) -> BlockList:
+        """Merge block lists into one anchored lookahead per ruleset."""
+        names: list[str] = []
+        alternatives: list[str] = []
+
+        for name, compiled in lists:
+            if not compiled:
                 continue
-        return None
-
-    def _matches_any(self, text: str, patterns: list[str]) -> bool:
+            group = f"r{len(names)}"
+            names.append(name)
+            lookahead = "|".join(f"(?:{self._embed(pattern)})" for pattern in compiled)
+            alternatives.append(rf"(?=[\s\S]*?(?:{lookahead}))(?P<{group}>)")
+
+        patterns = tuple((pattern, name) for name, compiled in lists for pattern in compiled)
+        combined = self._combine(
+            r"\A(?:" + "|".join(alternatives) + ")", tuple(pattern for pattern, _ in patterns)
+        )
+        return BlockList(names=tuple(names), combined=combined, patterns=patterns)
+
+    def _embed(self, pattern: re.Pattern[str]) -> str:
         """
-        Check if text matches any of the regex patterns.
+        Rewrite a pattern's source for embedding in a combined regex.
 
         Args:
-            text: Text to match against
-            patterns: List of regex patterns
+            pattern: Compiled pattern from config
 
         Returns:
-            True if any pattern matches
-        """
-        for pattern_str in patterns:
-            try:
-                pattern = self.cache.get_pattern(pattern_str)
-                if pattern.search(text):
-                    return True
-            except re.error as e:
-                logger.warning("invalid regex pattern", pattern=pattern_str, error=str(e))
-                continue
+            Pattern source with leading global flags scoped to the pattern
+        """
+        flags = GLOBAL_FLAGS.match(pattern.pattern)
+        if flags:
+            return f"(?{flags.group(1)}:{pattern.pattern[flags.end() :]})"
+        return pattern.pattern
+
+    def _combine(
+        self, combined: str, patterns: tuple[re.Pattern[str], ...]
+    ) -> re.Pattern[str] | None:
+        """
+        Compile a combined regex, or None to fall back to per-pattern matching.
 
-        return False
+        Args:
+            combined: Combined regex source
+            patterns: Compiled patterns it was built from
+
+        Returns:
+            Compiled combined regex, or None if it cannot preserve pattern semantics
+        """
+        if not patterns or any(GROUP_REFERENCES.search(p.pattern) for p in patterns):
+            return None
+        try:
+            return re.compile(combined)
+        except re.error:
+            logger.debug("patterns not combinable, matching individually", count=len(patterns))
+            return None
@@ -0,0 +1,388 @@
+"""Native asyncio Twitch fetcher using the GQL API directly."""
+
+import asyncio
+import random
+import re
+from dataclasses import replace
+from typing import Any, TypeVar
+from urllib.parse import urlencode
+
+import httpx
+import structlog
+
+from quadlink.stream.cache import NegativeCache
+from quadlink.types import Metadata, Stream
+
+logger = structlog.get_logger()
+
+_T = TypeVar("_T")
+
+# twitch web client id (same public id used by streamlink)
+CLIENT_ID = "kimne78kx3ncx6brgo4mv6wki5h1ko"
+
+METADATA_FIELD = "user(login: ${var}) {{ login displayName stream {{ id title game {{ name }} }} }}"
+
+ACCESS_TOKEN_FIELD = (
+    "streamPlaybackAccessToken(channelName: ${var}, "
+    'params: {{platform: "web", playerBackend: "mediaplayer", playerType: "site"}}) '
+    "{{ value signature }}"
+)
+
+# twitch logins are 1-25 alphanumeric/underscore characters
+LOGIN_PATTERN = re.compile(r"^[a-z0-9_]{1,25}$")
+
+
+class TwitchGQLFetcher:
+    """Fetches Twitch stream metadata and playlists on the event loop.
+
+    Uses one shared httpx connection pool for all requests instead of a thread
+    per in-flight fetch, and looks up many channels per request by aliasing
+    fields in a single GQL query. Playlists are resolved straight from
+    Twitch's usher service, so proxy_playlist (applied by the Streamlink
+    plugin) is not used.
+    """
+
+    GQL_URL = "https://gql.twitch.tv/gql"
+    USHER_URL = "https://usher.ttvnw.net/api/channel/hls/{login}.m3u8"
+
+    def __init__(
+        self,
+        low_latency: bool = True,
+        max_connections: int = 100,
+        batch_size: int = 30,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        offline_cache: NegativeCache | None = None,
+    ):
+        """
+        Initialize GQL fetcher.
+
+        Args:
+            low_latency: Request low-latency playlists
+            max_connections: Maximum pooled connections to Twitch
+            batch_size: Maximum channels looked up per GQL request
+            timeout: HTTP request timeout in seconds
+            transport: Optional httpx transport (for testing)
+            offline_cache: Optional cache updated with each channel's liveness
+        """
+        self.low_latency = low_latency
+        self.max_connections = max_connections
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._transport = transport
+        self.offline_cache = offline_cache
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared pooled HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"Client-ID": CLIENT_ID},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def warm_up(self) -> None:
+        """Create the shared HTTP client ahead of the first fetch."""
+        self._get_client()
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch_stream_info(self, url: str) -> Stream | None:
+        """
+        Fetch stream metadata and master playlist URL.
+
+        Args:
+            url: Twitch stream URL (e.g., https://twitch.tv/streamer or just 'streamer')
+
+        Returns:
+            Stream object with metadata, or None if stream is offline/unavailable
+        """
+        return (await self.fetch_many([url]))[url]
+
+    async def probe_stream_info(self, url: str) -> Stream | None:
+        """
+        Fetch liveness and metadata only, without resolving the playlist.
+
+        Args:
+            url: Twitch stream URL (e.g., https://twitch.tv/streamer or just 'streamer')
+
+        Returns:
+            Stream object without master_url, or None if stream is offline/unavailable
+        """
+        return (await self.probe_many([url]))[url]
+
+    async def resolve_stream(self, stream: Stream) -> Stream | None:
+        """
+        Resolve the master playlist for a probed stream.
+
+        Args:
+            stream: Stream returned by probe_stream_info
+
+        Returns:
+            Copy of stream with master_url set, or None if it is no longer available
+        """
+        return (await self.resolve_many([stream]))[0]
+
+    async def fetch_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """
+        Fetch metadata and playlists for many channels in batched requests.
+
+        Args:
+            urls: Twitch stream URLs or usernames
+
+        Returns:
+            Mapping of each input URL to its Stream, or None if offline/unavailable
+        """
+        probed = await self.probe_many(urls)
+        live = [(url, stream) for url, stream in probed.items() if stream is not None]
+        resolved = await self.resolve_many([stream for _, stream in live])
+
+        for (url, _), stream in zip(live, resolved, strict=True):
+            probed[url] = stream
+        return probed
+
+    async def probe_many(self, urls: list[str]) -> dict[str, Stream | None]:
+        """
+        Fetch liveness and metadata for many channels in batched requests.
+
+        Args:
+            urls: Twitch stream URLs or usernames
+
+        Returns:
+            Mapping of each input URL to a Stream without master_url, or None
+        """
+        results: dict[str, Stream | None] = dict.fromkeys(urls)
+        lookups: list[tuple[str, str, str]] = []
+
+        for url in urls:
+            normalized = self._normalize_url(url)
+            login = self._extract_login(normalized)
+            if login is None:
+                logger.debug("no plugin for url", url=normalized)
+                continue
+            lookups.append((url, normalized, login))
+
+        batches = await asyncio.gather(
+            *(
+                self._query_batch(METADATA_FIELD, [login for _, _, login in chunk])
+                for chunk in self._chunks(lookups)
+            )
+        )
+
+        for chunk, data in zip(self._chunks(lookups), batches, strict=True):
+            for (url, normalized, _), user in zip(chunk, data, strict=True):
+                if isinstance(user, Exception):
+                    self._log_fetch_error(normalized, user)
+                    continue
+                results[url] = self._parse_user(normalized, user)
+                self._record_liveness(normalized, live=results[url] is not None)
+
+        return results
+
+    async def resolve_many(self, streams: list[Stream]) -> list[Stream | None]:
+        """
+        Resolve master playlists for many probed streams in batched requests.
+
+        Args:
+            streams: Streams returned by probe_many
+
+        Returns:
+            Streams with master_url set (None where unavailable), in input order
+        """
+        results: list[Stream | None] = [None] * len(streams)
+        lookups: list[tuple[int, str]] = []
+
+        for index, stream in enumerate(streams):
+            login = self._extract_login(stream.url)
+            if login is not None:
+                lookups.append((index, login))
+
+        batches = await asyncio.gather(
+            *(
+                self._query_batch(ACCESS_TOKEN_FIELD, [login for _, login in chunk])
+                for chunk in self._chunks(lookups)
+            )
+        )
+
+        for chunk, data in zip(self._chunks(lookups), batches, strict=True):
+            for (index, login), token in zip(chunk, data, strict=True):
+                stream = streams[index]
+                if isinstance(token, Exception):
+                    self._log_fetch_error(stream.url, token)
+                elif not token or not token.get("value") or not token.get("signature"):
+                    logger.debug("stream unavailable", url=stream.url)
+                    self._record_liveness(stream.url, live=False)
+                else:
+                    results[index] = replace(stream, master_url=self._usher_url(login, token))
+                    self._record_liveness(stream.url, live=True)
+
+        return results
+
+    def _chunks(self, items: list[_T]) -> list[list[_T]]:
+        """Split items into batch_size chunks."""
+        return [items[i : i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    async def _query_batch(
+        self, field: str, logins: list[str]
+    ) -> list[dict[str, Any] | None | Exception]:
+        """
+        Look up one GQL field for many logins using aliases in a single query.
+
+        Args:
+            field: Field template with a {var} placeholder for the login variable
+            logins: Channel logins
+
+        Returns:
+            Field value per login (None if null), or the exception if the request failed
+        """
+        variables = {f"l{i}": login for i, login in enumerate(logins)}
+        params = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+        fields = " ".join(f"c{i}: {field.format(var=f'l{i}')}" for i in range(len(logins)))
+
+        try:
+            data = await self._query(f"query({params}) {{ {fields} }}", variables)
+        except Exception as e:
+            return [e] * len(logins)
+
+        return [data.get(f"c{i}") for i in range(len(logins))]
+
+    async def _query(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """
+        Run a GQL query and return its data object.
+
+        Args:
+            query: GQL query document
+            variables: Query variables
+
+        Returns:
+            The response's data object
+
+        Raises:
+            httpx.HTTPError: On transport errors or non-2xx responses
+            ValueError: If the response carries no data
+        """
+        response = await self._get_client().post(
+            self.GQL_URL, json={"query": query, "variables": variables}
+        )
+        response.raise_for_status()
+
+        body = response.json()
+        data = body.get("data") if isinstance(body, dict) else None
+        if not isinstance(data, dict):
+            errors = body.get("errors") if isinstance(body, dict) else body
+            raise ValueError(f"gql response missing data: {errors}")
+        return data
+
+    def _parse_user(self, url: str, user: dict[str, Any] | None) -> Stream | None:
+        """
+        Build a Stream from a GQL user object.
+
+        Args:
+            url: Normalized stream URL
+            user: GQL user object (None if the channel does not exist)
+
+        Returns:
+            Stream without master_url, or None if offline or not found
+        """
+        if not user:
+            logger.debug("stream unavailable", url=url, reason="channel not found")
+            return None
+
+        live = user.get("stream")
+        if not live or not live.get("id"):
+            logger.debug("stream unavailable", url=url, reason="offline")
+            return None
+
+        game = live.get("game") or {}
+        metadata = Metadata(
+            author=user.get("displayName") or user.get("login") or "",
+            category=game.get("name") or "",
+            title=live.get("title") or "",
+        )
+        return Stream(url=url, metadata=metadata)
+
+    def _usher_url(self, login: str, token: dict[str, str]) -> str:
+        """
+        Build the usher master playlist URL for a channel.
+
+        Args:
+            login: Channel login
+            token: Playback access token with value and signature
+
+        Returns:
+            Master m3u8 playlist URL
+        """
+        params = {
+            "platform": "web",
+            "p": random.randint(0, 999999),
+            "allow_source": "true",
+            "allow_audio_only": "true",
+            "playlist_include_framerate": "true",
+            "supported_codecs": "h264",
+            "sig": token["signature"],
+            "token": token["value"],
+        }
+        if self.low_latency:
+            params["fast_bread"] = "true"
+        return f"{self.USHER_URL.format(login=login)}?{urlencode(params)}"
+
+    def _normalize_url(self, url: str) -> str:
+        """Expand bare usernames to full Twitch URLs."""
+        if not url.startswith("http"):
+            url = f"https://twitch.tv/{url}"
+        return url
+
+    def _extract_login(self, url: str) -> str | None:
+        """
+        Extract the channel login from a Twitch URL.
+
+        Args:
+            url: Normalized Twitch stream URL
+
+        Returns:
+            Lowercase login, or None if the URL is not a Twitch channel
+        """
+        if "twitch.tv/" not in url:
+            return None
+        login = url.rstrip("/").split("/")[-1].lower()
+        return login if LOGIN_PATTERN.match(login) else None
+
+    def _record_liveness(self, url: str, live: bool) -> None:
+        """
+        Update the offline cache with a channel's observed state.
+
+        Args:
+            url: Normalized Twitch stream URL
+            live: Whether the channel was seen live
+        """
+        if self.offline_cache is None:
+            return
+        if live:
+            self.offline_cache.mark_live(url)
+        else:
+            self.offline_cache.mark_offline(url)
+
+    def _log_fetch_error(self, url: str, error: Exception) -> None:
+        """
+        Log a fetch error at a level matching its cause.
+
+        Args:
+            url: Stream URL
+            error: Exception raised while fetching
+        """
+        if isinstance(error, httpx.TimeoutException):
+            logger.warning("twitch gql timeout", url=url)
+        elif isinstance(error, httpx.HTTPError):
+            logger.warning("twitch gql error", url=url, error=str(error))
+        else:
+            logger.error("unexpected error fetching stream", url=url, error=str(error))
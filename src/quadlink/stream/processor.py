@@ -2,194 +2,719 @@
 
 import asyncio
 import random
+import time
+from dataclasses import replace
+from typing import Any
 
 import structlog
 
+from quadlink.config.loader import ConfigDiff
 from quadlink.config.models import Config, StreamGroup
-from quadlink.stream.fetcher import StreamlinkFetcher
+from quadlink.metrics import Metrics
+from quadlink.quad import QuadBuilder
+from quadlink.stream.cache import NegativeCache
+from quadlink.stream.fetcher import StreamFetcher, StreamlinkFetcher
 from quadlink.stream.filters import StreamFilter
+from quadlink.stream.gql import TwitchGQLFetcher
+from quadlink.stream.refresh import RefreshTracker
 from quadlink.types import PrioritizedStream, Stream
 
 logger = structlog.get_logger()
 
 
 class StreamProcessor:
-    """Processes stream groups with filtering, deduplication, and prioritization."""
+    """Processes stream groups with filtering, deduplication, and prioritization.
+
+    Attributes:
+        filter_time: Seconds spent filtering accepted probe results in the last cycle.
+    """
 
     def __init__(
         self,
         config: Config,
-        max_concurrent: int = 4,
+        max_concurrent: int | None = None,
+        metrics: Metrics | None = None,
     ):
         """
         Initialize stream processor.
 
         Args:
             config: Application configuration
-            max_concurrent: Maximum concurrent stream fetches
+            max_concurrent: Maximum concurrent stream fetches (default: config.max_concurrent)
+            metrics: Optional metrics registry for probe latencies
         """
         self.config = config
-        self.fetcher = StreamlinkFetcher(
-            proxy_playlist=config.proxy_playlist,
-            low_latency=config.low_latency,
-            max_workers=max_concurrent,  # match thread pool size to concurrency limit
-        )
+        self.metrics = metrics
+        self.filter_time = 0.0
+        max_concurrent = max_concurrent or config.max_concurrent
+        self.max_concurrent = max_concurrent
+        self.offline_cache = self._create_offline_cache()
+        self.refresh = self._create_refresh_tracker()
+        self.fetcher = self._create_fetcher(max_concurrent)
         self.filter = StreamFilter(config)
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self._seen_urls: set[str] = set()  # deduplicate by normalized URL
+        self._tiers: dict[int, float] = {}  # priority -> fraction of refresh max_age
+        self._quad_authors: set[str] = set()
+
+    def _create_offline_cache(self) -> NegativeCache | None:
+        """Create the offline channel cache, if enabled in config."""
+        settings = self.config.offline_cache
+        if not settings.enabled:
+            return None
+        return NegativeCache(
+            ttl=settings.ttl,
+            jitter=settings.jitter,
+            max_ttl=settings.max_ttl,
+            backoff_after=settings.backoff_after,
+        )
+
+    def _create_refresh_tracker(self) -> RefreshTracker | None:
+        """Create the per-channel refresh tracker, if enabled in config."""
+        settings = self.config.refresh_tiers
+        if not settings.enabled:
+            return None
+        return RefreshTracker(
+            max_age=settings.max_age,
+            settle=settings.settle,
+            slow_fetch=settings.slow_fetch,
+        )
+
+    def _create_fetcher(self, max_concurrent: int) -> StreamFetcher:
+        """
+        Create the stream fetcher for the configured backend.
+
+        Args:
+            max_concurrent: Maximum concurrent stream fetches
+
+        Returns:
+            Fetcher backend instance
+        """
+        if self.config.fetcher_backend == "gql":
+            return TwitchGQLFetcher(
+                low_latency=self.config.low_latency,
+                max_connections=max_concurrent,
+                batch_size=self.config.gql_batch_size,
+                offline_cache=self.offline_cache,
+            )
+
+        return StreamlinkFetcher(
+            proxy_playlist=self.config.proxy_playlist,
+            low_latency=self.config.low_latency,
+            max_workers=max_concurrent,  # match thread pool size to concurrency limit
+            offline_cache=self.offline_cache,
+        )
+
+    async def apply_config(self, config: Config, diff: ConfigDiff | None = None) -> None:
+        """
+        Swap in a reloaded config without discarding warm state.
+
+        Fetcher sessions, plugin resolutions, and cached offline channels are
+        kept. The fetcher is only recreated if the backend changed, and the
+        worker pool is only resized if max_concurrent changed.
 
-    async def process_stream_groups(self) -> list[PrioritizedStream]:
+        Args:
+            config: New application configuration
+            diff: Changed fields (computed from the current config if omitted)
+        """
+        diff = diff if diff is not None else ConfigDiff.between(self.config, config)
+        self.config = config
+        self.filter.apply_config(config)
+
+        if diff.affects("offline_cache"):
+            self._apply_offline_cache()
+        if diff.affects("refresh_tiers"):
+            self._apply_refresh_tiers()
+
+        if diff.affects("fetcher_backend"):
+            await self.fetcher.close()
+            self.max_concurrent = config.max_concurrent
+            self.semaphore = asyncio.Semaphore(self.max_concurrent)
+            self.fetcher = self._create_fetcher(self.max_concurrent)
+            logger.info("fetcher backend changed", backend=config.fetcher_backend)
+            return
+
+        if config.max_concurrent != self.max_concurrent:
+            self.max_concurrent = config.max_concurrent
+            self.semaphore = asyncio.Semaphore(self.max_concurrent)
+            logger.info("concurrency changed", max_concurrent=self.max_concurrent)
+
+        if isinstance(self.fetcher, StreamlinkFetcher):
+            self.fetcher.proxy_playlist = config.proxy_playlist
+            self.fetcher.low_latency = config.low_latency
+            self.fetcher.resize(self.max_concurrent)
+            self.fetcher.offline_cache = self.offline_cache
+        elif isinstance(self.fetcher, TwitchGQLFetcher):
+            self.fetcher.low_latency = config.low_latency
+            self.fetcher.batch_size = config.gql_batch_size
+            self.fetcher.offline_cache = self.offline_cache
+            if self.fetcher.max_connections != self.max_concurrent:
+                self.fetcher.max_connections = self.max_concurrent
+                await self.fetcher.close()  # pool is recreated on next use
+
+    def _apply_offline_cache(self) -> None:
+        """Update offline cache settings, keeping cached channels if still enabled."""
+        settings = self.config.offline_cache
+        if not settings.enabled:
+            self.offline_cache = None
+        elif self.offline_cache is None:
+            self.offline_cache = self._create_offline_cache()
+        else:
+            self.offline_cache.ttl = settings.ttl
+            self.offline_cache.jitter = settings.jitter
+            self.offline_cache.max_ttl = settings.max_ttl
+            self.offline_cache.backoff_after = settings.backoff_after
+
+    def _apply_refresh_tiers(self) -> None:
+        """Update refresh tier settings, keeping channel state if still enabled."""
+        settings = self.config.refresh_tiers
+        if not settings.enabled:
+            self.refresh = None
+        elif self.refresh is None:
+            self.refresh = self._create_refresh_tracker()
+        else:
+            self.refresh.max_age = settings.max_age
+            self.refresh.settle = settings.settle
+            self.refresh.slow_fetch = settings.slow_fetch
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get fetch cache state worth keeping across restarts.
+
+        Returns:
+            JSON-serializable dict of offline cache and refresh tracker entries
+        """
+        return {
+            "offline_cache": self.offline_cache.snapshot() if self.offline_cache else {},
+            "refresh": self.refresh.snapshot() if self.refresh else {},
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """
+        Load fetch cache state from a snapshot into the enabled caches.
+
+        Args:
+            state: Dict returned by snapshot()
+        """
+        if self.offline_cache:
+            self.offline_cache.restore(state.get("offline_cache", {}))
+        if self.refresh:
+            self.refresh.restore(state.get("refresh", {}))
+
+    async def warm_up(self) -> None:
+        """Prepare fetcher sessions or connections before the first cycle."""
+        await self.fetcher.warm_up()
+
+    async def close(self) -> None:
+        """Release fetcher resources (thread pool or connection pool)."""
+        await self.fetcher.close()
+
+    async def process_stream_groups(
+        self, builder: QuadBuilder | None = None
+    ) -> list[PrioritizedStream]:
         """
         Process all stream groups from config, sorted by priority.
 
+        Every URL across all priority levels is probed for metadata concurrently
+        through one bounded pool; results are then accepted highest-priority-first
+        so deduplication does not depend on fetch completion order. Playlists are
+        only resolved for streams that pass filters, hosted handling, and dedupe.
+
+        With two_phase_fetch enabled, playlists are resolved only for the streams
+        the builder selects instead of every accepted stream. With refresh_tiers
+        enabled, live channels that are not due for a probe reuse their last
+        result, including its resolved playlist.
+
+        Args:
+            builder: Quad builder used for early exit, two-phase playlist resolution,
+                and keeping channels in the quad on every-cycle refresh
+
         Returns:
             List of PrioritizedStream objects, sorted by priority (descending)
         """
-        all_streams = []
         self._seen_urls.clear()
+        self.filter_time = 0.0
 
         sorted_priorities = sorted(self.config.priorities.keys(), reverse=True)
+        jobs = [
+            (priority, group)
+            for priority in sorted_priorities
+            for group in self.config.priorities[priority]
+        ]
+
+        if self.refresh:
+            # top level gets 1/n of max_age, the lowest the full max_age
+            self._tiers = {
+                priority: (rank + 1) / len(sorted_priorities)
+                for rank, priority in enumerate(sorted_priorities)
+            }
+            self._quad_authors = set(builder.previous_positions) if builder else set()
+            self.refresh.retain([url for _, group in jobs for url in group.urls])
+
+        decider = builder if self.config.early_exit else None
+        all_streams = await self._process_jobs(jobs, decider)
+        all_streams.sort(key=lambda s: (s.priority, s.tiebreaker), reverse=True)
 
-        for priority in sorted_priorities:
-            stream_groups = self.config.priorities[priority]
-
-            logger.debug(
-                "processing priority level",
-                priority=priority,
-                groups=len(stream_groups),
-            )
-
-            streams = await self._process_priority_level(priority, stream_groups)
-            all_streams.extend(streams)
+        if self.config.two_phase_fetch and builder:
+            all_streams = await self.resolve_selected(all_streams, builder)
 
-        all_streams.sort(key=lambda s: (s.priority, s.tiebreaker), reverse=True)
+        if self.refresh:
+            for candidate in all_streams:
+                if candidate.stream.master_url:
+                    self.refresh.record_resolved(candidate.stream)
 
         logger.debug(
             "stream processing complete",
             total_candidates=len(all_streams),
             priorities=len(sorted_priorities),
+            offline_cache=self.offline_cache.stats() if self.offline_cache else None,
+            refresh=self.refresh.stats() if self.refresh else None,
+            filter_cache=self.filter.stats(),
         )
 
         return all_streams
 
-    async def _process_priority_level(
-        self, priority: int, stream_groups: list[StreamGroup]
+    async def _process_jobs(
+        self,
+        jobs: list[tuple[int, StreamGroup]],
+        decider: QuadBuilder | None = None,
     ) -> list[PrioritizedStream]:
         """
-        Process all stream groups at a given priority level.
+        Probe every URL in jobs concurrently, then accept results in job order.
+
+        Each priority level is probed by its own task (batched where the
+        backend supports it). A URL listed under several groups or priority
+        levels is probed once; each listing is then evaluated against its own
+        rulesets in job order, so the highest-priority listing that passes its
+        filters wins. Unless two_phase_fetch defers it, playlists for each
+        level's accepted streams are resolved while lower levels are evaluated,
+        and streams whose playlist cannot be resolved are dropped.
+
+        With a decider, results are accepted one priority level at a time and
+        fetches for lower levels are cancelled once the decider reports that
+        none of them can change the quad. The decision only counts streams
+        whose playlist resolved (or, with two_phase_fetch, the resolved
+        selection), so a winner that drops out during resolution cannot leave
+        the quad short after lower levels were cancelled.
 
         Args:
-            priority: Priority level
-            stream_groups: List of StreamGroup objects
+            jobs: (priority, StreamGroup) pairs, highest priority first
+            decider: Optional quad builder for early termination
 
         Returns:
-            List of PrioritizedStream objects from this priority level
+            List of accepted PrioritizedStream objects, in job order
         """
-        tasks = []
+        level_urls: dict[int, dict[str, str]] = {}
+        levels: dict[int, list[tuple[str, str, list[str]]]] = {}
+        owners: dict[str, int] = {}  # normalized URL -> level that fetches it
 
-        for group in stream_groups:
+        for priority, group in jobs:
             for url in group.urls:
-                task = self._process_single_stream(url, priority, group.rulesets)
-                tasks.append(task)
+                key = self._normalize_url(url)
+                if key not in owners:
+                    owners[key] = priority
+                    level_urls.setdefault(priority, {})[key] = url
+                levels.setdefault(priority, []).append((key, url, group.rulesets))
+
+        # tasks start in creation order, so higher levels claim fetch slots first
+        fetches = {
+            priority: asyncio.create_task(self._fetch_level(urls, priority))
+            for priority, urls in level_urls.items()
+        }
+
+        accepted: list[PrioritizedStream] = []
+        unresolved: list[PrioritizedStream] = []  # accepted, resolution in flight
+        resolutions: list[asyncio.Task[list[PrioritizedStream]]] = []
+        try:
+            for priority, entries in levels.items():
+                # resolution failures can only undo a decision, so settle them
+                # only when the optimistic check passes
+                if decider and decider.is_decided(accepted + unresolved, priority):
+                    if resolutions:
+                        for level in await asyncio.gather(*resolutions):
+                            accepted.extend(level)
+                        resolutions.clear()
+                        unresolved.clear()
+                    elif self.config.two_phase_fetch:
+                        accepted = await self.resolve_selected(accepted, decider)
+
+                if decider and decider.is_decided(accepted + unresolved, priority):
+                    pending = sum(
+                        len(level_urls[p]) for p, task in fetches.items() if not task.done()
+                    )
+                    logger.debug(
+                        "quad decided, skipping lower priorities",
+                        below=priority,
+                        cancelled_fetches=pending,
+                    )
+                    for task in fetches.values():
+                        task.cancel()
+                    break
+
+                level_accepted = []
+                for key, url, rulesets in entries:
+                    stream = (await fetches[owners[key]])[key]
+                    if stream is None:
+                        continue
+                    started = time.perf_counter()
+                    prioritized = self._accept_stream(stream, url, priority, rulesets)
+                    self.filter_time += time.perf_counter() - started
+                    if prioritized:
+                        level_accepted.append(prioritized)
+
+                if self.config.two_phase_fetch:
+                    accepted.extend(level_accepted)
+                elif level_accepted:
+                    unresolved.extend(level_accepted)
+                    resolutions.append(asyncio.create_task(self._resolve_accepted(level_accepted)))
+
+            for level in await asyncio.gather(*resolutions):
+                accepted.extend(level)
+        finally:
+            tasks: list[asyncio.Task[Any]] = [*fetches.values(), *resolutions]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return accepted
+
+    async def _resolve_accepted(self, accepted: list[PrioritizedStream]) -> list[PrioritizedStream]:
+        """
+        Resolve playlists for accepted streams, dropping those that went offline.
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        streams = [r for r in results if isinstance(r, PrioritizedStream)]
+        Args:
+            accepted: Accepted streams, some possibly without master_url
 
-        logger.debug(
-            "priority level complete",
-            priority=priority,
-            successful=len(streams),
-            total=len(tasks),
+        Returns:
+            Accepted streams with master_url set, in input order
+        """
+        pending = [c for c in accepted if c.stream.master_url is None]
+        resolved = dict(
+            zip(
+                (id(c) for c in pending),
+                await self._resolve_streams([c.stream for c in pending]),
+                strict=True,
+            )
         )
 
-        return streams
-
-    async def _process_single_stream(
-        self,
-        url: str,
-        priority: int,
-        rulesets: list[str],
-    ) -> PrioritizedStream | None:
+        results = []
+        for candidate in accepted:
+            if id(candidate) not in resolved:
+                results.append(candidate)
+            elif (stream := resolved[id(candidate)]) is not None:
+                results.append(replace(candidate, stream=stream))
+            else:
+                logger.debug("accepted stream unavailable", author=candidate.stream.metadata.author)
+        return results
+
+    async def _resolve_streams(self, streams: list[Stream]) -> list[Stream | None]:
         """
-        Process a single stream URL.
+        Resolve playlists for probed streams.
+
+        The gql backend resolves them in batches through resolve_many; other
+        backends get one task per stream, bounded by the shared semaphore.
 
         Args:
-            url: Stream URL or username
-            priority: Priority level
-            rulesets: Rulesets to apply
+            streams: Probed streams
 
         Returns:
-            PrioritizedStream if successful and passes filters, None otherwise
+            Streams with master_url (None where unavailable), in input order
         """
-        async with self.semaphore:
+        if self.config.fetcher_backend == "gql":
             try:
-                stream = await self.fetcher.fetch_stream_info(url)
+                return await self.fetcher.resolve_many(streams)
+            except Exception as e:
+                logger.error("error resolving stream batch", streams=len(streams), error=str(e))
+                return [None] * len(streams)
 
-                if not stream:
-                    return None
+        return list(await asyncio.gather(*(self._resolve_stream(s) for s in streams)))
 
-                passed, reason, ruleset = self.filter.apply_filters(stream, rulesets)
-                if not passed:
-                    logger.debug(
-                        "stream rejected",
-                        author=stream.metadata.author,
-                        reason=reason,
-                        ruleset=ruleset,
-                    )
-                    return None
+    async def resolve_selected(
+        self, candidates: list[PrioritizedStream], builder: QuadBuilder
+    ) -> list[PrioritizedStream]:
+        """
+        Resolve playlists for the streams the builder would select.
 
-                if self.config.skip_hosted and self._is_hosted(stream):
-                    logger.debug(
-                        "skipping hosted stream",
-                        author=stream.metadata.author,
-                        url=url,
-                    )
-                    return None
+        Streams that went offline between probe and resolution are dropped and
+        the selection is repeated until every selected stream has been resolved.
 
-                effective_priority = priority
-                if not self.config.skip_hosted and self._is_hosted(stream):
-                    effective_priority -= self.config.hosted_offset
-                    logger.debug(
-                        "hosted stream priority reduced",
-                        author=stream.metadata.author,
-                        original_priority=priority,
-                        new_priority=effective_priority,
-                    )
+        Args:
+            candidates: Probed candidates, sorted by priority
+            builder: Quad builder used to pick the winners
 
-                normalized_url = self._normalize_url(stream.url)
-                if normalized_url in self._seen_urls:
+        Returns:
+            Candidates with master_url set on every stream the builder selects
+        """
+        candidates = list(candidates)
+        attempted: set[int] = set()
+
+        while True:
+            selected_ids = {id(s.stream) for s in builder.select(candidates)}
+            unresolved = [
+                (index, c)
+                for index, c in enumerate(candidates)
+                if id(c.stream) in selected_ids
+                and c.stream.master_url is None
+                and id(c.stream) not in attempted
+            ]
+            if not unresolved:
+                return candidates
+
+            attempted.update(id(c.stream) for _, c in unresolved)
+            results = await self._resolve_streams([c.stream for _, c in unresolved])
+
+            dropped = set()
+            for (index, candidate), stream in zip(unresolved, results, strict=True):
+                if stream is None:
+                    dropped.add(index)
                     logger.debug(
-                        "duplicate stream (already seen)",
-                        author=stream.metadata.author,
-                        url=normalized_url,
+                        "selected stream unavailable", author=candidate.stream.metadata.author
                     )
-                    return None
+                    continue
+                attempted.add(id(stream))
+                candidates[index] = replace(candidate, stream=stream)
 
-                self._seen_urls.add(normalized_url)
+            candidates = [c for index, c in enumerate(candidates) if index not in dropped]
 
-                prioritized = PrioritizedStream(
-                    stream=stream,
-                    priority=effective_priority,
-                    tiebreaker=random.random(),
-                )
+    async def _fetch_level(self, urls: dict[str, str], priority: int) -> dict[str, Stream | None]:
+        """
+        Fetch all URLs of one priority level.
 
-                logger.debug(
-                    "stream accepted",
-                    author=stream.metadata.author,
-                    category=stream.metadata.category,
-                    priority=effective_priority,
+        Only liveness and metadata are fetched; playlists are resolved later
+        for accepted streams. The gql backend looks channels up in batches
+        through probe_many; other backends get one task per URL, bounded by
+        the shared semaphore. Channels cached as offline are not fetched, and
+        live channels not yet due for a refresh reuse their last result.
+
+        Args:
+            urls: Mapping of normalized URL to configured URL
+            priority: Priority level (for the offline cache and refresh bypass)
+
+        Returns:
+            Mapping of normalized URL to Stream, or None if unavailable
+        """
+        results: dict[str, Stream | None] = dict.fromkeys(urls)
+        urls = {key: url for key, url in urls.items() if not self._is_cached_offline(url, priority)}
+        if self.refresh is not None:
+            reused = self._reuse_results(urls, priority)
+            results.update(reused)
+            urls = {key: url for key, url in urls.items() if key not in reused}
+
+        if self.config.fetcher_backend == "gql":
+            configured = list(urls.values())
+            started = time.monotonic()
+            try:
+                streams = await self.fetcher.probe_many(configured)
+            except Exception as e:
+                logger.error("error processing stream batch", urls=len(urls), error=str(e))
+                self._observe_fetches(
+                    time.monotonic() - started, dict.fromkeys(configured), error=True
                 )
+                return results
+            elapsed = time.monotonic() - started
+            self._observe_fetches(elapsed, streams)
+            if self.refresh is not None and configured:
+                cost = elapsed / len(configured)
+                for url in configured:
+                    self.refresh.record(url, streams.get(url), cost)
+            results.update((key, streams.get(url)) for key, url in urls.items())
+            return results
+
+        fetched = await asyncio.gather(*(self._fetch_stream(url) for url in urls.values()))
+        results.update(zip(urls.keys(), fetched, strict=True))
+        return results
+
+    def _observe_fetches(
+        self, elapsed: float, streams: dict[str, Stream | None], error: bool = False
+    ) -> None:
+        """
+        Record one batched probe's latency for each channel it looked up.
+
+        Args:
+            elapsed: Seconds the batch took
+            streams: Mapping of each looked-up URL to its Stream, or None if offline
+            error: Whether the batch failed
+        """
+        if self.metrics is None:
+            return
+        for stream in streams.values():
+            outcome = "error" if error else "live" if stream else "offline"
+            self.metrics.fetch_seconds.observe(elapsed, outcome=outcome)
+
+    def _reuse_results(self, urls: dict[str, str], priority: int) -> dict[str, Stream]:
+        """
+        Get the last results of live channels that are not due for a probe.
+
+        Args:
+            urls: Mapping of normalized URL to configured URL
+            priority: Priority level of the group listing the URLs
 
-                return prioritized
+        Returns:
+            Mapping of normalized URL to reused Stream
+        """
+        assert self.refresh is not None
+        bypass = self.config.refresh_tiers.bypass_priority
+        if bypass is not None and priority >= bypass:
+            return {}
+        tier = self._tiers.get(priority, 1.0)
+        reused = {}
+        for key, url in urls.items():
+            stream = self.refresh.reusable(url, tier, self._quad_authors)
+            if stream is not None:
+                reused[key] = stream
+        return reused
+
+    def _is_cached_offline(self, url: str, priority: int) -> bool:
+        """
+        Check whether a fetch can be skipped because the channel was recently offline.
 
+        Args:
+            url: Stream URL or username
+            priority: Priority level of the group listing the URL
+
+        Returns:
+            True if the offline cache applies at this priority and has the channel
+        """
+        if self.offline_cache is None:
+            return False
+        bypass = self.config.offline_cache.bypass_priority
+        if bypass is not None and priority >= bypass:
+            return False
+        return self.offline_cache.is_offline(url)
+
+    async def _fetch_stream(self, url: str) -> Stream | None:
+        """
+        Probe a single stream, bounded by the shared concurrency limit.
+
+        Args:
+            url: Stream URL or username
+
+        Returns:
+            Stream without master_url if live and available, None otherwise
+        """
+        async with self.semaphore:
+            started = time.monotonic()
+            try:
+                stream = await self.fetcher.probe_stream_info(url)
             except Exception as e:
                 logger.error(
                     "error processing stream",
                     url=url,
                     error=str(e),
                 )
+                if self.metrics is not None:
+                    self.metrics.fetch_seconds.observe(time.monotonic() - started, outcome="error")
+                return None
+            elapsed = time.monotonic() - started
+            if self.metrics is not None:
+                self.metrics.fetch_seconds.observe(elapsed, outcome="live" if stream else "offline")
+            if self.refresh is not None:
+                self.refresh.record(url, stream, elapsed)
+            return stream
+
+    async def _resolve_stream(self, stream: Stream) -> Stream | None:
+        """
+        Resolve a probed stream's playlist, bounded by the shared concurrency limit.
+
+        Args:
+            stream: Probed stream
+
+        Returns:
+            Stream with master_url, or None if it is no longer available
+        """
+        async with self.semaphore:
+            try:
+                return await self.fetcher.resolve_stream(stream)
+            except Exception as e:
+                logger.error(
+                    "error resolving stream",
+                    url=stream.url,
+                    error=str(e),
+                )
+                return None
+
+    def _accept_stream(
+        self,
+        stream: Stream,
+        url: str,
+        priority: int,
+        rulesets: list[str],
+    ) -> PrioritizedStream | None:
+        """
+        Apply filters, hosted handling, and deduplication to a fetched stream.
+
+        Args:
+            stream: Fetched stream
+            url: Stream URL or username as configured
+            priority: Priority level
+            rulesets: Rulesets to apply
+
+        Returns:
+            PrioritizedStream if the stream passes, None otherwise
+        """
+        try:
+            passed, reason, ruleset = self.filter.apply_filters(stream, rulesets)
+            if not passed:
+                logger.debug(
+                    "stream rejected",
+                    author=stream.metadata.author,
+                    reason=reason,
+                    ruleset=ruleset,
+                )
                 return None
 
+            if self.config.skip_hosted and self._is_hosted(stream):
+                logger.debug(
+                    "skipping hosted stream",
+                    author=stream.metadata.author,
+                    url=url,
+                )
+                return None
+
+            effective_priority = priority
+            if not self.config.skip_hosted and self._is_hosted(stream):
+                effective_priority -= self.config.hosted_offset
+                logger.debug(
+                    "hosted stream priority reduced",
+                    author=stream.metadata.author,
+                    original_priority=priority,
+                    new_priority=effective_priority,
+                )
+
+            normalized_url = self._normalize_url(stream.url)
+            if normalized_url in self._seen_urls:
+                logger.debug(
+                    "duplicate stream (already seen)",
+                    author=stream.metadata.author,
+                    url=normalized_url,
+                )
+                return None
+
+            self._seen_urls.add(normalized_url)
+
+            prioritized = PrioritizedStream(
+                stream=stream,
+                priority=effective_priority,
+                tiebreaker=random.random(),
+            )
+
+            logger.debug(
+                "stream accepted",
+                author=stream.metadata.author,
+                category=stream.metadata.category,
+                priority=effective_priority,
+            )
+
+            return prioritized
+
+        except Exception as e:
+            logger.error(
+                "error processing stream",
+                url=url,
+                error=str(e),
+            )
+            return None
+
     def _is_hosted(self, stream: Stream) -> bool:
         """
         Check if stream is hosted (channel hosting another channel).
@@ -0,0 +1,205 @@
+"""Per-channel refresh scheduling for live channels."""
+
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from quadlink.types import Metadata, Stream
+
+
+@dataclass
+class _ChannelState:
+    """Last probe result and refresh bookkeeping for one channel.
+
+    Attributes:
+        stream: Last known stream (with master_url once resolved), None if offline.
+        probed_at: Monotonic time of the last probe.
+        changed_at: Monotonic time the channel last went live or changed category.
+        cost: Smoothed probe duration in seconds.
+    """
+
+    stream: Stream | None
+    probed_at: float
+    changed_at: float
+    cost: float
+
+
+class RefreshTracker:
+    """Decides which live channels need a fresh probe this cycle.
+
+    A live channel's last result is reused until it is older than its tier's
+    age: ``max_age`` scaled by the channel's priority rank, so the top level
+    is refreshed most often and the lowest level every ``max_age`` seconds.
+    Channels whose probes are slower than ``slow_fetch`` keep results twice
+    as long. Channels in the current quad, and channels that went live or
+    changed category within ``settle`` seconds, are always probed. Offline
+    channels are always probed too; the offline cache handles those.
+
+    Attributes:
+        hits: Lookups answered with a reused result (probe skipped).
+        misses: Lookups that required a probe.
+    """
+
+    COST_SMOOTHING = 0.3  # weight of the newest probe duration
+
+    def __init__(self, max_age: float = 120, settle: float = 300, slow_fetch: float = 1.0):
+        """
+        Initialize refresh tracker.
+
+        Args:
+            max_age: Seconds a live result is reused at the lowest priority level
+            settle: Seconds after going live or changing category that a channel is always probed
+            slow_fetch: Probe duration in seconds above which results are reused twice as long
+        """
+        self.max_age = max_age
+        self.settle = settle
+        self.slow_fetch = slow_fetch
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, _ChannelState] = {}
+
+    def reusable(self, url: str, tier: float, quad_authors: set[str]) -> Stream | None:
+        """
+        Get a channel's last result if it does not need a probe, counting a hit or miss.
+
+        Args:
+            url: Stream URL or username
+            tier: Fraction of max_age this channel's priority level gets (0 to 1]
+            quad_authors: Authors (lowercase) in the current quad
+
+        Returns:
+            The last known live stream, or None if the channel should be probed
+        """
+        entry = self._entries.get(self._key(url))
+        now = time.monotonic()
+        if (
+            entry is None
+            or entry.stream is None
+            or entry.stream.metadata.author.lower() in quad_authors
+            or now - entry.changed_at < self.settle
+            or now - entry.probed_at >= self._age(entry, tier)
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.stream
+
+    def record(self, url: str, stream: Stream | None, cost: float) -> None:
+        """
+        Record a probe result.
+
+        Args:
+            url: Stream URL or username
+            stream: Probed stream, or None if offline or unavailable
+            cost: Seconds the probe took
+        """
+        key = self._key(url)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = _ChannelState(
+                stream=stream, probed_at=now, changed_at=now, cost=cost
+            )
+            return
+
+        previous = entry.stream
+        if (previous is None) != (stream is None) or (
+            previous is not None
+            and stream is not None
+            and previous.metadata.category != stream.metadata.category
+        ):
+            entry.changed_at = now
+        entry.stream = stream
+        entry.probed_at = now
+        entry.cost += self.COST_SMOOTHING * (cost - entry.cost)
+
+    def record_resolved(self, stream: Stream) -> None:
+        """
+        Keep a resolved playlist with the channel's last result, so reuse skips resolution.
+
+        Args:
+            stream: Stream with master_url set
+        """
+        entry = self._entries.get(self._key(stream.url))
+        if entry is not None and entry.stream is not None:
+            entry.stream = stream
+
+    def retain(self, urls: list[str]) -> None:
+        """
+        Forget channels that are no longer configured.
+
+        Args:
+            urls: Every configured stream URL or username
+        """
+        keep = {self._key(url) for url in urls}
+        for key in self._entries.keys() - keep:
+            del self._entries[key]
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Get channel state with wall-clock times, for persisting across restarts.
+
+        Returns:
+            Dict mapping channel key to its last stream, probe times, and cost
+        """
+        offset = time.time() - time.monotonic()
+        return {
+            key: {
+                "stream": asdict(entry.stream) if entry.stream else None,
+                "probed_at": entry.probed_at + offset,
+                "changed_at": entry.changed_at + offset,
+                "cost": entry.cost,
+            }
+            for key, entry in self._entries.items()
+        }
+
+    def restore(self, entries: dict[str, Any]) -> None:
+        """
+        Load channel state from a snapshot.
+
+        Args:
+            entries: Dict returned by snapshot()
+        """
+        offset = time.time() - time.monotonic()
+        for key, entry in entries.items():
+            stream = entry.get("stream")
+            self._entries[key] = _ChannelState(
+                stream=(
+                    Stream(
+                        url=stream["url"],
+                        metadata=Metadata(**stream["metadata"]),
+                        master_url=stream.get("master_url"),
+                    )
+                    if stream
+                    else None
+                ),
+                probed_at=float(entry["probed_at"]) - offset,
+                changed_at=float(entry["changed_at"]) - offset,
+                cost=float(entry["cost"]),
+            )
+
+    def stats(self) -> dict[str, float]:
+        """
+        Get refresh counters for tuning.
+
+        Returns:
+            Dict with hits, misses, hit_rate, and number of tracked channels
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _age(self, entry: _ChannelState, tier: float) -> float:
+        """Seconds a channel's result may be reused at its tier and probe cost."""
+        age = self.max_age * tier
+        return age * 2 if entry.cost > self.slow_fetch else age
+
+    def _key(self, url: str) -> str:
+        """Normalize usernames and URLs to one key."""
+        if not url.startswith("http"):
+            url = f"https://twitch.tv/{url}"
+        return url.lower().rstrip("/")
@@ -1,6 +1,6 @@
 """Core data types for QuadLink."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -59,12 +59,15 @@ class Quad:
         stream2: URL for second stream slot.
         stream3: URL for third stream slot.
         stream4: URL for fourth stream slot.
+        authors: Lowercase channel names in slot order, if known. Not sent to
+            QuadStream and ignored when comparing quads.
     """
 
     stream1: str = ""
     stream2: str = ""
     stream3: str = ""
     stream4: str = ""
+    authors: tuple[str, ...] = field(default=(), compare=False)
 
     def to_dict(self) -> dict[str, str]:
         """Convert to dictionary for API calls.
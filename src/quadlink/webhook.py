@@ -0,0 +1,223 @@
+"""Background webhook delivery for quad updates."""
+
+import asyncio
+import random
+import time
+from typing import Any
+
+import httpx
+import structlog
+
+from quadlink.config.models import Webhook
+from quadlink.metrics import Metrics
+from quadlink.types import Quad
+
+logger = structlog.get_logger()
+
+SUCCESS_STATUSES = (200, 201, 202, 204)
+
+
+class WebhookDispatcher:
+    """Delivers webhook notifications in the background.
+
+    Each endpoint has its own worker and a bounded queue, so a slow or
+    failing receiver never delays the main loop or the other endpoints.
+    When a receiver falls behind, queued notifications are coalesced to the
+    latest quad, since only the current quad matters. Failed deliveries are
+    retried with exponential backoff and full jitter, and abandoned as soon
+    as a newer quad is queued.
+
+    Attributes:
+        sent: Notifications delivered successfully.
+        failed: Notifications abandoned after the last retry.
+        coalesced: Queued notifications replaced by a newer quad.
+    """
+
+    def __init__(self, config: Webhook, queue_size: int = 1, metrics: Metrics | None = None):
+        """
+        Initialize webhook dispatcher.
+
+        Args:
+            config: Webhook configuration
+            queue_size: Notifications queued per endpoint before coalescing
+            metrics: Optional metrics registry for request latencies
+        """
+        self.config = config
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self._queues: dict[str, asyncio.Queue[Quad | None]] = {}
+        self._workers: list[asyncio.Task[None]] = []
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared pooled HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.config.timeout)
+        return self._client
+
+    def submit(self, quad: Quad | None = None) -> None:
+        """
+        Queue a notification for every endpoint without waiting for delivery.
+
+        Args:
+            quad: Optional quad to include in payload
+        """
+        if not self._workers:
+            self._start()
+
+        for url, queue in self._queues.items():
+            while queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self.coalesced += 1
+                logger.debug("webhook coalesced", url=url)
+            queue.put_nowait(quad)
+
+    async def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait for queued notifications to be delivered or abandoned.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if all queues drained, False on timeout
+        """
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues.values())), timeout
+            )
+        except TimeoutError:
+            logger.warning("webhook flush timed out", pending=self.pending())
+            return False
+        return True
+
+    def pending(self) -> int:
+        """Count notifications queued and not yet picked up by a worker."""
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    async def close(self) -> None:
+        """Stop the workers and close the shared HTTP client."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = {}
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _start(self) -> None:
+        """Create one queue and worker per configured endpoint."""
+        for url in self.config.endpoints:
+            queue: asyncio.Queue[Quad | None] = asyncio.Queue(maxsize=self.queue_size)
+            self._queues[url] = queue
+            self._workers.append(asyncio.create_task(self._worker(url, queue)))
+
+    async def _worker(self, url: str, queue: "asyncio.Queue[Quad | None]") -> None:
+        """
+        Deliver notifications for one endpoint, in order, until cancelled.
+
+        Args:
+            url: Webhook endpoint URL
+            queue: Notifications queued for the endpoint
+        """
+        while True:
+            quad = await queue.get()
+            try:
+                await self._deliver(url, quad, queue)
+            finally:
+                queue.task_done()
+
+    async def _deliver(
+        self, url: str, quad: Quad | None, queue: "asyncio.Queue[Quad | None]"
+    ) -> None:
+        """
+        Deliver one notification, retrying with backoff until a newer one is queued.
+
+        Args:
+            url: Webhook endpoint URL
+            quad: Optional quad to include in payload
+            queue: Queue to check for newer notifications between retries
+        """
+        for attempt in range(self.config.max_retries + 1):
+            started = time.monotonic()
+            sent = await self._send(url, quad)
+            if self.metrics is not None:
+                self.metrics.webhook_seconds.observe(
+                    time.monotonic() - started, outcome="ok" if sent else "error"
+                )
+            if sent:
+                self.sent += 1
+                return
+
+            if attempt == self.config.max_retries:
+                break
+
+            delay = self._backoff(attempt)
+            logger.debug("webhook retrying", url=url, attempt=attempt + 1, delay=round(delay, 2))
+            await asyncio.sleep(delay)
+
+            if not queue.empty():
+                logger.debug("webhook superseded by newer quad", url=url)
+                self.coalesced += 1
+                return
+
+        self.failed += 1
+        logger.warning("webhook delivery failed", url=url, attempts=self.config.max_retries + 1)
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Compute the delay before a retry.
+
+        Args:
+            attempt: Zero-based index of the attempt that failed
+
+        Returns:
+            Delay in seconds, drawn uniformly up to the capped exponential backoff
+        """
+        ceiling = min(self.config.backoff * (1 << min(attempt, 16)), self.config.max_backoff)
+        return random.uniform(0, ceiling)
+
+    async def _send(self, url: str, quad: Quad | None) -> bool:
+        """
+        Send a single webhook request.
+
+        Args:
+            url: Webhook endpoint URL
+            quad: Optional quad to include in payload
+
+        Returns:
+            True if webhook sent successfully, False otherwise
+        """
+        try:
+            payload: dict[str, Any] = {"event": "quad_updated"}
+            if quad:
+                payload["quad"] = quad.to_dict()
+
+            response = await self._get_client().post(url, json=payload)
+
+            if response.status_code not in SUCCESS_STATUSES:
+                logger.warning(
+                    "webhook failed",
+                    status=response.status_code,
+                    url=url,
+                )
+                return False
+
+            logger.info("webhook sent", url=url)
+            return True
+
+        except httpx.TimeoutException:
+            logger.warning("webhook timeout", url=url)
+            return False
+        except httpx.RequestError as e:
+            logger.warning("webhook error", url=url, error=str(e))
+            return False
+        except Exception as e:
+            logger.warning("webhook error", url=url, error=str(e))
+            return False
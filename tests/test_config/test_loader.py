@@ -1,8 +1,10 @@
 """Tests for configuration loader."""
 
+import os
 import tempfile
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
@@ -211,3 +213,86 @@ async def test_load_from_first_available_path(tmp_path):
 
     # should load from first path
     assert config.credentials.username == "user1"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_file_not_reparsed(minimal_config_data, tmp_path):
+    """Test that an unchanged file returns the cached config without parsing."""
+    config_file = tmp_path / "config.yaml"
+    write_yaml(config_file, minimal_config_data)
+
+    loader = ConfigLoader()
+    loader.SEARCH_PATHS = [str(config_file)]
+
+    config1 = await loader.load_or_cache()
+    assert loader.last_diff.affects("credentials", "priorities")
+
+    with patch("quadlink.config.loader.Config") as MockConfig:
+        config2 = await loader.load_or_cache()
+
+    MockConfig.assert_not_called()
+    assert config1 is config2
+    assert not loader.last_diff
+
+
+@pytest.mark.asyncio
+async def test_changed_file_reports_diff(minimal_config_data, tmp_path):
+    """Test that a changed file is reloaded with a diff of changed fields."""
+    config_file = tmp_path / "config.yaml"
+    write_yaml(config_file, minimal_config_data)
+
+    loader = ConfigLoader()
+    loader.SEARCH_PATHS = [str(config_file)]
+    config1 = await loader.load_or_cache()
+
+    write_yaml(config_file, {**minimal_config_data, "diversity_bonus": 5, "early_exit": True})
+    config2 = await loader.load_or_cache()
+
+    assert config2 is not config1
+    assert config2.diversity_bonus == 5
+    assert loader.last_diff.changed == {"diversity_bonus", "early_exit"}
+    assert loader.last_diff.affects("early_exit", "webhook")
+    assert not loader.last_diff.affects("webhook")
+
+
+@pytest.mark.asyncio
+async def test_touched_file_reports_empty_diff(minimal_config_data, tmp_path):
+    """Test that rewriting identical content yields an empty diff."""
+    config_file = tmp_path / "config.yaml"
+    write_yaml(config_file, minimal_config_data)
+
+    loader = ConfigLoader()
+    loader.SEARCH_PATHS = [str(config_file)]
+    await loader.load_or_cache()
+
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    await loader.load_or_cache()
+
+    assert not loader.last_diff
+
+
+@pytest.mark.asyncio
+async def test_credentials_file_change_triggers_reload(tmp_path):
+    """Test that changing the referenced credentials file reloads the config."""
+    secret_file = tmp_path / "secret"
+    secret_file.write_text("user1:secret")
+    config_file = tmp_path / "config.yaml"
+    write_yaml(
+        config_file,
+        {
+            "credentials": {"file": str(secret_file)},
+            "priorities": {999: [{"urls": ["streamer1"]}]},
+        },
+    )
+
+    loader = ConfigLoader()
+    loader.SEARCH_PATHS = [str(config_file)]
+    config1 = await loader.load_or_cache()
+    assert config1.credentials.username == "user1"
+
+    secret_file.write_text("user22:secret")
+    config2 = await loader.load_or_cache()
+
+    assert config2.credentials.username == "user22"
+    assert loader.last_diff.changed == {"credentials"}
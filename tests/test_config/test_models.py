@@ -1,12 +1,16 @@
 """Tests for configuration models."""
 
+from datetime import time
+
 import pytest
 from pydantic import ValidationError
 
 from quadlink.config.models import (
+    AdaptiveInterval,
     Config,
     Credentials,
     Filters,
+    IntervalWindow,
     Logging,
     Ruleset,
     StreamGroup,
@@ -91,6 +95,22 @@ def test_filters_with_values():
     assert len(filters.block_titles) == 1
 
 
+def test_filters_compiled_on_validation():
+    """Test filter patterns are compiled once during validation."""
+    filters = Filters(block_titles=["(?i).*raid.*", "^ad$"])
+    compiled = filters.compiled("block_titles")
+
+    assert [p.pattern for p in compiled] == ["(?i).*raid.*", "^ad$"]
+    assert compiled[0].search("RAID night")
+    assert filters.compiled("allow_titles") == ()
+
+
+def test_filters_invalid_pattern():
+    """Test invalid regex patterns fail validation."""
+    with pytest.raises(ValidationError, match="Invalid regex pattern"):
+        Filters(block_titles=["[unclosed"])
+
+
 def test_ruleset():
     """Test ruleset with filters."""
     ruleset = Ruleset(
@@ -117,6 +137,65 @@ def test_webhook_defaults():
     assert webhook.timeout == 10
 
 
+def test_refresh_tiers_defaults():
+    """Test refresh tiers default to disabled."""
+    config = Config(credentials=Credentials(username="u", secret="s"), priorities={})
+    assert config.refresh_tiers.enabled is False
+    assert config.refresh_tiers.max_age == 120
+    assert config.refresh_tiers.bypass_priority is None
+
+
+def test_adaptive_interval_defaults():
+    """Test adaptive interval defaults to disabled with sane bounds."""
+    adaptive = AdaptiveInterval()
+    assert adaptive.enabled is False
+    assert adaptive.min_interval <= adaptive.max_interval
+    assert adaptive.bounds(time(12, 0)) == (adaptive.min_interval, adaptive.max_interval)
+
+
+def test_adaptive_interval_rejects_inverted_bounds():
+    """Test min_interval above max_interval is rejected."""
+    with pytest.raises(ValidationError, match="min_interval must not exceed max_interval"):
+        AdaptiveInterval(min_interval=60, max_interval=30)
+    with pytest.raises(ValidationError, match="min_interval must not exceed max_interval"):
+        IntervalWindow(start="08:00", end="09:00", min_interval=60, max_interval=30)
+
+
+def test_interval_window_same_day():
+    """Test a window within one day includes its start and excludes its end."""
+    window = IntervalWindow(start="18:00", end="23:00", min_interval=10, max_interval=60)
+    assert window.contains(time(18, 0))
+    assert window.contains(time(22, 59))
+    assert not window.contains(time(23, 0))
+    assert not window.contains(time(3, 0))
+
+
+def test_interval_window_wraps_past_midnight():
+    """Test a window ending before it starts spans midnight."""
+    window = IntervalWindow(start="23:00", end="07:00", min_interval=120, max_interval=600)
+    assert window.contains(time(23, 30))
+    assert window.contains(time(0, 0))
+    assert window.contains(time(6, 59))
+    assert not window.contains(time(7, 0))
+    assert not window.contains(time(12, 0))
+
+
+def test_adaptive_interval_bounds_from_schedule():
+    """Test the first matching window overrides the default bounds."""
+    adaptive = AdaptiveInterval(
+        min_interval=15,
+        max_interval=120,
+        schedule=[
+            {"start": "23:00", "end": "07:00", "min_interval": 120, "max_interval": 600},
+            {"start": "18:00", "end": "23:30", "min_interval": 10, "max_interval": 60},
+        ],
+    )
+    assert adaptive.bounds(time(2, 0)) == (120, 600)
+    assert adaptive.bounds(time(23, 15)) == (120, 600)
+    assert adaptive.bounds(time(19, 0)) == (10, 60)
+    assert adaptive.bounds(time(12, 0)) == (15, 120)
+
+
 def test_logging_defaults():
     """Test logging defaults."""
     logging = Logging()
@@ -1,13 +1,22 @@
 """Tests for daemon module."""
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, time
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
+import httpx
 import pytest
 
+from quadlink.config.loader import ConfigDiff
+from quadlink.config.models import AdaptiveInterval, Config, Credentials, IntervalWindow
 from quadlink.daemon import Daemon, run_daemon
+from quadlink.quad import QuadBuilder
+from quadlink.quadstream import QuadStreamClient
+from quadlink.state import StateStore
 from quadlink.types import Metadata, PrioritizedStream, Quad, Stream
 
+PUSHED = Quad(stream1="https://a.m3u8?t=1", authors=("a",))
+
 
 def make_stream(author: str) -> PrioritizedStream:
     """Create a prioritized stream."""
@@ -21,6 +30,29 @@ def make_stream(author: str) -> PrioritizedStream:
     )
 
 
+def mock_quadstream_client(login: bool = True) -> AsyncMock:
+    """Create a QuadStream client mock with nothing pushed yet."""
+    client = AsyncMock()
+    client.login = AsyncMock(return_value=login)
+    client.is_current = MagicMock(return_value=False)
+    client.pushed_digest = None
+    return client
+
+
+def logged_in_client(*statuses: int) -> QuadStreamClient:
+    """Create a logged-in QuadStream client answering updates with statuses, then 200."""
+    responses = list(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(responses.pop(0) if responses else 200)
+
+    client = QuadStreamClient("user", "secret")
+    client.short_id = "abc123"
+    client.cookies = httpx.Cookies({"session": "test"})
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
 class TestDaemonInit:
     """Tests for Daemon initialization."""
 
@@ -52,10 +84,10 @@ class TestDaemonStart:
 
     @pytest.mark.asyncio
     async def test_start_starts_health_server(self):
-        """start() should start the health server when enabled."""
+        """start() should start the health server when enabled and stop it on exit."""
         with patch("quadlink.daemon.ConfigLoader"):
             with patch("quadlink.daemon.HealthServer") as MockHealth:
-                mock_health = MagicMock()
+                mock_health = AsyncMock()
                 MockHealth.return_value = mock_health
 
                 daemon = Daemon(enable_health_server=True)
@@ -63,7 +95,24 @@ class TestDaemonStart:
 
                 await daemon.start()
 
-                mock_health.start.assert_called_once()
+                mock_health.start.assert_awaited_once()
+                mock_health.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_start_stops_health_server_on_cancel(self):
+        """start() should stop the health server when the daemon task is cancelled."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            with patch("quadlink.daemon.HealthServer") as MockHealth:
+                mock_health = AsyncMock()
+                MockHealth.return_value = mock_health
+
+                daemon = Daemon(enable_health_server=True)
+                daemon._main_loop = AsyncMock(side_effect=asyncio.CancelledError)
+
+                with pytest.raises(asyncio.CancelledError):
+                    await daemon.start()
+
+                mock_health.stop.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_start_sets_running_true(self):
@@ -88,6 +137,505 @@ class TestDaemonStart:
                 with pytest.raises(asyncio.CancelledError):
                     await daemon.start()
 
+    @pytest.mark.asyncio
+    async def test_start_closes_quadstream_client(self):
+        """start() should close the QuadStream client on shutdown."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            with patch("quadlink.daemon.HealthServer"):
+                daemon = Daemon()
+                daemon._warm_up = AsyncMock()
+                daemon._main_loop = AsyncMock()
+                daemon.quadstream_client = mock_quadstream_client()
+
+                await daemon.start()
+
+                daemon.quadstream_client.close.assert_awaited_once()
+
+
+class TestDaemonWarmUp:
+    """Tests for startup warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_creates_processor(self):
+        """Should create the processor and builder and warm up the fetcher."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            mock_config = MagicMock()
+            mock_config.state_file = None
+            MockLoader.return_value.load_or_cache = AsyncMock(return_value=mock_config)
+
+            with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
+                with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
+                    MockProcessor.return_value.warm_up = AsyncMock()
+                    daemon = Daemon()
+                    await daemon._warm_up()
+
+                    MockProcessor.assert_called_once_with(mock_config, metrics=daemon.metrics)
+                    MockProcessor.return_value.warm_up.assert_awaited_once()
+                    assert daemon.processor is MockProcessor.return_value
+                    assert daemon.quad_builder is MockBuilder.return_value
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_is_not_fatal(self):
+        """A failed warm-up should leave setup to the main loop."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            MockLoader.return_value.load_or_cache = AsyncMock(side_effect=RuntimeError("boom"))
+            daemon = Daemon()
+
+            await daemon._warm_up()
+
+            assert daemon.processor is None
+
+    @pytest.mark.asyncio
+    async def test_warm_up_skipped_without_config(self):
+        """Should not create components when the config cannot be loaded."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            MockLoader.return_value.load_or_cache = AsyncMock(return_value=None)
+            daemon = Daemon()
+
+            await daemon._warm_up()
+
+            assert daemon.processor is None
+
+
+class TestDaemonState:
+    """Tests for resuming quad history across restarts."""
+
+    @pytest.mark.asyncio
+    async def test_components_resume_saved_state(self, tmp_path):
+        """A restarted daemon should resume the quad saved by the previous one."""
+        config = Config(
+            credentials=Credentials(username="user", secret="secret"),
+            priorities={},
+            state_file=str(tmp_path / "state.json"),
+        )
+        with patch("quadlink.daemon.ConfigLoader"):
+            first = Daemon()
+            first._create_components(config)
+            first.quad_builder.build_quad(make_candidates("a", "b"))
+            await first._save_state(config)
+
+            second = Daemon()
+            second._create_components(config)
+
+        assert second.quad_builder.previous_quad == first.quad_builder.previous_quad
+        second.quad_builder.build_quad(make_candidates("a", "b"))
+        assert second.quad_builder.quad_changed is False
+
+    @pytest.mark.asyncio
+    async def test_unconfirmed_push_resent_after_restart(self, tmp_path):
+        """Only confirmed pushes should be saved, so a restart re-sends an unconfirmed quad."""
+        config = Config(
+            credentials=Credentials(username="user", secret="secret"),
+            priorities={},
+            state_file=str(tmp_path / "state.json"),
+        )
+        with patch("quadlink.daemon.ConfigLoader"):
+            first = Daemon()
+        first.config = config
+        first._create_components(config)
+        first.quadstream_client = logged_in_client(200, 500)
+
+        pushed = first.quad_builder.build_quad(make_candidates("a"))
+        assert await first._push_quad(pushed) is True
+        saved = QuadStreamClient("user", "secret")
+        assert StateStore(config.state_file).restore_client(saved) is True
+        assert saved.is_current(pushed)
+
+        unconfirmed = first.quad_builder.build_quad(make_candidates("b"))
+        await first._save_state(config)
+        assert await first._push_quad(unconfirmed) is False
+        await first.quadstream_client.close()
+
+        with patch("quadlink.daemon.ConfigLoader"):
+            second = Daemon()
+        second._create_components(config)
+        second.quadstream_client = QuadStreamClient("user", "secret")
+        StateStore(config.state_file).restore_client(second.quadstream_client)
+
+        assert second.quadstream_client.is_current(pushed)
+        rebuilt = second.quad_builder.build_quad(make_candidates("b"))
+        assert second.quad_builder.quad_changed is False
+        assert second._should_push(config, rebuilt) is True
+
+    @pytest.mark.asyncio
+    async def test_no_state_file_configured(self, tmp_path):
+        """Without state_file nothing should be read or written."""
+        config = Config(credentials=Credentials(username="user", secret="secret"), priorities={})
+        with patch("quadlink.daemon.ConfigLoader"):
+            with patch("quadlink.daemon.StateStore") as MockStore:
+                daemon = Daemon()
+                daemon._create_components(config)
+                await daemon._save_state(config)
+
+        MockStore.assert_not_called()
+
+
+class TestDaemonShouldPush:
+    """Tests for deciding which quads are pushed."""
+
+    @pytest.fixture
+    def daemon(self):
+        """Daemon with a real client that has pushed one quad."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon()
+        daemon.quad_builder = MagicMock()
+        daemon.quad_builder.quad_changed = False
+        daemon.quadstream_client = QuadStreamClient("user", "secret")
+        daemon.quadstream_client.pushed_digest = QuadStreamClient.digest(PUSHED)
+        daemon.quadstream_client.pushed_authors = PUSHED.authors
+        daemon.quadstream_client.pushed_at = datetime.now().timestamp() - 100
+        return daemon
+
+    def make_config(self, playlist_refresh=None) -> Config:
+        """Helper to create a config with a playlist refresh setting."""
+        return Config(
+            credentials=Credentials(username="user", secret="secret"),
+            priorities={},
+            playlist_refresh=playlist_refresh,
+        )
+
+    def test_identical_quad_not_pushed(self, daemon):
+        """A quad matching the last push should not be pushed, even if marked changed."""
+        daemon.quad_builder.quad_changed = True
+
+        assert daemon._should_push(self.make_config(), PUSHED) is False
+
+    def test_changed_authors_pushed(self, daemon):
+        """A quad with changed authors should be pushed."""
+        daemon.quad_builder.quad_changed = True
+        quad = Quad(stream1="https://b.m3u8", authors=("b",))
+
+        assert daemon._should_push(self.make_config(), quad) is True
+
+    def test_unpushed_quad_pushed_when_unchanged(self, daemon):
+        """A quad whose authors differ from the last push should be pushed even if unchanged."""
+        quad = Quad(stream1="https://b.m3u8", authors=("b",))
+
+        assert daemon._should_push(self.make_config(), quad) is True
+
+    def test_unknown_remote_pushed(self, daemon):
+        """A restored quad should be pushed if nothing is known to be on this stream."""
+        daemon.quadstream_client.pushed_digest = None
+        daemon.quadstream_client.pushed_authors = None
+        quad = Quad(stream1="https://a.m3u8?t=2", authors=("a",))
+
+        assert daemon._should_push(self.make_config(), quad) is True
+
+    def test_playlist_refresh_disabled(self, daemon):
+        """URL-only changes should not be pushed without playlist_refresh."""
+        quad = Quad(stream1="https://a.m3u8?t=2", authors=("a",))
+
+        assert daemon._should_push(self.make_config(), quad) is False
+
+    def test_playlist_refresh_waits_for_age(self, daemon):
+        """URL-only changes should be pushed once the last push is old enough."""
+        refreshed = Quad(stream1="https://a.m3u8?t=2", authors=("a",))
+
+        assert daemon._should_push(self.make_config(playlist_refresh=600), refreshed) is False
+        assert daemon._should_push(self.make_config(playlist_refresh=60), refreshed) is True
+
+    @pytest.mark.asyncio
+    async def test_failed_push_retried_when_build_unchanged(self, daemon):
+        """A quad whose push failed should still be pushed once the build stops changing."""
+        config = self.make_config()
+        daemon.quad_builder = QuadBuilder(config)
+        client = daemon.quadstream_client = logged_in_client(200, 500)
+
+        first = daemon.quad_builder.build_quad(make_candidates("a"))
+        assert daemon._should_push(config, first) is True
+        assert await client.update_quad(first) is True
+
+        second = daemon.quad_builder.build_quad(make_candidates("b"))
+        assert daemon._should_push(config, second) is True
+        assert await client.update_quad(second) is False
+
+        again = daemon.quad_builder.build_quad(make_candidates("b"))
+        await client.close()
+
+        assert daemon.quad_builder.quad_changed is False
+        assert daemon._should_push(config, again) is True
+
+
+class TestDaemonApplyConfig:
+    """Tests for hot-applying reloaded configs."""
+
+    @pytest.mark.asyncio
+    async def test_changed_config_applied_in_place(self):
+        """A reloaded config should be applied to the existing components."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            daemon = Daemon()
+            daemon.processor = MagicMock(filter_time=0.0)
+            daemon.processor.apply_config = AsyncMock()
+            daemon.quad_builder = MagicMock()
+            daemon.quadstream_client = MagicMock()
+            MockLoader.return_value.last_diff = ConfigDiff(frozenset({"priorities"}))
+            new_config = MagicMock()
+
+            await daemon._apply_config(new_config)
+
+            daemon.processor.apply_config.assert_awaited_once_with(
+                new_config, MockLoader.return_value.last_diff
+            )
+            daemon.quad_builder.apply_config.assert_called_once_with(new_config)
+            assert daemon.quadstream_client is not None
+
+    @pytest.mark.asyncio
+    async def test_credentials_change_drops_client(self):
+        """Changed credentials should force a new QuadStream login."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            daemon = Daemon()
+            daemon.processor = MagicMock(filter_time=0.0)
+            daemon.processor.apply_config = AsyncMock()
+            daemon.quad_builder = MagicMock()
+            old_client = AsyncMock()
+            daemon.quadstream_client = old_client
+            MockLoader.return_value.last_diff = ConfigDiff(frozenset({"credentials"}))
+
+            await daemon._apply_config(MagicMock())
+
+            assert daemon.quadstream_client is None
+            old_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_webhook_change_replaces_dispatcher(self):
+        """Changed webhook settings should close the running dispatcher."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            daemon = Daemon()
+            daemon.processor = MagicMock(filter_time=0.0)
+            daemon.processor.apply_config = AsyncMock()
+            daemon.quad_builder = MagicMock()
+            old_dispatcher = AsyncMock()
+            daemon.webhook_dispatcher = old_dispatcher
+            MockLoader.return_value.last_diff = ConfigDiff(frozenset({"webhook"}))
+
+            await daemon._apply_config(MagicMock())
+
+            assert daemon.webhook_dispatcher is None
+            old_dispatcher.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_main_loop_applies_new_config(self):
+        """The main loop should apply a config that differs from the last one."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            new_config = MagicMock()
+            new_config.adaptive_interval = AdaptiveInterval()
+            new_config.state_file = None
+            MockLoader.return_value.load_or_cache = AsyncMock(return_value=new_config)
+            daemon = Daemon(one_shot=True)
+            daemon.running = True
+            daemon.config = MagicMock()
+            daemon.processor = MagicMock(filter_time=0.0)
+            daemon.processor.process_stream_groups = AsyncMock(return_value=[])
+            daemon.quad_builder = MagicMock()
+            daemon.quadstream_client = MagicMock()
+            daemon._apply_config = AsyncMock(
+                side_effect=lambda c: setattr(daemon, "running", False)
+            )
+
+            with patch("asyncio.sleep", new_callable=AsyncMock):
+                await daemon._main_loop()
+
+            daemon._apply_config.assert_awaited_once_with(new_config)
+            assert daemon.config is new_config
+
+
+class TestDaemonPublish:
+    """Tests for background quad pushes."""
+
+    @pytest.mark.asyncio
+    async def test_push_without_client_fails(self):
+        """A push before login should fail so the publisher retries it."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon()
+
+            assert await daemon._push_quad(Quad(stream1="https://s1")) is False
+
+    @pytest.mark.asyncio
+    async def test_push_uses_current_client(self):
+        """Pushes should go through whichever client is currently logged in."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon()
+            daemon.quadstream_client = mock_quadstream_client()
+            daemon.quadstream_client.update_quad = AsyncMock(return_value=True)
+            quad = Quad(stream1="https://s1")
+
+            assert await daemon._push_quad(quad) is True
+            daemon.quadstream_client.update_quad.assert_awaited_once_with(quad)
+
+    def test_published_quad_notifies_webhook(self):
+        """A pushed quad should be handed to the webhook dispatcher."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon()
+            daemon.config = MagicMock()
+            daemon.config.webhook.enabled = True
+            daemon.config.webhook.endpoints = ["https://webhook.example.com"]
+            quad = Quad(stream1="https://s1")
+
+            with patch("quadlink.daemon.WebhookDispatcher") as MockDispatcher:
+                daemon._on_quad_published(quad)
+
+            MockDispatcher.return_value.submit.assert_called_once_with(quad)
+
+    def test_published_quad_without_webhook(self):
+        """No dispatcher should be created when webhooks are disabled."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon()
+            daemon.config = MagicMock()
+            daemon.config.webhook.enabled = False
+
+            daemon._on_quad_published(Quad(stream1="https://s1"))
+
+            assert daemon.webhook_dispatcher is None
+
+    @pytest.mark.asyncio
+    async def test_slow_push_does_not_block_cycle(self):
+        """The main loop should submit the quad and sleep without awaiting the push."""
+        with patch("quadlink.daemon.ConfigLoader") as MockLoader:
+            config = MagicMock()
+            config.adaptive_interval = AdaptiveInterval()
+            config.state_file = None
+            MockLoader.return_value.load_or_cache = AsyncMock(return_value=config)
+            daemon = Daemon(interval=30)
+            daemon.running = True
+            daemon.config = config
+            daemon.processor = MagicMock(filter_time=0.0)
+            daemon.processor.process_stream_groups = AsyncMock(return_value=[MagicMock()])
+            daemon.quad_builder = MagicMock()
+            daemon.quad_builder.build_quad.return_value = Quad(stream1="https://s1")
+            daemon.quad_builder.quad_changed = True
+            released = asyncio.Event()
+
+            async def slow_update(quad):
+                await released.wait()
+                return True
+
+            daemon.quadstream_client = mock_quadstream_client()
+            daemon.quadstream_client.update_quad = AsyncMock(side_effect=slow_update)
+
+            async def stop(seconds):
+                daemon.running = False
+
+            with patch("asyncio.sleep", new_callable=AsyncMock, side_effect=stop) as mock_sleep:
+                await daemon._main_loop()
+
+            mock_sleep.assert_awaited_once()
+            assert mock_sleep.await_args.args[0] == pytest.approx(30, abs=1)
+            assert daemon.publisher.pushed == 0
+
+            released.set()
+            assert await daemon.publisher.flush(timeout=1) is True
+            assert daemon.publisher.pushed == 1
+            await daemon.publisher.close()
+
+
+def make_candidates(*names: str) -> list[PrioritizedStream]:
+    """Helper to create candidates for the given channel names."""
+    return [make_stream(name) for name in names]
+
+
+def make_adaptive_config(**adaptive) -> Config:
+    """Helper to create a real config with adaptive interval settings."""
+    return Config(
+        credentials=Credentials(username="user", secret="secret"),
+        priorities={},
+        adaptive_interval=AdaptiveInterval(**adaptive),
+    )
+
+
+class TestDaemonAdaptiveInterval:
+    """Tests for the churn-based polling interval."""
+
+    def test_disabled_keeps_base_interval(self):
+        """With adaptive_interval disabled, the interval stays at --interval."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            config = make_adaptive_config(enabled=False)
+
+            daemon._adapt_interval(config, make_candidates("a"), quad_changed=True)
+            daemon._adapt_interval(config, make_candidates("a"), quad_changed=False)
+
+            assert daemon.interval == 30
+
+    def test_grows_while_stable_up_to_max(self):
+        """Stable cycles should multiply the interval by growth, capped at max."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            config = make_adaptive_config(enabled=True, min_interval=10, max_interval=50, growth=2)
+            candidates = make_candidates("a", "b")
+
+            intervals = []
+            for _ in range(4):
+                daemon._adapt_interval(config, candidates, quad_changed=False)
+                intervals.append(daemon.interval)
+
+            # first cycle counts as churn, since there is no previous candidate set
+            assert intervals == [10, 20, 40, 50]
+
+    def test_quad_change_resets_to_min(self):
+        """A quad change should drop the interval back to the minimum."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            config = make_adaptive_config(enabled=True, min_interval=10, max_interval=50, growth=2)
+            candidates = make_candidates("a")
+            daemon._adapt_interval(config, candidates, quad_changed=False)
+            daemon._adapt_interval(config, candidates, quad_changed=False)
+            assert daemon.interval == 20
+
+            daemon._adapt_interval(config, candidates, quad_changed=True)
+
+            assert daemon.interval == 10
+
+    def test_candidate_change_resets_to_min(self):
+        """A new or departed candidate should drop the interval to the minimum."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            config = make_adaptive_config(enabled=True, min_interval=10, max_interval=50, growth=2)
+            daemon._adapt_interval(config, make_candidates("a"), quad_changed=False)
+            daemon._adapt_interval(config, make_candidates("a"), quad_changed=False)
+
+            daemon._adapt_interval(config, make_candidates("a", "b"), quad_changed=False)
+            assert daemon.interval == 10
+
+            daemon._adapt_interval(config, make_candidates("a", "b"), quad_changed=False)
+            daemon._adapt_interval(config, [], quad_changed=False)
+            assert daemon.interval == 10
+
+    def test_schedule_window_bounds(self):
+        """A matching time-of-day window should bound the interval."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            config = make_adaptive_config(
+                enabled=True,
+                min_interval=10,
+                max_interval=50,
+                schedule=[
+                    IntervalWindow(start="23:00", end="07:00", min_interval=120, max_interval=600)
+                ],
+            )
+
+            with patch("quadlink.daemon.datetime") as mock_datetime:
+                mock_datetime.now.return_value.time.return_value = time(2, 30)
+                daemon._adapt_interval(config, make_candidates("a"), quad_changed=True)
+
+            assert daemon.interval == 120
+
+    def test_disabling_restores_base_interval(self):
+        """Turning adaptive_interval off should return to the --interval value."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+            daemon._adapt_interval(
+                make_adaptive_config(enabled=True, min_interval=10, max_interval=50),
+                make_candidates("a"),
+                quad_changed=True,
+            )
+            assert daemon.interval == 10
+
+            daemon._adapt_interval(
+                make_adaptive_config(enabled=False), make_candidates("a"), quad_changed=False
+            )
+
+            assert daemon.interval == 30
+
 
 class TestDaemonMainLoop:
     """Tests for daemon main loop."""
@@ -100,6 +648,8 @@ class TestDaemonMainLoop:
         config.credentials.secret = "secret"
         config.webhook.enabled = False
         config.webhook.url = ""
+        config.adaptive_interval = AdaptiveInterval()
+        config.state_file = None
         return config
 
     @pytest.fixture
@@ -137,11 +687,13 @@ class TestDaemonMainLoop:
 
         with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             await daemon._main_loop()
-            mock_sleep.assert_called_with(30)
+            # retry delay doubles for consecutive failures
+            assert mock_sleep.await_args_list == [call(30), call(60)]
+            assert daemon.metrics.value("quadlink_failures_total") == 2
 
     @pytest.mark.asyncio
-    async def test_main_loop_marks_ready_on_config_load(self, daemon_with_mocks, mock_config):
-        """Should mark health server ready after config load."""
+    async def test_main_loop_not_ready_until_cycle_succeeds(self, daemon_with_mocks, mock_config):
+        """Should not record success for readiness when login fails."""
         daemon, mock_loader, mock_health = daemon_with_mocks
         daemon.running = True
         mock_loader.load_or_cache = AsyncMock(return_value=mock_config)
@@ -149,8 +701,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor"):
             with patch("quadlink.daemon.QuadBuilder"):
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=False)
+                    mock_client = mock_quadstream_client(login=False)
                     MockClient.return_value = mock_client
 
                     # login fails, so we stop after first iteration
@@ -168,7 +719,7 @@ class TestDaemonMainLoop:
                     with patch("asyncio.sleep", new_callable=AsyncMock):
                         await daemon._main_loop()
 
-                    mock_health.mark_ready.assert_called()
+                    mock_health.record_success.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_main_loop_initializes_components(self, daemon_with_mocks, mock_config):
@@ -180,8 +731,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=False)
+                    mock_client = mock_quadstream_client(login=False)
                     MockClient.return_value = mock_client
 
                     call_count = 0
@@ -198,7 +748,7 @@ class TestDaemonMainLoop:
                     with patch("asyncio.sleep", new_callable=AsyncMock):
                         await daemon._main_loop()
 
-                    MockProcessor.assert_called_once_with(mock_config)
+                    MockProcessor.assert_called_once_with(mock_config, metrics=daemon.metrics)
                     MockBuilder.assert_called_once_with(mock_config)
 
     @pytest.mark.asyncio
@@ -211,8 +761,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor"):
             with patch("quadlink.daemon.QuadBuilder"):
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=False)
+                    mock_client = mock_quadstream_client(login=False)
                     MockClient.return_value = mock_client
 
                     call_count = 0
@@ -228,8 +777,10 @@ class TestDaemonMainLoop:
 
                     with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
                         await daemon._main_loop()
-                        # should sleep on login failure
-                        mock_sleep.assert_called_with(30)
+                        # should back off on login failure
+                        assert mock_sleep.await_args_list == [call(30), call(60)]
+
+                    mock_client.close.assert_awaited()
 
     @pytest.mark.asyncio
     async def test_main_loop_no_candidates(self, daemon_with_mocks, mock_config):
@@ -241,12 +792,11 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder"):
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(return_value=[])
                     MockProcessor.return_value = mock_processor
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     MockClient.return_value = mock_client
 
                     call_count = 0
@@ -263,7 +813,8 @@ class TestDaemonMainLoop:
 
                     with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
                         await daemon._main_loop()
-                        mock_sleep.assert_called_with(original_interval)
+                        first_delay = mock_sleep.await_args_list[0].args[0]
+                        assert first_delay == pytest.approx(original_interval, abs=1)
 
     @pytest.mark.asyncio
     async def test_main_loop_empty_quad(self, daemon_with_mocks, mock_config):
@@ -275,7 +826,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -286,8 +837,7 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = empty_quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     MockClient.return_value = mock_client
 
                     call_count = 0
@@ -317,7 +867,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -328,8 +878,7 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     mock_client.update_quad = AsyncMock(return_value=True)
                     MockClient.return_value = mock_client
 
@@ -337,6 +886,57 @@ class TestDaemonMainLoop:
 
                     mock_client.update_quad.assert_called_once_with(quad)
 
+    @pytest.mark.asyncio
+    async def test_main_loop_records_metrics(self, daemon_with_mocks, mock_config):
+        """A cycle should record each phase, the cycle, and the push latency."""
+        daemon, mock_loader, mock_health = daemon_with_mocks
+        daemon.running = True
+        daemon.one_shot = True
+        mock_loader.load_or_cache = AsyncMock(return_value=mock_config)
+
+        with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
+            with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
+                with patch("quadlink.daemon.QuadStreamClient") as MockClient:
+                    mock_processor = MagicMock(filter_time=0.0)
+                    mock_processor.process_stream_groups = AsyncMock(
+                        return_value=[make_stream("streamer1")]
+                    )
+                    mock_processor.filter.stats.return_value = {
+                        "hits": 3,
+                        "misses": 1,
+                        "hit_rate": 0.75,
+                        "size": 1,
+                    }
+                    mock_processor.offline_cache = None
+                    mock_processor.refresh = None
+                    MockProcessor.return_value = mock_processor
+
+                    mock_builder = MagicMock()
+                    mock_builder.build_quad.return_value = Quad(stream1="https://twitch.tv/a")
+                    mock_builder.quad_changed = True
+                    MockBuilder.return_value = mock_builder
+
+                    mock_client = mock_quadstream_client(login=True)
+                    mock_client.update_quad = AsyncMock(return_value=True)
+                    mock_client.renewals = 0
+                    MockClient.return_value = mock_client
+
+                    await daemon._main_loop()
+
+        metrics = daemon.metrics
+        for phase in ("config", "login", "fetch", "filter", "build", "save"):
+            assert metrics.phase_seconds.count(phase=phase) == 1
+        assert metrics.cycle_seconds.count() == 1
+        assert metrics.quadstream_update_seconds.count(outcome="ok") == 1
+        assert metrics.value("quadlink_candidates") == 1
+        assert metrics.value("quadlink_quad_changes_total") == 1
+        assert metrics.value("quadlink_cache_hits_total", cache="filter") == 3
+        assert metrics.value("quadlink_cache_hits_total", cache="offline") is None
+        assert "quadlink_session_renewals_total 0" in metrics.render()
+        interval, duration = mock_health.record_success.call_args.args
+        assert interval == daemon.scheduler.interval
+        assert duration > 0
+
     @pytest.mark.asyncio
     async def test_main_loop_update_failure(self, daemon_with_mocks, mock_config):
         """Should log error on update failure."""
@@ -348,7 +948,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -359,17 +959,22 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     mock_client.update_quad = AsyncMock(return_value=False)
                     MockClient.return_value = mock_client
 
-                    # should not raise, just log error
-                    await daemon._main_loop()
+                    # should not raise, just retry in the background until the flush times out
+                    with patch("quadlink.daemon.PUSH_FLUSH_TIMEOUT", 0.05):
+                        await daemon._main_loop()
+
+                    mock_client.update_quad.assert_called_with(quad)
+                    assert daemon.publisher.failed >= 1
+                    assert daemon.publisher.pushed == 0
+                    await daemon.publisher.close()
 
     @pytest.mark.asyncio
     async def test_main_loop_webhook_enabled(self, daemon_with_mocks):
-        """Should send webhook when enabled."""
+        """Should queue a webhook when enabled and flush it before a one-shot exit."""
         daemon, mock_loader, mock_health = daemon_with_mocks
         daemon.running = True
         daemon.one_shot = True
@@ -378,14 +983,16 @@ class TestDaemonMainLoop:
         config.credentials.username = "user"
         config.credentials.secret = "secret"
         config.webhook.enabled = True
-        config.webhook.url = "https://webhook.example.com"
+        config.webhook.endpoints = ["https://webhook.example.com"]
+        config.adaptive_interval = AdaptiveInterval()
+        config.state_file = None
 
         mock_loader.load_or_cache = AsyncMock(return_value=config)
 
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -396,17 +1003,20 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     mock_client.update_quad = AsyncMock(return_value=True)
-                    mock_client.send_webhook = AsyncMock(return_value=True)
                     MockClient.return_value = mock_client
 
-                    await daemon._main_loop()
+                    with patch("quadlink.daemon.WebhookDispatcher") as MockDispatcher:
+                        mock_dispatcher = MagicMock()
+                        mock_dispatcher.flush = AsyncMock(return_value=True)
+                        MockDispatcher.return_value = mock_dispatcher
 
-                    mock_client.send_webhook.assert_called_once_with(
-                        "https://webhook.example.com", quad
-                    )
+                        await daemon._main_loop()
+
+                    MockDispatcher.assert_called_once_with(config.webhook, metrics=daemon.metrics)
+                    mock_dispatcher.submit.assert_called_once_with(quad)
+                    mock_dispatcher.flush.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_main_loop_one_shot_exits(self, daemon_with_mocks, mock_config):
@@ -419,7 +1029,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -430,8 +1040,7 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     mock_client.update_quad = AsyncMock(return_value=True)
                     MockClient.return_value = mock_client
 
@@ -461,7 +1070,7 @@ class TestDaemonMainLoop:
         with patch("quadlink.daemon.StreamProcessor") as MockProcessor:
             with patch("quadlink.daemon.QuadBuilder") as MockBuilder:
                 with patch("quadlink.daemon.QuadStreamClient") as MockClient:
-                    mock_processor = MagicMock()
+                    mock_processor = MagicMock(filter_time=0.0)
                     mock_processor.process_stream_groups = AsyncMock(
                         return_value=[make_stream("streamer1")]
                     )
@@ -472,15 +1081,15 @@ class TestDaemonMainLoop:
                     mock_builder.build_quad.return_value = quad
                     MockBuilder.return_value = mock_builder
 
-                    mock_client = AsyncMock()
-                    mock_client.login = AsyncMock(return_value=True)
+                    mock_client = mock_quadstream_client(login=True)
                     mock_client.update_quad = AsyncMock(return_value=True)
                     MockClient.return_value = mock_client
 
                     with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
                         await daemon._main_loop()
-                        # should sleep for interval after successful update
-                        mock_sleep.assert_called_with(45)
+                        # should sleep until the next cycle start after successful update
+                        first_delay = mock_sleep.await_args_list[0].args[0]
+                        assert first_delay == pytest.approx(45, abs=1)
 
     @pytest.mark.asyncio
     async def test_main_loop_cancelled_error(self, daemon_with_mocks, mock_config):
@@ -513,7 +1122,62 @@ class TestDaemonMainLoop:
 
         with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             await daemon._main_loop()
-            mock_sleep.assert_called_with(30)
+            assert mock_sleep.await_args_list[0] == call(30)
+
+    @pytest.mark.asyncio
+    async def test_retry_delay_configurable_and_capped(self, daemon_with_mocks):
+        """Retry delays should follow retry_delay and stop at max_retry_delay."""
+        daemon, mock_loader, mock_health = daemon_with_mocks
+        daemon.running = True
+        daemon.retry_delay = 5
+        daemon.max_retry_delay = 15
+
+        call_count = 0
+
+        async def mock_load():
+            nonlocal call_count
+            call_count += 1
+            if call_count >= 4:
+                daemon.running = False
+            return None
+
+        mock_loader.load_or_cache = mock_load
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await daemon._main_loop()
+
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [5, 10, 15, 15]
+
+    @pytest.mark.asyncio
+    async def test_successful_cycle_resets_retry_delay(self, daemon_with_mocks, mock_config):
+        """A successful cycle should reset the failure count."""
+        daemon, mock_loader, mock_health = daemon_with_mocks
+        daemon.running = True
+        daemon.failures = 3
+        daemon.processor = MagicMock(filter_time=0.0)
+        daemon.processor.process_stream_groups = AsyncMock(return_value=[])
+        daemon.quad_builder = MagicMock()
+        daemon.quadstream_client = mock_quadstream_client()
+        daemon.config = mock_config
+
+        async def stop(seconds):
+            daemon.running = False
+
+        mock_loader.load_or_cache = AsyncMock(return_value=mock_config)
+
+        with patch("asyncio.sleep", new_callable=AsyncMock, side_effect=stop):
+            await daemon._main_loop()
+
+        assert daemon.failures == 0
+
+    def test_interval_updates_scheduler(self):
+        """Changing the interval should reschedule subsequent cycles."""
+        with patch("quadlink.daemon.ConfigLoader"):
+            daemon = Daemon(interval=30)
+
+            daemon.interval = 45
+
+            assert daemon.scheduler.interval == 45
 
 
 class TestRunDaemon:
@@ -545,32 +1209,14 @@ class TestRunDaemon:
                 )
 
                 MockDaemon.assert_called_once_with(
-                    interval=60, one_shot=True, enable_health_server=False, config_path=None
+                    interval=60,
+                    one_shot=True,
+                    enable_health_server=False,
+                    config_path=None,
+                    retry_delay=30,
+                    max_retry_delay=300,
                 )
 
-    @pytest.mark.asyncio
-    async def test_run_daemon_stops_health_server_on_exit(self):
-        """run_daemon should stop health server on exit."""
-        with patch("quadlink.daemon.Daemon") as MockDaemon:
-            mock_daemon = MagicMock()
-            mock_health = MagicMock()
-            mock_daemon.health_server = mock_health
-            mock_daemon.running = True
-            MockDaemon.return_value = mock_daemon
-
-            with patch("asyncio.get_event_loop") as mock_get_loop:
-                mock_loop = MagicMock()
-                mock_get_loop.return_value = mock_loop
-
-                async def mock_start():
-                    raise asyncio.CancelledError()
-
-                mock_daemon.start = mock_start
-
-                await run_daemon()
-
-                mock_health.stop.assert_called()
-
     @pytest.mark.asyncio
     async def test_run_daemon_sets_up_signal_handlers(self):
         """run_daemon should set up SIGINT and SIGTERM handlers."""
@@ -607,8 +1253,7 @@ class TestRunDaemon:
 
         with patch("quadlink.daemon.Daemon") as MockDaemon:
             mock_daemon = MagicMock()
-            mock_health = MagicMock()
-            mock_daemon.health_server = mock_health
+            mock_daemon.health_server = MagicMock()
             mock_daemon.running = True
             MockDaemon.return_value = mock_daemon
 
@@ -640,4 +1285,3 @@ class TestRunDaemon:
 
                 # verify handler effects
                 assert mock_daemon.running is False
-                mock_health.stop.assert_called()
@@ -1,14 +1,15 @@
 """Tests for health check server."""
 
+import asyncio
 import socket
-import urllib.error
-import urllib.request
-from io import BytesIO
-from unittest.mock import MagicMock, patch
+from collections.abc import AsyncIterator
+from unittest.mock import patch
 
+import httpx
 import pytest
 
-from quadlink.health import HealthCheckHandler, HealthServer
+from quadlink.health import METRICS_CONTENT_TYPE, READY_INTERVALS, HealthServer
+from quadlink.metrics import Metrics
 
 
 def get_free_port() -> int:
@@ -18,272 +19,181 @@ def get_free_port() -> int:
         return s.getsockname()[1]
 
 
-class TestHealthCheckHandler:
-    """Tests for HealthCheckHandler."""
+@pytest.fixture
+async def server() -> AsyncIterator[HealthServer]:
+    """Run a health server with metrics on a free local port."""
+    server = HealthServer(host="127.0.0.1", port=get_free_port(), metrics=Metrics())
+    await server.start()
+    yield server
+    await server.stop()
 
-    @pytest.fixture(autouse=True)
-    def reset_config_loaded(self):
-        """Reset config_loaded between tests."""
-        HealthCheckHandler.config_loaded = False
-        yield
-        HealthCheckHandler.config_loaded = False
 
-    def test_log_message_suppressed(self):
-        """log_message should not produce output."""
-        # create a mock handler without a real socket
-        handler = MagicMock(spec=HealthCheckHandler)
-        # call the actual log_message method
-        HealthCheckHandler.log_message(handler, "%s", "test message")
-        # no exception means it worked (it's a no-op)
+@pytest.fixture
+async def client(server: HealthServer) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP client pointed at the health server."""
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+        yield client
 
-    def test_do_get_health(self):
-        """GET /health should call _health_check."""
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.path = "/health"
-        handler.wfile = BytesIO()
 
-        HealthCheckHandler.do_GET(handler)
+class TestHealthServer:
+    """Tests for HealthServer."""
 
-        handler._health_check.assert_called_once()
-
-    def test_do_get_ready(self):
-        """GET /ready should call _readiness_check."""
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.path = "/ready"
-        handler.wfile = BytesIO()
-
-        HealthCheckHandler.do_GET(handler)
-
-        handler._readiness_check.assert_called_once()
-
-    def test_do_get_unknown_path(self):
-        """GET unknown path should return 404."""
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.path = "/unknown"
-
-        HealthCheckHandler.do_GET(handler)
-
-        handler.send_response.assert_called_once_with(404)
-        handler.end_headers.assert_called_once()
-
-    def test_health_check_returns_ok(self):
-        """_health_check should return 200 OK."""
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.wfile = BytesIO()
-
-        HealthCheckHandler._health_check(handler)
-
-        handler.send_response.assert_called_once_with(200)
-        handler.send_header.assert_called_once_with("Content-Type", "text/plain")
-        handler.end_headers.assert_called_once()
-        assert handler.wfile.getvalue() == b"OK"
-
-    def test_readiness_check_ready(self):
-        """_readiness_check should return 200 READY when config loaded."""
-        HealthCheckHandler.config_loaded = True
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.wfile = BytesIO()
-
-        HealthCheckHandler._readiness_check(handler)
-
-        handler.send_response.assert_called_once_with(200)
-        handler.send_header.assert_called_once_with("Content-Type", "text/plain")
-        handler.end_headers.assert_called_once()
-        assert handler.wfile.getvalue() == b"READY"
-
-    def test_readiness_check_not_ready(self):
-        """_readiness_check should return 503 NOT READY when config not loaded."""
-        HealthCheckHandler.config_loaded = False
-        handler = MagicMock(spec=HealthCheckHandler)
-        handler.wfile = BytesIO()
-
-        HealthCheckHandler._readiness_check(handler)
-
-        handler.send_response.assert_called_once_with(503)
-        handler.send_header.assert_called_once_with("Content-Type", "text/plain")
-        handler.end_headers.assert_called_once()
-        assert handler.wfile.getvalue() == b"NOT READY"
-
-
-class TestHealthServerInit:
-    """Tests for HealthServer initialization."""
-
-    def test_default_initialization(self):
-        """Should initialize with default host and port."""
+    def test_default_values(self):
+        """HealthServer should have correct defaults."""
         server = HealthServer()
-
         assert server.host == "0.0.0.0"
         assert server.port == 8080
-        assert server.server is None
-        assert server.thread is None
-
-    def test_custom_host_port(self):
-        """Should accept custom host and port."""
-        server = HealthServer(host="127.0.0.1", port=9090)
+        assert server.metrics is None
+        assert server.last_success is None
+        assert server.runner is None
 
+    def test_custom_values(self):
+        """HealthServer should accept custom host and port."""
+        server = HealthServer(host="127.0.0.1", port=9000)
         assert server.host == "127.0.0.1"
-        assert server.port == 9090
-
+        assert server.port == 9000
 
-class TestHealthServerStartStop:
-    """Tests for HealthServer start/stop."""
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        """start() should listen on the port and stop() should close it."""
+        server = HealthServer(host="127.0.0.1", port=get_free_port())
 
-    @pytest.fixture(autouse=True)
-    def reset_config_loaded(self):
-        """Reset config_loaded between tests."""
-        HealthCheckHandler.config_loaded = False
-        yield
-        HealthCheckHandler.config_loaded = False
+        await server.start()
+        assert server.runner is not None
 
-    def test_start_creates_server(self):
-        """start() should create and start server thread."""
-        port = get_free_port()
-        server = HealthServer(host="127.0.0.1", port=port)
+        await server.stop()
+        assert server.runner is None
+        with pytest.raises(httpx.ConnectError):
+            async with httpx.AsyncClient() as client:
+                await client.get(f"http://127.0.0.1:{server.port}/health")
 
-        try:
-            server.start()
+    @pytest.mark.asyncio
+    async def test_start_twice_warns(self, server):
+        """start() should warn and keep the running server if already started."""
+        runner = server.runner
 
-            assert server.server is not None
-            assert server.thread is not None
-            assert server.thread.is_alive()
-        finally:
-            server.stop()
+        with patch("quadlink.health.logger") as mock_logger:
+            await server.start()
 
-    def test_start_already_running(self):
-        """start() when already running should log warning."""
-        port = get_free_port()
-        server = HealthServer(host="127.0.0.1", port=port)
+        mock_logger.warning.assert_called_once()
+        assert server.runner is runner
 
-        try:
-            server.start()
+    @pytest.mark.asyncio
+    async def test_start_port_in_use(self, server):
+        """start() should raise and stay stopped if the port is taken."""
+        other = HealthServer(host="127.0.0.1", port=server.port)
 
-            with patch("quadlink.health.logger") as mock_logger:
-                server.start()  # try to start again
-                mock_logger.warning.assert_called_once_with("health server already running")
+        with pytest.raises(OSError):
+            await other.start()
 
-        finally:
-            server.stop()
+        assert other.runner is None
 
-    def test_stop_when_not_running(self):
-        """stop() when not running should do nothing."""
+    @pytest.mark.asyncio
+    async def test_stop_when_not_running(self):
+        """stop() should do nothing when not running."""
         server = HealthServer()
-        # should not raise
-        server.stop()
-        assert server.server is None
-
-    def test_stop_shuts_down_server(self):
-        """stop() should shut down server and thread."""
-        port = get_free_port()
-        server = HealthServer(host="127.0.0.1", port=port)
-
-        server.start()
-        assert server.thread.is_alive()
+        await server.stop()
+        assert server.runner is None
 
-        server.stop()
 
-        assert server.server is None
-        assert server.thread is None
+class TestReadiness:
+    """Tests for readiness tracking."""
 
+    def test_not_ready_initially(self):
+        """Server should not be ready before a successful cycle."""
+        assert HealthServer().is_ready() is False
 
-class TestHealthServerReadiness:
-    """Tests for HealthServer readiness methods."""
-
-    @pytest.fixture(autouse=True)
-    def reset_config_loaded(self):
-        """Reset config_loaded between tests."""
-        HealthCheckHandler.config_loaded = False
-        yield
-        HealthCheckHandler.config_loaded = False
-
-    def test_mark_ready(self):
-        """mark_ready() should set config_loaded to True."""
+    def test_ready_after_success(self):
+        """Server should be ready after a successful cycle."""
         server = HealthServer()
+        server.record_success(30)
+        assert server.ready_for == 30 * READY_INTERVALS
+        assert server.is_ready() is True
 
-        assert HealthCheckHandler.config_loaded is False
-        server.mark_ready()
-        assert HealthCheckHandler.config_loaded is True
-
-    def test_mark_not_ready(self):
-        """mark_not_ready() should set config_loaded to False."""
-        HealthCheckHandler.config_loaded = True
+    def test_not_ready_when_stale(self):
+        """Server should drop out of readiness once the last success is too old."""
         server = HealthServer()
+        with patch("quadlink.health.time.monotonic", return_value=1000.0):
+            server.record_success(30)
+        with patch("quadlink.health.time.monotonic", return_value=1000.0 + 90):
+            assert server.is_ready() is True
+        with patch("quadlink.health.time.monotonic", return_value=1000.0 + 91):
+            assert server.is_ready() is False
+
+    def test_slow_cycle_widens_window(self):
+        """A cycle slower than the interval should not make readiness flap."""
+        server = HealthServer()
+        with patch("quadlink.health.time.monotonic", return_value=1000.0):
+            server.record_success(30, duration=60)
 
-        server.mark_not_ready()
-        assert HealthCheckHandler.config_loaded is False
-
-
-class TestHealthServerIntegration:
-    """Integration tests with actual HTTP requests."""
+        assert server.ready_for == (30 + 60) * READY_INTERVALS
+        # the next slow cycle finishes about one interval plus one duration later
+        with patch("quadlink.health.time.monotonic", return_value=1000.0 + 30 + 60):
+            assert server.is_ready() is True
+        with patch("quadlink.health.time.monotonic", return_value=1000.0 + 271):
+            assert server.is_ready() is False
 
-    @pytest.fixture(autouse=True)
-    def reset_config_loaded(self):
-        """Reset config_loaded between tests."""
-        HealthCheckHandler.config_loaded = False
-        yield
-        HealthCheckHandler.config_loaded = False
 
-    @pytest.fixture
-    def running_server(self):
-        """Create a running health server."""
-        port = get_free_port()
-        server = HealthServer(host="127.0.0.1", port=port)
-        server.start()
-        yield server, port
-        server.stop()
+class TestEndpoints:
+    """Tests for the HTTP endpoints."""
 
-    def test_health_endpoint(self, running_server):
+    @pytest.mark.asyncio
+    async def test_health(self, client):
         """GET /health should return 200 OK."""
-        server, port = running_server
-
-        response = urllib.request.urlopen(f"http://127.0.0.1:{port}/health")
+        response = await client.get("/health")
+        assert response.status_code == 200
+        assert response.text == "OK"
 
-        assert response.status == 200
-        assert response.read() == b"OK"
+    @pytest.mark.asyncio
+    async def test_ready_before_success(self, client):
+        """GET /ready should return 503 before a successful cycle."""
+        response = await client.get("/ready")
+        assert response.status_code == 503
+        assert response.text == "NOT READY"
 
-    def test_ready_endpoint_not_ready(self, running_server):
-        """GET /ready should return 503 when not ready."""
-        server, port = running_server
+    @pytest.mark.asyncio
+    async def test_ready_after_success(self, server, client):
+        """GET /ready should return 200 after a successful cycle."""
+        server.record_success(30)
 
-        with pytest.raises(urllib.error.HTTPError) as exc_info:
-            urllib.request.urlopen(f"http://127.0.0.1:{port}/ready")
+        response = await client.get("/ready")
 
-        assert exc_info.value.code == 503
+        assert response.status_code == 200
+        assert response.text == "READY"
 
-    def test_ready_endpoint_ready(self, running_server):
-        """GET /ready should return 200 when ready."""
-        server, port = running_server
-        server.mark_ready()
+    @pytest.mark.asyncio
+    async def test_metrics(self, server, client):
+        """GET /metrics should return the metrics in the Prometheus text format."""
+        server.metrics.inc("quadlink_cycles_total", "Completed cycles.")
 
-        response = urllib.request.urlopen(f"http://127.0.0.1:{port}/ready")
+        response = await client.get("/metrics")
 
-        assert response.status == 200
-        assert response.read() == b"READY"
+        assert response.status_code == 200
+        assert response.headers["content-type"] == METRICS_CONTENT_TYPE
+        assert "quadlink_cycles_total 1\n" in response.text
 
-    def test_unknown_endpoint(self, running_server):
-        """GET unknown path should return 404."""
-        server, port = running_server
+    @pytest.mark.asyncio
+    async def test_metrics_without_registry(self, server, client):
+        """GET /metrics should return 404 when no metrics are configured."""
+        server.metrics = None
 
-        with pytest.raises(urllib.error.HTTPError) as exc_info:
-            urllib.request.urlopen(f"http://127.0.0.1:{port}/unknown")
+        response = await client.get("/metrics")
 
-        assert exc_info.value.code == 404
+        assert response.status_code == 404
 
-    def test_ready_toggle(self, running_server):
-        """Should be able to toggle ready state."""
-        server, port = running_server
+    @pytest.mark.asyncio
+    async def test_unknown_path(self, client):
+        """GET of an unknown path should return 404."""
+        response = await client.get("/unknown")
+        assert response.status_code == 404
 
-        # initially not ready
-        with pytest.raises(urllib.error.HTTPError) as exc_info:
-            urllib.request.urlopen(f"http://127.0.0.1:{port}/ready")
-        assert exc_info.value.code == 503
+    @pytest.mark.asyncio
+    async def test_concurrent_probes(self, server, client):
+        """Concurrent probes should all be answered."""
+        server.record_success(30)
 
-        # mark ready
-        server.mark_ready()
-        response = urllib.request.urlopen(f"http://127.0.0.1:{port}/ready")
-        assert response.status == 200
+        responses = await asyncio.gather(
+            *(client.get(path) for path in ("/health", "/ready", "/metrics") * 10)
+        )
 
-        # mark not ready again
-        server.mark_not_ready()
-        with pytest.raises(urllib.error.HTTPError) as exc_info:
-            urllib.request.urlopen(f"http://127.0.0.1:{port}/ready")
-        assert exc_info.value.code == 503
+        assert [r.status_code for r in responses] == [200] * 30
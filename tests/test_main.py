@@ -59,6 +59,8 @@ class TestParseArgs:
 
         assert args.one_shot is False
         assert args.interval == 30
+        assert args.retry_delay == 30
+        assert args.max_retry_delay == 300
 
     def test_parse_args_one_shot(self):
         """Should parse --one-shot flag."""
@@ -78,6 +80,16 @@ class TestParseArgs:
 
         assert args.interval == 60
 
+    def test_parse_args_retry_delay(self):
+        """Should parse --retry-delay and --max-retry-delay arguments."""
+        from quadlink.__main__ import parse_args
+
+        with patch("sys.argv", ["quadlink", "--retry-delay", "5", "--max-retry-delay", "120"]):
+            args = parse_args()
+
+        assert args.retry_delay == 5
+        assert args.max_retry_delay == 120
+
     def test_parse_args_combined(self):
         """Should parse multiple arguments."""
         from quadlink.__main__ import parse_args
@@ -118,6 +130,8 @@ class TestMain:
             mock_args.one_shot = True
             mock_args.interval = 60
             mock_args.config = "/path/to/config.yaml"
+            mock_args.retry_delay = 10
+            mock_args.max_retry_delay = 120
             mock_parse.return_value = mock_args
 
             with patch("quadlink.__main__.setup_logging"):
@@ -131,6 +145,8 @@ class TestMain:
                                 interval=60,
                                 enable_health_server=False,
                                 config_path="/path/to/config.yaml",
+                                retry_delay=10,
+                                max_retry_delay=120,
                             )
 
     def test_main_handles_keyboard_interrupt(self):
@@ -0,0 +1,75 @@
+"""Tests for in-process metrics."""
+
+from quadlink.metrics import Histogram, Metrics
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_render_cumulative_buckets(self):
+        """Buckets should count observations at or below their bound, cumulatively."""
+        histogram = Histogram("test_seconds", "Test.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.render() == [
+            "# HELP test_seconds Test.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{le="0.1"} 2',
+            'test_seconds_bucket{le="1"} 3',
+            'test_seconds_bucket{le="+Inf"} 4',
+            "test_seconds_sum 5.65",
+            "test_seconds_count 4",
+        ]
+
+    def test_series_per_label_value(self):
+        """Each label value should get its own series."""
+        histogram = Histogram("test_seconds", "Test.", labels=("outcome",), buckets=(1.0,))
+        histogram.observe(0.5, outcome="ok")
+        histogram.observe(0.5, outcome="ok")
+        histogram.observe(2.0, outcome="error")
+
+        assert histogram.count(outcome="ok") == 2
+        assert histogram.count(outcome="error") == 1
+        assert histogram.count(outcome="missing") == 0
+        assert 'test_seconds_bucket{outcome="error",le="1"} 0' in histogram.render()
+        assert 'test_seconds_count{outcome="ok"} 2' in histogram.render()
+
+
+class TestMetrics:
+    """Tests for the Metrics registry."""
+
+    def test_inc_counter(self):
+        """inc() should add to a counter per label set."""
+        metrics = Metrics()
+        metrics.inc("test_total", "Test.")
+        metrics.inc("test_total", "Test.", 2)
+        metrics.inc("test_total", "Test.", result="failed")
+
+        assert metrics.value("test_total") == 3
+        assert metrics.value("test_total", result="failed") == 1
+        assert metrics.value("missing_total") is None
+
+    def test_render_values(self):
+        """Counters and gauges should render with HELP, TYPE, and escaped labels."""
+        metrics = Metrics()
+        metrics.set("test_hits_total", "Hits.", 7, kind="counter", cache="filter")
+        metrics.set("test_ratio", "Ratio.", 0.25, cache='say "hi"')
+
+        text = metrics.render()
+
+        assert "# TYPE test_hits_total counter\n" in text
+        assert 'test_hits_total{cache="filter"} 7\n' in text
+        assert "# TYPE test_ratio gauge\n" in text
+        assert 'test_ratio{cache="say \\"hi\\""} 0.25\n' in text
+        assert text.endswith("\n")
+
+    def test_render_includes_histograms(self):
+        """Histograms should be rendered after counters and gauges."""
+        metrics = Metrics()
+        metrics.phase_seconds.observe(0.2, phase="fetch")
+
+        text = metrics.render()
+
+        assert "# TYPE quadlink_cycle_phase_seconds histogram" in text
+        assert 'quadlink_cycle_phase_seconds_count{phase="fetch"} 1' in text
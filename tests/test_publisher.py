@@ -0,0 +1,183 @@
+"""Tests for background quad publishing."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from quadlink.publisher import QuadPublisher
+from quadlink.types import Quad
+
+
+def make_quad(name: str) -> Quad:
+    """Helper to create a quad with one stream."""
+    return Quad(stream1=f"https://twitch.tv/{name}")
+
+
+class TestSubmit:
+    """Tests for pushing submitted quads."""
+
+    @pytest.mark.asyncio
+    async def test_pushes_submitted_quad(self):
+        """A submitted quad should be pushed and reported."""
+        push = AsyncMock(return_value=True)
+        on_published = MagicMock()
+        publisher = QuadPublisher(push, on_published=on_published)
+        quad = make_quad("a")
+
+        publisher.submit(quad)
+
+        assert await publisher.flush(timeout=1) is True
+        push.assert_awaited_once_with(quad)
+        on_published.assert_called_once_with(quad)
+        assert publisher.pushed == 1
+        await publisher.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_push(self):
+        """submit() should return while the push is still in flight."""
+        released = asyncio.Event()
+
+        async def slow_push(quad):
+            await released.wait()
+            return True
+
+        publisher = QuadPublisher(slow_push)
+        publisher.submit(make_quad("a"))
+        await asyncio.sleep(0)
+
+        assert publisher.pushed == 0
+        released.set()
+        assert await publisher.flush(timeout=1) is True
+        assert publisher.pushed == 1
+        await publisher.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_quads_dropped(self):
+        """Quads submitted during a push should collapse to the latest."""
+        released = asyncio.Event()
+        pushed = []
+
+        async def slow_push(quad):
+            pushed.append(quad)
+            await released.wait()
+            return True
+
+        publisher = QuadPublisher(slow_push)
+        publisher.submit(make_quad("a"))
+        await asyncio.sleep(0)  # push of "a" starts
+        publisher.submit(make_quad("b"))
+        publisher.submit(make_quad("c"))
+
+        released.set()
+        await publisher.flush(timeout=1)
+
+        assert pushed == [make_quad("a"), make_quad("c")]
+        assert publisher.superseded == 1
+        await publisher.close()
+
+    @pytest.mark.asyncio
+    async def test_flush_when_idle(self):
+        """flush() should return immediately when nothing was submitted."""
+        publisher = QuadPublisher(AsyncMock(return_value=True))
+
+        assert await publisher.flush(timeout=0.01) is True
+
+
+class TestRetry:
+    """Tests for retrying failed pushes."""
+
+    @pytest.mark.asyncio
+    async def test_failed_push_retried(self):
+        """A failed push should be retried until it succeeds."""
+        push = AsyncMock(side_effect=[False, False, True])
+        publisher = QuadPublisher(push, backoff=0.001, max_backoff=0.001)
+        quad = make_quad("a")
+
+        publisher.submit(quad)
+
+        assert await publisher.flush(timeout=1) is True
+        assert push.await_count == 3
+        assert publisher.failed == 2
+        assert publisher.pushed == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_treated_as_failure(self):
+        """An exception from push should be retried like a failed push."""
+        push = AsyncMock(side_effect=[RuntimeError("boom"), True])
+        publisher = QuadPublisher(push, backoff=0.001, max_backoff=0.001)
+
+        publisher.submit(make_quad("a"))
+
+        assert await publisher.flush(timeout=1) is True
+        assert publisher.failed == 1
+        assert publisher.pushed == 1
+
+    @pytest.mark.asyncio
+    async def test_newer_quad_replaces_failed_one(self):
+        """A quad submitted during backoff should be pushed instead of the failed one."""
+        pushed = []
+
+        async def push(quad):
+            pushed.append(quad)
+            return len(pushed) > 1
+
+        publisher = QuadPublisher(push, backoff=60, max_backoff=60)
+        publisher.submit(make_quad("a"))
+        await asyncio.sleep(0.01)  # first push fails, publisher waits out the backoff
+
+        publisher.submit(make_quad("b"))
+
+        assert await publisher.flush(timeout=1) is True
+        assert pushed == [make_quad("a"), make_quad("b")]
+        assert publisher.superseded == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_times_out_while_failing(self):
+        """flush() should give up if pushes keep failing."""
+        publisher = QuadPublisher(AsyncMock(return_value=False), backoff=0.001, max_backoff=0.001)
+
+        publisher.submit(make_quad("a"))
+
+        assert await publisher.flush(timeout=0.05) is False
+        await publisher.close()
+
+    def test_backoff_is_capped_with_jitter(self):
+        """Backoff should double per attempt, stay under max_backoff, and be jittered."""
+        publisher = QuadPublisher(AsyncMock(), backoff=1.0, max_backoff=5.0)
+
+        with patch("quadlink.publisher.random.uniform", side_effect=lambda lo, hi: hi):
+            assert [publisher._backoff(n) for n in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+        assert all(0 <= publisher._backoff(3) <= 5.0 for _ in range(50))
+
+
+class TestClose:
+    """Tests for stopping the publisher."""
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_pending_push(self):
+        """close() should stop the background task mid-push."""
+
+        async def hang(quad):
+            await asyncio.Event().wait()
+            return True
+
+        publisher = QuadPublisher(hang)
+        publisher.submit(make_quad("a"))
+        await asyncio.sleep(0)
+        task = publisher._task
+
+        await publisher.close()
+
+        assert task is not None and task.cancelled()
+        assert publisher._task is None
+
+    @pytest.mark.asyncio
+    async def test_close_without_task(self):
+        """close() should be a no-op before anything was submitted."""
+        publisher = QuadPublisher(AsyncMock())
+
+        await publisher.close()
+
+        assert publisher._task is None
@@ -141,6 +141,8 @@ class TestStabilityBonus:
         # positions should be preserved despite priority change
         assert quad1.stream1 == quad2.stream1
         assert quad1.stream2 == quad2.stream2
+        assert quad2.authors == quad1.authors
+        assert sorted(quad2.authors) == ["", "", "streamer1", "streamer2"]
 
 
 class TestDiversityBonus:
@@ -374,3 +376,89 @@ class TestComplexScenario:
         assert "streamer1" in authors
         assert "streamer2" in authors
         assert "streamer3" in authors
+
+
+class TestIsDecided:
+    """Test bound-based early termination check."""
+
+    def test_fewer_than_four_authors(self, builder):
+        """Should not be decided with fewer than 4 authors."""
+        candidates = [make_stream(f"s{i}", "Games", 999) for i in range(3)]
+        assert builder.is_decided(candidates, 100) is False
+
+    def test_decided_when_lower_level_cannot_catch_up(self, builder):
+        """Top 4 far above the next level should be decided."""
+        candidates = [make_stream(f"s{i}", "Games", 999) for i in range(4)]
+        assert builder.is_decided(candidates, 180) is True
+
+    def test_not_decided_when_bonuses_could_overtake(self, builder):
+        """Next level within bonus reach should not be decided."""
+        # floor 999 - 25 - 10 = 964, ceiling 950 + 25 + 10 = 985
+        candidates = [make_stream(f"s{i}", "Games", 999) for i in range(4)]
+        assert builder.is_decided(candidates, 950) is False
+
+    def test_not_decided_when_fetched_candidates_tie(self, builder):
+        """A fifth fetched author within reach of the 4th should not be decided."""
+        candidates = [make_stream(f"s{i}", "Games", 999) for i in range(5)]
+        assert builder.is_decided(candidates, 100) is False
+
+    def test_existing_streams_use_stability_bonus(self, builder):
+        """Existing streams should count their certain stability bonus."""
+        builder.previous_positions = {f"s{i}": i for i in range(4)}
+        # floor 940 + 30 = 970, ceiling 900 + 30 = 930
+        candidates = [make_stream(f"s{i}", "Games", 940) for i in range(4)]
+        assert builder.is_decided(candidates, 900) is True
+
+    def test_negative_bonuses_bound_by_magnitude(self):
+        """A negative diversity bonus can lower new streams and raise saturated ones."""
+        config = Config(
+            credentials=Credentials(username="test", secret="test"),
+            priorities={},
+            diversity_bonus=-25,
+            stability_bonus=0,
+            category_continuity_bonus=0,
+        )
+        builder = QuadBuilder(config)
+        # new categories score 999 - 25 = 974, a saturated lower stream up to 990 + 25
+        candidates = [make_stream(f"s{i}", f"Category{i}", 999) for i in range(4)]
+        assert builder.is_decided(candidates, 990) is False
+        assert builder.is_decided(candidates, 940) is True
+
+
+class TestSnapshot:
+    """Test saving and resuming quad history."""
+
+    def test_restored_builder_keeps_quad(self, builder, minimal_config):
+        """A builder restored from a snapshot should not reshuffle an unchanged quad."""
+        candidates = [make_stream(f"s{i}", "Games", 100) for i in range(4)]
+        quad = builder.build_quad(candidates)
+
+        restored = QuadBuilder(minimal_config)
+        restored.restore(builder.snapshot())
+
+        assert restored.build_quad(list(reversed(candidates))) == quad
+        assert restored.quad_changed is False
+
+    def test_empty_snapshot(self, minimal_config):
+        """A builder that has not built a quad yet should round-trip empty."""
+        restored = QuadBuilder(minimal_config)
+        restored.restore(QuadBuilder(minimal_config).snapshot())
+
+        assert restored.previous_quad is None
+        assert restored.previous_positions == {}
+
+
+class TestApplyConfig:
+    """Test hot-applying a reloaded config."""
+
+    def test_keeps_previous_quad_state(self, builder, minimal_config):
+        """Reloading config should keep positions and use the new bonuses."""
+        builder.build_quad([make_stream(f"s{i}", "Games", 100) for i in range(4)])
+        positions = dict(builder.previous_positions)
+
+        new_config = minimal_config.model_copy(update={"stability_bonus": 80})
+        builder.apply_config(new_config)
+
+        assert builder.config is new_config
+        assert builder.previous_positions == positions
+        assert builder._max_bonus() == 80
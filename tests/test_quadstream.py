@@ -149,6 +149,191 @@ class TestLogin:
         assert result is False
 
 
+class TestPooledClient:
+    """Tests for the shared HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_requests(self):
+        """Login and updates should share one HTTP client."""
+        client = QuadStreamClient("user", "secret")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"short_id": "abc123"}
+
+        with patch("httpx.AsyncClient") as MockClient:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = mock_response
+            MockClient.return_value = mock_client
+
+            assert await client.login() is True
+            client._cookie_jar.set_cookie(_make_cookie("session", "test"))
+            assert await client.update_quad(Quad(stream1="https://stream1")) is True
+            assert await client.update_quad(Quad(stream1="https://stream2")) is True
+
+        MockClient.assert_called_once()
+        assert mock_client.post.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        """close() should close the HTTP client and allow a new one later."""
+        client = QuadStreamClient("user", "secret")
+        http_client = client._get_client()
+
+        await client.close()
+
+        assert http_client.is_closed
+        assert client._client is None
+        assert client._get_client() is not http_client
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_without_client(self):
+        """close() should be a no-op before any request."""
+        client = QuadStreamClient("user", "secret")
+
+        await client.close()
+
+        assert client._client is None
+
+    @pytest.mark.asyncio
+    async def test_login_replaces_session_cookies_in_place(self):
+        """Re-login should swap the session cookie in the shared jar."""
+        sessions = iter(["first", "second"])
+        seen_cookies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_cookies.append(request.headers.get("cookie"))
+            if request.url.path.endswith("/login"):
+                return httpx.Response(
+                    200,
+                    json={"short_id": "abc123"},
+                    headers={"set-cookie": f"session={next(sessions)}; Path=/"},
+                )
+            return httpx.Response(200)
+
+        client = QuadStreamClient("user", "secret")
+        client._client = httpx.AsyncClient(
+            cookies=client._cookie_jar, transport=httpx.MockTransport(handler)
+        )
+
+        assert await client.login() is True
+        jar = client.cookies.jar
+        assert await client.update_quad(Quad(stream1="https://stream1")) is True
+        assert await client.login() is True
+        assert await client.update_quad(Quad(stream1="https://stream2")) is True
+        await client.close()
+
+        assert client.cookies.jar is jar
+        assert [cookie.value for cookie in jar] == ["second"]
+        assert seen_cookies == [None, "session=first", None, "session=second"]
+
+
+class TestPushDigest:
+    """Tests for skipping pushes identical to the last one."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a logged-in client with a mock transport counting requests."""
+        client = QuadStreamClient("user", "secret")
+        client.requests = []
+        short_ids = iter(["abc123", "abc123", "other"])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            client.requests.append(request.url.path)
+            if request.url.path.endswith("/login"):
+                return httpx.Response(
+                    200,
+                    json={"short_id": next(short_ids)},
+                    headers={"set-cookie": "session=s; Path=/"},
+                )
+            if b"fail" in request.content:
+                return httpx.Response(500)
+            return httpx.Response(200)
+
+        client._client = httpx.AsyncClient(
+            cookies=client._cookie_jar, transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    @pytest.mark.asyncio
+    async def test_identical_quad_skipped(self, client):
+        """Pushing the same quad twice should only send it once."""
+        await client.login()
+        quad = Quad(stream1="https://stream1", authors=("streamer1", "", "", ""))
+
+        assert await client.update_quad(quad) is True
+        assert await client.update_quad(Quad(stream1="https://stream1")) is True
+        await client.close()
+
+        assert client.requests.count("/stream/api/stream/abc123/update") == 1
+        assert client.is_current(quad)
+        assert client.pushed_authors == quad.authors
+
+    @pytest.mark.asyncio
+    async def test_changed_url_pushed(self, client):
+        """Any difference in the quad should be pushed."""
+        await client.login()
+        await client.update_quad(Quad(stream1="https://stream1.m3u8?token=a"))
+
+        assert await client.update_quad(Quad(stream1="https://stream1.m3u8?token=b")) is True
+        await client.close()
+
+        assert client.requests.count("/stream/api/stream/abc123/update") == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_push_not_remembered(self, client):
+        """A failed push should not count as the last push."""
+        await client.login()
+
+        assert await client.update_quad(Quad(stream1="https://fail")) is False
+        await client.close()
+
+        assert client.pushed_digest is None
+        assert client.pushed_authors is None
+        assert client.pushed_age() == float("inf")
+
+    @pytest.mark.asyncio
+    async def test_relogin_same_stream_keeps_digest(self, client):
+        """A re-login to the same stream should still skip the pushed quad."""
+        await client.login()
+        quad = Quad(stream1="https://stream1")
+        await client.update_quad(quad)
+
+        await client.login()
+        assert client.is_current(quad)
+        await client.login()  # a different short_id, e.g. after a credentials change
+        await client.close()
+
+        assert client.pushed_digest is None
+
+    @pytest.mark.asyncio
+    async def test_restored_push_skipped_after_login(self, client):
+        """A push restored from a snapshot should be skipped for the same stream."""
+        quad = Quad(stream1="https://stream1")
+        client.restore({"short_id": "abc123", "digest": QuadStreamClient.digest(quad)})
+
+        await client.login()
+        assert await client.update_quad(quad) is True
+        await client.close()
+
+        assert client.requests == ["/stream/api/login"]
+
+    def test_snapshot_round_trip(self):
+        """snapshot() and restore() should carry short_id, digest, and push time."""
+        client = QuadStreamClient("user", "secret")
+        client.short_id = "abc123"
+        client.pushed_digest = QuadStreamClient.digest(Quad(stream1="https://stream1"))
+        client.pushed_authors = ("streamer1", "", "", "")
+        client.pushed_at = 1000.0
+
+        restored = QuadStreamClient("user", "secret")
+        restored.restore(client.snapshot())
+
+        assert restored.snapshot() == client.snapshot()
+        assert restored.cookies is None  # still needs to log in
+
+
 def _make_cookie(name: str, value: str, expires: int | None = None) -> Cookie:
     """Create a cookie for testing."""
     return Cookie(
@@ -430,6 +615,7 @@ class TestUpdateQuad:
 
         assert result is True
         mock_login.assert_called_once()
+        assert client.renewals == 1
 
     @pytest.mark.asyncio
     async def test_update_403_fails_if_reauth_fails(self):
@@ -520,6 +706,7 @@ class TestUpdateQuad:
 
         assert result is True
         mock_login.assert_called_once()
+        assert client.renewals == 1
 
     @pytest.mark.asyncio
     async def test_update_no_proactive_reauth_when_session_fresh(self):
@@ -572,148 +759,3 @@ class TestUpdateQuad:
 
         assert result is False
         mock_login.assert_called_once()
-
-
-class TestSendWebhook:
-    """Tests for webhook functionality."""
-
-    @pytest.mark.asyncio
-    async def test_empty_webhook_url(self):
-        """Should return True when webhook URL is empty."""
-        client = QuadStreamClient("user", "secret")
-
-        result = await client.send_webhook("")
-
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_successful_webhook(self):
-        """Should return True on successful webhook."""
-        client = QuadStreamClient("user", "secret")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com")
-
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_webhook_with_quad(self):
-        """Should include quad in payload when provided."""
-        client = QuadStreamClient("user", "secret")
-        quad = Quad(stream1="https://stream1")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com", quad)
-
-            # verify payload included quad
-            call_args = mock_client.post.call_args
-            payload = call_args[1]["json"]
-            assert "quad" in payload
-            assert payload["event"] == "quad_updated"
-
-        assert result is True
-
-    @pytest.mark.asyncio
-    async def test_webhook_accepts_multiple_success_codes(self):
-        """Should accept 200, 201, 202, 204 as success."""
-        client = QuadStreamClient("user", "secret")
-
-        for status_code in [200, 201, 202, 204]:
-            mock_response = MagicMock()
-            mock_response.status_code = status_code
-
-            with patch("httpx.AsyncClient") as MockClient:
-                mock_client = AsyncMock()
-                mock_client.post.return_value = mock_response
-                mock_client.__aenter__.return_value = mock_client
-                mock_client.__aexit__.return_value = None
-                MockClient.return_value = mock_client
-
-                result = await client.send_webhook("https://webhook.example.com")
-
-            assert result is True, f"Status {status_code} should be success"
-
-    @pytest.mark.asyncio
-    async def test_webhook_failure_status(self):
-        """Should return False on failure status."""
-        client = QuadStreamClient("user", "secret")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com")
-
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_webhook_timeout(self):
-        """Should return False on timeout."""
-        client = QuadStreamClient("user", "secret")
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = httpx.TimeoutException("timeout")
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com")
-
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_webhook_request_error(self):
-        """Should return False on request error."""
-        client = QuadStreamClient("user", "secret")
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = httpx.RequestError("connection failed")
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com")
-
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_webhook_unexpected_error(self):
-        """Should return False on unexpected error."""
-        client = QuadStreamClient("user", "secret")
-
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = RuntimeError("unexpected")
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            MockClient.return_value = mock_client
-
-            result = await client.send_webhook("https://webhook.example.com")
-
-        assert result is False
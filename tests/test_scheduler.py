@@ -0,0 +1,176 @@
+"""Tests for fixed-rate cycle scheduling."""
+
+from unittest.mock import patch
+
+import pytest
+
+from quadlink.scheduler import CycleScheduler
+
+
+class FakeClock:
+    """Monotonic clock advanced by the test and by patched sleeps."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock():
+    """Patch the scheduler's clock and sleep with a fake clock."""
+    fake = FakeClock()
+    with patch("quadlink.scheduler.time.monotonic", fake.monotonic):
+        with patch("quadlink.scheduler.asyncio.sleep", fake.sleep):
+            yield fake
+
+
+class TestWait:
+    """Tests for waiting until the next tick."""
+
+    @pytest.mark.asyncio
+    async def test_sleeps_remainder_of_interval(self, clock):
+        """Work time should be subtracted from the sleep."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        clock.now += 12  # cycle work
+        await scheduler.wait()
+
+        assert clock.sleeps == [18]
+
+    @pytest.mark.asyncio
+    async def test_no_drift_over_many_cycles(self, clock):
+        """Cycle starts should stay on the interval grid regardless of work time."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+        start = clock.now
+
+        starts = []
+        for work in [5, 12.5, 29, 0.1, 17]:
+            clock.now += work
+            await scheduler.wait()
+            starts.append(clock.now - start)
+
+        assert starts == [30, 60, 90, 120, 150]
+        assert scheduler.overruns == 0
+
+    @pytest.mark.asyncio
+    async def test_overrun_skips_missed_ticks(self, clock):
+        """A cycle running past ticks should skip them, not run back-to-back cycles."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+        start = clock.now
+
+        clock.now += 75  # runs past the ticks at 30 and 60
+        await scheduler.wait()
+
+        assert clock.now - start == 90
+        assert clock.sleeps == [15]
+        assert scheduler.overruns == 1
+        assert scheduler.skipped == 2
+        assert scheduler.last_overrun == 45
+
+    @pytest.mark.asyncio
+    async def test_cycle_ending_on_tick_starts_immediately(self, clock):
+        """A cycle ending exactly on a later tick should start the next one right away."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        clock.now += 60
+        await scheduler.wait()
+
+        assert clock.sleeps == [0]
+        assert scheduler.skipped == 1
+
+    @pytest.mark.asyncio
+    async def test_first_wait_anchors_grid(self, clock):
+        """wait() without reset() should anchor the grid at the first call."""
+        scheduler = CycleScheduler(30)
+
+        await scheduler.wait()
+
+        assert clock.sleeps == [30]
+
+    @pytest.mark.asyncio
+    async def test_reset_reanchors_grid(self, clock):
+        """reset() should start a new grid without counting the gap as an overrun."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        clock.now += 300  # e.g. an error backoff
+        scheduler.reset()
+        clock.now += 10
+        await scheduler.wait()
+
+        assert clock.sleeps == [20]
+        assert scheduler.overruns == 0
+
+    @pytest.mark.asyncio
+    async def test_interval_change_applies_to_next_tick(self, clock):
+        """A new interval should take effect from the current tick."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        scheduler.interval = 60
+        clock.now += 10
+        await scheduler.wait()
+
+        assert clock.sleeps == [50]
+
+
+class TestMetrics:
+    """Tests for lag and overrun reporting."""
+
+    @pytest.mark.asyncio
+    async def test_lag_measured_after_late_wakeup(self, clock):
+        """Wake-ups later than the tick should be reported as lag."""
+
+        async def late_sleep(delay):
+            clock.sleeps.append(delay)
+            clock.now += delay + 0.25
+
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        with patch("quadlink.scheduler.asyncio.sleep", late_sleep):
+            await scheduler.wait()
+
+        assert scheduler.last_lag == pytest.approx(0.25)
+        assert scheduler.max_lag == pytest.approx(0.25)
+
+    @pytest.mark.asyncio
+    async def test_stats(self, clock):
+        """stats() should report overruns, skipped ticks, and lag."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        clock.now += 40
+        await scheduler.wait()
+
+        assert scheduler.stats() == {
+            "overruns": 1,
+            "skipped": 1,
+            "last_overrun": 10,
+            "last_lag": 0,
+            "max_lag": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_stats_logged_each_wait(self, clock):
+        """Each wait() should log the scheduling counters with the sleep."""
+        scheduler = CycleScheduler(30)
+        scheduler.reset()
+
+        with patch("quadlink.scheduler.logger") as mock_logger:
+            await scheduler.wait()
+
+        mock_logger.debug.assert_called_once_with(
+            "sleeping", delay=30, interval=30, scheduler=scheduler.stats()
+        )
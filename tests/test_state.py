@@ -0,0 +1,132 @@
+"""Tests for persisting daemon state across restarts."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from quadlink.config.models import Config, Credentials
+from quadlink.quad import QuadBuilder
+from quadlink.quadstream import QuadStreamClient
+from quadlink.state import StateStore
+from quadlink.stream.processor import StreamProcessor
+from quadlink.types import Metadata, PrioritizedStream, Quad, Stream
+
+
+def make_stream(author: str, category: str = "Games") -> PrioritizedStream:
+    """Helper to create a prioritized stream."""
+    return PrioritizedStream(
+        stream=Stream(
+            url=f"https://twitch.tv/{author}",
+            metadata=Metadata(author=author, category=category, title="Test"),
+            master_url=f"https://twitch.tv/{author}.m3u8",
+        ),
+        priority=100,
+        tiebreaker=0.5,
+    )
+
+
+@pytest.fixture
+def config():
+    """Config with the offline cache and refresh tiers enabled."""
+    config = Config(credentials=Credentials(username="test", secret="test"), priorities={})
+    config.offline_cache.enabled = True
+    config.refresh_tiers.enabled = True
+    return config
+
+
+class TestStateStore:
+    """Tests for StateStore."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path, config):
+        """Saved builder and cache state should be restored into fresh instances."""
+        store = StateStore(tmp_path / "state.json")
+        builder, processor = QuadBuilder(config), StreamProcessor(config)
+        builder.build_quad([make_stream("a", "Music"), make_stream("b")])
+        processor.offline_cache.mark_offline("offline")
+        processor.refresh.record("live", make_stream("live").stream, cost=0.2)
+
+        await store.save(builder, processor)
+        restored_builder, restored_processor = QuadBuilder(config), StreamProcessor(config)
+
+        assert store.restore(restored_builder, restored_processor) is True
+        assert restored_builder.previous_quad == builder.previous_quad
+        assert restored_builder.previous_positions == builder.previous_positions
+        assert restored_builder.previous_categories == {"a": "Music", "b": "Games"}
+        assert restored_processor.offline_cache.is_offline("offline") is True
+        assert restored_processor.refresh.snapshot().keys() == {"https://twitch.tv/live"}
+
+    @pytest.mark.asyncio
+    async def test_last_push_round_trip(self, tmp_path, config):
+        """The last pushed quad should be restored into a new client."""
+        store = StateStore(tmp_path / "state.json")
+        client = QuadStreamClient("user", "secret")
+        client.short_id = "abc123"
+        client.pushed_digest = QuadStreamClient.digest(Quad(stream1="https://s1"))
+        client.pushed_at = 1000.0
+
+        await store.save(QuadBuilder(config), StreamProcessor(config), client)
+        restored = QuadStreamClient("user", "secret")
+
+        assert store.restore_client(restored) is True
+        assert restored.is_current(Quad(stream1="https://s1"))
+        assert restored.short_id == "abc123"
+
+    @pytest.mark.asyncio
+    async def test_no_last_push(self, tmp_path, config):
+        """A snapshot saved without a client should restore nothing into one."""
+        store = StateStore(tmp_path / "state.json")
+        await store.save(QuadBuilder(config), StreamProcessor(config))
+
+        assert store.restore_client(QuadStreamClient("user", "secret")) is False
+
+    @pytest.mark.asyncio
+    async def test_write_is_atomic(self, tmp_path, config):
+        """A save should leave only the snapshot, with no temporary files."""
+        store = StateStore(tmp_path / "nested" / "state.json")
+
+        await store.save(QuadBuilder(config), StreamProcessor(config))
+
+        assert [p.name for p in store.path.parent.iterdir()] == ["state.json"]
+        assert json.loads(store.path.read_text())["version"] == StateStore.VERSION
+
+    @pytest.mark.asyncio
+    async def test_failed_write_keeps_previous_snapshot(self, tmp_path, config):
+        """A write that fails midway should not replace or truncate the snapshot."""
+        store = StateStore(tmp_path / "state.json")
+        store.path.write_text('{"version": 1}')
+
+        with patch("quadlink.state.json.dump", side_effect=OSError("disk full")):
+            await store.save(QuadBuilder(config), StreamProcessor(config))
+
+        assert store.path.read_text() == '{"version": 1}'
+        assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    def test_missing_file(self, tmp_path, config):
+        """A missing snapshot should start fresh."""
+        store = StateStore(tmp_path / "state.json")
+
+        assert store.restore(QuadBuilder(config), StreamProcessor(config)) is False
+
+    @pytest.mark.parametrize("content", ["{not json", '{"version": 999}', "[]"])
+    def test_unusable_file_ignored(self, tmp_path, config, content):
+        """Corrupt or incompatible snapshots should be ignored."""
+        store = StateStore(tmp_path / "state.json")
+        store.path.write_text(content)
+        builder = QuadBuilder(config)
+
+        assert store.restore(builder, StreamProcessor(config)) is False
+        assert builder.previous_quad is None
+
+    def test_malformed_state_resets_builder(self, tmp_path, config):
+        """A snapshot with bad fields should leave the builder empty."""
+        store = StateStore(tmp_path / "state.json")
+        store.path.write_text(
+            json.dumps({"version": 1, "quad_builder": {"quad": {"stream9": "x"}, "positions": {}}})
+        )
+        builder = QuadBuilder(config)
+
+        assert store.restore(builder, StreamProcessor(config)) is False
+        assert builder.previous_quad is None
+        assert builder.previous_positions == {}
@@ -0,0 +1,94 @@
+"""Tests for the offline channel cache."""
+
+from unittest.mock import patch
+
+from quadlink.stream.cache import NegativeCache
+
+
+class TestNegativeCache:
+    """Tests for NegativeCache."""
+
+    def test_unknown_channel_is_miss(self):
+        """Channels never seen offline should not be cached."""
+        cache = NegativeCache()
+
+        assert cache.is_offline("streamer") is False
+        assert cache.stats()["misses"] == 1
+
+    def test_offline_channel_is_hit(self):
+        """Channels seen offline should be skipped until the TTL expires."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        cache.mark_offline("https://twitch.tv/streamer")
+
+        assert cache.is_offline("https://twitch.tv/streamer") is True
+        assert cache.hits == 1
+
+    def test_usernames_and_urls_share_keys(self):
+        """Usernames and URLs for the same channel should share an entry."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        cache.mark_offline("https://twitch.tv/Streamer/")
+
+        assert cache.is_offline("streamer") is True
+
+    def test_expired_entry_is_miss(self):
+        """Entries should expire after the TTL."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        with patch("quadlink.stream.cache.time.monotonic", return_value=1000.0):
+            cache.mark_offline("streamer")
+        with patch("quadlink.stream.cache.time.monotonic", return_value=1061.0):
+            assert cache.is_offline("streamer") is False
+
+    def test_mark_live_clears_entry(self):
+        """Channels seen live should be probed again immediately."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        cache.mark_offline("streamer")
+        cache.mark_live("streamer")
+
+        assert cache.is_offline("streamer") is False
+        assert cache.stats()["size"] == 0
+
+    def test_ttl_backs_off_for_long_offline_channels(self):
+        """The TTL should double for every backoff_after seconds offline, up to max_ttl."""
+        cache = NegativeCache(ttl=60, jitter=0, max_ttl=200, backoff_after=3600)
+        with patch("quadlink.stream.cache.time.monotonic", return_value=0.0):
+            cache.mark_offline("streamer")
+        with patch("quadlink.stream.cache.time.monotonic", return_value=3600.0):
+            cache.mark_offline("streamer")
+        assert cache._entries["https://twitch.tv/streamer"].expires_at == 3600.0 + 120
+
+        with patch("quadlink.stream.cache.time.monotonic", return_value=7200.0):
+            cache.mark_offline("streamer")
+        assert cache._entries["https://twitch.tv/streamer"].expires_at == 7200.0 + 200
+
+    def test_jitter_spreads_ttl(self):
+        """Jittered TTLs should stay within the configured fraction."""
+        cache = NegativeCache(ttl=100, jitter=0.2)
+        ttls = {cache._next_ttl(0) for _ in range(50)}
+
+        assert all(80 <= ttl <= 120 for ttl in ttls)
+        assert len(ttls) > 1
+
+    def test_stats_hit_rate(self):
+        """Hit rate should reflect hits over total lookups."""
+        cache = NegativeCache(ttl=60)
+        cache.mark_offline("a")
+        cache.is_offline("a")
+        cache.is_offline("b")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_snapshot_restore(self):
+        """Restored entries should keep their remaining TTL and drop expired ones."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        cache.mark_offline("streamer")
+        with patch("quadlink.stream.cache.time.monotonic", return_value=-1000.0):
+            cache.mark_offline("expired")
+
+        restored = NegativeCache(ttl=60, jitter=0)
+        restored.restore(cache.snapshot())
+
+        assert restored.is_offline("streamer") is True
+        assert restored.stats()["size"] == 1
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 from streamlink.exceptions import NoPluginError, PluginError, StreamlinkError
 
+from quadlink.stream.cache import NegativeCache
 from quadlink.stream.fetcher import StreamlinkFetcher
 
 
@@ -111,6 +112,23 @@ class TestGetSession:
             mock_plugins.load_path.assert_called_once_with(mock_path)
 
 
+class TestWarmUp:
+    """Tests for pre-building worker sessions."""
+
+    @pytest.mark.asyncio
+    async def test_builds_session_per_worker(self):
+        """Should create one session in every worker thread."""
+        fetcher = StreamlinkFetcher(max_workers=3)
+
+        with patch("quadlink.stream.fetcher.Streamlink") as MockStreamlink:
+            MockStreamlink.side_effect = lambda: MagicMock()
+            await fetcher.warm_up()
+
+        assert MockStreamlink.call_count == 3
+        assert len(fetcher.executor._threads) == 3
+        await fetcher.close()
+
+
 class TestFetchStreamInfoSync:
     """Tests for synchronous fetch logic."""
 
@@ -403,6 +421,61 @@ class TestFetchStreamInfoSync:
                 assert not any("proxy-playlist" in str(c) for c in calls)
 
 
+class TestPluginCaching:
+    """Tests for memoized plugin resolution and shared options."""
+
+    @staticmethod
+    def make_session():
+        """Create a mock session resolving to a mock plugin class."""
+        mock_session = MagicMock()
+        mock_plugin_class = MagicMock()
+        mock_session.resolve_url.return_value = (
+            "twitch",
+            mock_plugin_class,
+            "https://twitch.tv/test",
+        )
+        return mock_session, mock_plugin_class
+
+    def test_resolve_url_memoized(self):
+        """Plugin resolution should run once per URL."""
+        fetcher = StreamlinkFetcher()
+        mock_session, mock_plugin_class = self.make_session()
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            fetcher._create_plugin("https://twitch.tv/test")
+            fetcher._create_plugin("https://twitch.tv/test")
+            fetcher._create_plugin("https://twitch.tv/other")
+
+        assert mock_session.resolve_url.call_count == 2
+        assert mock_plugin_class.call_count == 3
+
+    def test_options_shared_between_plugins(self):
+        """Plugins should be created with one prebuilt options object."""
+        fetcher = StreamlinkFetcher()
+        mock_session, mock_plugin_class = self.make_session()
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            fetcher._create_plugin("https://twitch.tv/a")
+            fetcher._create_plugin("https://twitch.tv/b")
+
+        first, second = (c.kwargs["options"] for c in mock_plugin_class.call_args_list)
+        assert first is second
+        assert first.get("low-latency") is True
+
+    def test_options_rebuilt_on_setting_change(self):
+        """Changing proxy_playlist or low_latency should rebuild the options."""
+        fetcher = StreamlinkFetcher(proxy_playlist="https://proxy.example.com")
+        original = fetcher._get_options()
+
+        fetcher.low_latency = False
+        rebuilt = fetcher._get_options()
+        assert rebuilt is not original
+        assert rebuilt.get("low-latency") is False
+
+        fetcher.proxy_playlist = ""
+        assert fetcher._get_options().get("proxy-playlist") is None
+
+
 class TestExtractMetadata:
     """Tests for metadata extraction."""
 
@@ -510,3 +583,131 @@ class TestExtractMetadata:
         result = fetcher._extract_metadata(mock_plugin, "https://twitch.tv/test")
 
         assert result is None
+
+
+class TestProbeAndResolve:
+    """Tests for the two-phase probe/resolve fetch path."""
+
+    @staticmethod
+    def make_session(stream_id="123"):
+        """Create a mock session resolving to a plugin with metadata."""
+        mock_session = MagicMock()
+        mock_plugin_class = MagicMock()
+        mock_plugin = MagicMock()
+        mock_plugin.get_id.return_value = stream_id
+        mock_plugin.get_author.return_value = "TestAuthor"
+        mock_plugin.get_category.return_value = "TestCategory"
+        mock_plugin.get_title.return_value = "TestTitle"
+        mock_stream = MagicMock()
+        mock_stream.url = "https://playlist.url/master.m3u8"
+        mock_plugin.streams.return_value = {"best": mock_stream}
+        mock_plugin_class.return_value = mock_plugin
+        mock_session.resolve_url.return_value = (
+            "twitch",
+            mock_plugin_class,
+            "https://twitch.tv/test",
+        )
+        return mock_session, mock_plugin
+
+    def test_probe_skips_playlist(self):
+        """Probe should return metadata without fetching streams."""
+        fetcher = StreamlinkFetcher()
+        mock_session, mock_plugin = self.make_session()
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            result = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+
+        assert result is not None
+        assert result.metadata.author == "TestAuthor"
+        assert result.master_url is None
+        mock_plugin.streams.assert_not_called()
+
+    def test_probe_offline(self):
+        """Probe should return None when metadata has no stream id."""
+        fetcher = StreamlinkFetcher()
+        mock_session, mock_plugin = self.make_session(stream_id=None)
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            result = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+
+        assert result is None
+        mock_plugin.streams.assert_not_called()
+
+    def test_probe_metadata_failure_falls_back(self):
+        """A failed metadata query should fall back to a full fetch, not cache offline."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        fetcher = StreamlinkFetcher(offline_cache=cache)
+        mock_session, mock_plugin = self.make_session(stream_id=None)
+        mock_plugin.get_author.return_value = None
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            result = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+
+        assert result is not None
+        assert result.master_url == "https://playlist.url/master.m3u8"
+        assert cache.is_offline("test") is False
+
+    def test_probe_metadata_failure_not_cached(self):
+        """A failed metadata query followed by a transient playlist error should not be cached."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        fetcher = StreamlinkFetcher(offline_cache=cache)
+        mock_session, mock_plugin = self.make_session(stream_id=None)
+        mock_plugin.get_author.return_value = None
+        mock_plugin.streams.side_effect = StreamlinkError("Network error")
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            result = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+
+        assert result is None
+        assert cache.is_offline("test") is False
+
+    def test_resolve_sets_master_url(self):
+        """Resolve should fill in master_url from the best stream."""
+        fetcher = StreamlinkFetcher()
+        mock_session, _ = self.make_session()
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            probed = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+            resolved = fetcher._resolve_stream_sync(probed)
+
+        assert resolved is not None
+        assert resolved.metadata == probed.metadata
+        assert resolved.master_url == "https://playlist.url/master.m3u8"
+
+    def test_resolve_unavailable(self):
+        """Resolve should return None when no streams are available."""
+        fetcher = StreamlinkFetcher()
+        mock_session, mock_plugin = self.make_session()
+        mock_plugin.streams.return_value = {}
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            probed = fetcher._probe_stream_info_sync("https://twitch.tv/test")
+            resolved = fetcher._resolve_stream_sync(probed)
+
+        assert resolved is None
+
+    def test_probe_records_liveness(self):
+        """Probe should update the offline cache with each channel's state."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        fetcher = StreamlinkFetcher(offline_cache=cache)
+        mock_session, mock_plugin = self.make_session(stream_id=None)
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            fetcher._probe_stream_info_sync("https://twitch.tv/test")
+            assert cache.is_offline("test") is True
+
+            mock_plugin.get_id.return_value = "123"
+            fetcher._probe_stream_info_sync("https://twitch.tv/test")
+            assert cache.is_offline("test") is False
+
+    def test_transient_error_not_cached(self):
+        """Errors that do not mean offline should not be cached."""
+        cache = NegativeCache(ttl=60, jitter=0)
+        fetcher = StreamlinkFetcher(offline_cache=cache)
+        mock_session = MagicMock()
+        mock_session.resolve_url.side_effect = StreamlinkError("Network error")
+
+        with patch.object(fetcher, "_get_session", return_value=mock_session):
+            fetcher._fetch_stream_info_sync("https://twitch.tv/test")
+
+        assert cache.is_offline("test") is False
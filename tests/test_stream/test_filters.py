@@ -1,9 +1,10 @@
 """Tests for stream filtering."""
 
 import pytest
+from pydantic import ValidationError
 
 from quadlink.config.models import Config, Credentials, Filters, Ruleset
-from quadlink.stream.filters import FilterCache, RejectReason, StreamFilter
+from quadlink.stream.filters import RejectReason, StreamFilter
 from quadlink.types import Metadata, Stream
 
 
@@ -24,31 +25,6 @@ def make_config(rulesets: list[Ruleset]) -> Config:
     )
 
 
-class TestFilterCache:
-    """Tests for FilterCache."""
-
-    def test_get_pattern_compiles_and_caches(self):
-        """Pattern should be compiled and cached."""
-        cache = FilterCache()
-        pattern1 = cache.get_pattern("^test$")
-        pattern2 = cache.get_pattern("^test$")
-
-        # should be the same object (cached)
-        assert pattern1 is pattern2
-        assert pattern1.match("test")
-        assert not pattern1.match("other")
-
-    def test_get_pattern_different_patterns(self):
-        """Different patterns should be cached separately."""
-        cache = FilterCache()
-        pattern1 = cache.get_pattern("^foo$")
-        pattern2 = cache.get_pattern("^bar$")
-
-        assert pattern1 is not pattern2
-        assert pattern1.match("foo")
-        assert pattern2.match("bar")
-
-
 class TestStreamFilterNoRulesets:
     """Tests for filtering with no rulesets."""
 
@@ -302,63 +278,25 @@ class TestStreamFilterMultipleRulesets:
 class TestStreamFilterInvalidRegex:
     """Tests for handling invalid regex patterns."""
 
-    def test_invalid_regex_in_block_is_skipped(self):
-        """Invalid regex patterns should be skipped without crashing."""
-        config = make_config(
-            [
-                Ruleset(
-                    name="bad",
-                    filters=Filters(
-                        block_categories=["[invalid regex", "^Valid$"],
-                    ),
-                )
-            ]
-        )
-        stream_filter = StreamFilter(config)
-        stream = make_stream("Valid", "Test")
+    def test_invalid_regex_in_block_fails_validation(self):
+        """Invalid block patterns should be rejected at config load time."""
+        with pytest.raises(ValidationError, match="Invalid regex pattern"):
+            Filters(block_categories=["[invalid regex", "^Valid$"])
 
-        # should still match the valid pattern
-        passed, reason, ruleset = stream_filter.apply_filters(stream, ["bad"])
-        assert passed is False
-        assert reason == RejectReason.CATEGORY_BLOCK_MATCH
-        assert ruleset == "bad"
+    def test_invalid_regex_in_allow_fails_validation(self):
+        """Invalid allow patterns should be rejected at config load time."""
+        with pytest.raises(ValidationError, match="Invalid regex pattern"):
+            Filters(allow_categories=["[invalid", "^Good$"])
 
-    def test_invalid_regex_in_allow_is_skipped(self):
-        """Invalid regex in allow list should be skipped."""
-        config = make_config(
-            [
-                Ruleset(
-                    name="bad",
-                    filters=Filters(
-                        allow_categories=["[invalid", "^Good$"],
-                    ),
-                )
-            ]
-        )
+    def test_filter_uses_precompiled_patterns(self):
+        """The filter should use the patterns compiled by the config model."""
+        filters = Filters(block_titles=["^spam$"])
+        config = make_config([Ruleset(name="r", filters=filters)])
         stream_filter = StreamFilter(config)
-        stream = make_stream("Good", "Test")
 
-        passed, reason, ruleset = stream_filter.apply_filters(stream, ["bad"])
-        assert passed is True
+        program = stream_filter._compile(("r",))
 
-    def test_all_invalid_regex_passes_nothing(self):
-        """If all patterns are invalid, nothing matches."""
-        config = make_config(
-            [
-                Ruleset(
-                    name="bad",
-                    filters=Filters(
-                        allow_categories=["[invalid1", "[invalid2"],
-                    ),
-                )
-            ]
-        )
-        stream_filter = StreamFilter(config)
-        stream = make_stream("Anything", "Test")
-
-        passed, reason, ruleset = stream_filter.apply_filters(stream, ["bad"])
-        # nothing matches the allow list
-        assert passed is False
+        assert program.block_titles.patterns[0][0] is filters.compiled("block_titles")[0]
 
 
 class TestStreamFilterComplexPatterns:
@@ -421,3 +359,141 @@ class TestStreamFilterComplexPatterns:
         assert passed is True
         assert reason == ""
         assert ruleset == ""
+
+
+class TestStreamFilterApplyConfig:
+    """Tests for hot-applying reloaded rulesets."""
+
+    def test_uses_new_rulesets(self):
+        """Filtering should use the reloaded rulesets."""
+        old = make_config([Ruleset(name="r", filters=Filters(block_categories=["^Games$"]))])
+        new = make_config([Ruleset(name="r", filters=Filters(block_categories=["^Music$"]))])
+        stream_filter = StreamFilter(old)
+        stream = make_stream("Games", "Title")
+        assert stream_filter.apply_filters(stream, ["r"])[0] is False
+
+        stream_filter.apply_config(new)
+
+        assert stream_filter.apply_filters(stream, ["r"])[0] is True
+
+
+class TestFilterProgram:
+    """Tests for compiled per-group filter programs."""
+
+    def test_program_compiled_once_per_ruleset_tuple(self):
+        """Each distinct ruleset combination should be compiled once."""
+        config = make_config([Ruleset(name="r", filters=Filters(block_titles=["spam"]))])
+        stream_filter = StreamFilter(config)
+
+        stream_filter.apply_filters(make_stream("Games", "one"), ["r"])
+        program = stream_filter._programs[("r",)]
+        stream_filter.apply_filters(make_stream("Games", "two"), ["r"])
+
+        assert stream_filter._programs[("r",)] is program
+        assert program.block_titles.combined is not None
+
+    def test_block_attribution_follows_ruleset_order(self):
+        """The first ruleset with a match wins, even if a later one matches earlier in text."""
+        config = make_config(
+            [
+                Ruleset(name="first", filters=Filters(block_titles=["end$"])),
+                Ruleset(name="second", filters=Filters(block_titles=["^start"])),
+            ]
+        )
+        stream_filter = StreamFilter(config)
+
+        _, _, ruleset = stream_filter.apply_filters(
+            make_stream("Games", "start to end"), ["first", "second"]
+        )
+        assert ruleset == "first"
+
+        _, _, ruleset = stream_filter.apply_filters(
+            make_stream("Games", "start only"), ["first", "second"]
+        )
+        assert ruleset == "second"
+
+    def test_global_flags_are_scoped(self):
+        """Leading (?i) flags should only apply to their own pattern."""
+        config = make_config(
+            [Ruleset(name="r", filters=Filters(allow_titles=["(?i)speedrun", "^ONLY$"]))]
+        )
+        stream_filter = StreamFilter(config)
+        program = stream_filter._compile(("r",))
+
+        assert program.allow_titles.combined is not None
+        assert program.evaluate("Games", "SPEEDRUN")[0] is True
+        assert program.evaluate("Games", "only")[0] is False
+
+    def test_backreferences_fall_back_to_individual_patterns(self):
+        """Patterns with numbered backreferences should not be combined."""
+        config = make_config([Ruleset(name="r", filters=Filters(block_titles=[r"(\w)\1", "spam"]))])
+        stream_filter = StreamFilter(config)
+        program = stream_filter._compile(("r",))
+
+        assert program.block_titles.combined is None
+        assert program.evaluate("Games", "aa")[2] == "r"
+        assert program.evaluate("Games", "ab")[0] is True
+
+    def test_apply_config_drops_only_changed_programs(self):
+        """Programs for unchanged rulesets should survive a reload."""
+        a = Ruleset(name="a", filters=Filters(block_titles=["x"]))
+        b = Ruleset(name="b", filters=Filters(block_titles=["y"]))
+        stream_filter = StreamFilter(make_config([a, b]))
+        stream_filter.apply_filters(make_stream("Games", "t"), ["a"])
+        stream_filter.apply_filters(make_stream("Games", "t"), ["a", "b"])
+        program_a = stream_filter._programs[("a",)]
+
+        changed_b = Ruleset(name="b", filters=Filters(block_titles=["z"]))
+        stream_filter.apply_config(make_config([a, changed_b]))
+
+        assert stream_filter._programs == {("a",): program_a}
+
+
+class TestVerdictCache:
+    """Tests for memoized filter verdicts."""
+
+    @pytest.fixture
+    def stream_filter(self):
+        """Filter with a single block ruleset."""
+        config = make_config([Ruleset(name="r", filters=Filters(block_titles=["spam"]))])
+        return StreamFilter(config, verdict_cache_size=2)
+
+    def test_repeated_stream_served_from_cache(self, stream_filter):
+        """Identical category, title, and rulesets should reuse the verdict."""
+        stream = make_stream("Games", "spam stream")
+        first = stream_filter.apply_filters(stream, ["r"])
+        second = stream_filter.apply_filters(stream, ["r"])
+
+        assert first == second == (False, RejectReason.TITLE_BLOCK_MATCH, "r")
+        assert stream_filter.stats()["hits"] == 1
+        assert stream_filter.stats()["misses"] == 1
+        assert stream_filter.stats()["hit_rate"] == 0.5
+
+    def test_ruleset_tuple_is_part_of_key(self, stream_filter):
+        """The same stream under different rulesets should be evaluated separately."""
+        stream = make_stream("Games", "spam stream")
+
+        assert stream_filter.apply_filters(stream, ["r"])[0] is False
+        assert stream_filter.apply_filters(stream, [])[0] is True
+        assert stream_filter.hits == 0
+
+    def test_cache_is_bounded(self, stream_filter):
+        """Least recently used verdicts should be evicted past the size limit."""
+        for title in ("a", "b", "a", "c"):
+            stream_filter.apply_filters(make_stream("Games", title), ["r"])
+
+        assert stream_filter.stats()["size"] == 2
+        assert ("Games", "a", ("r",)) in stream_filter._verdicts
+        assert ("Games", "b", ("r",)) not in stream_filter._verdicts
+
+    def test_changed_ruleset_invalidates_verdicts(self, stream_filter):
+        """Verdicts for changed rulesets should be recomputed after a reload."""
+        stream = make_stream("Games", "spam stream")
+        stream_filter.apply_filters(stream, ["r"])
+
+        stream_filter.apply_config(
+            make_config([Ruleset(name="r", filters=Filters(block_titles=["other"]))])
+        )
+
+        assert stream_filter.apply_filters(stream, ["r"])[0] is True
+        assert stream_filter.hits == 0
@@ -0,0 +1,234 @@
+"""Tests for native asyncio Twitch GQL fetcher."""
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from quadlink.stream.gql import CLIENT_ID, TwitchGQLFetcher
+from quadlink.types import Metadata, Stream
+
+
+def make_user(login: str, live: bool = True) -> dict:
+    """Build a GQL user object."""
+    return {
+        "login": login,
+        "displayName": login.capitalize(),
+        "stream": (
+            {"id": "1", "title": f"{login} title", "game": {"name": "Games"}} if live else None
+        ),
+    }
+
+
+def make_fetcher(handler, batch_size: int = 30) -> TwitchGQLFetcher:
+    """Create a fetcher backed by a mock transport."""
+    return TwitchGQLFetcher(transport=httpx.MockTransport(handler), batch_size=batch_size)
+
+
+def gql_response(request: httpx.Request, build) -> httpx.Response:
+    """Answer an aliased batch query by calling build(login) for each alias."""
+    variables = json.loads(request.content)["variables"]
+    data = {f"c{key[1:]}": build(login) for key, login in variables.items()}
+    return httpx.Response(200, json={"data": data})
+
+
+class TestProbeStreamInfo:
+    """Tests for metadata probing."""
+
+    @pytest.mark.asyncio
+    async def test_live_stream(self):
+        """Should return metadata for a live channel."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return gql_response(request, make_user)
+
+        fetcher = make_fetcher(handler)
+        result = await fetcher.probe_stream_info("streamer")
+        await fetcher.close()
+
+        assert result is not None
+        assert result.url == "https://twitch.tv/streamer"
+        assert result.metadata == Metadata(
+            author="Streamer", category="Games", title="streamer title"
+        )
+        assert result.master_url is None
+        assert requests[0].headers["Client-ID"] == CLIENT_ID
+        assert json.loads(requests[0].content)["variables"] == {"l0": "streamer"}
+
+    @pytest.mark.asyncio
+    async def test_offline_stream(self):
+        """Should return None when the channel has no stream."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return gql_response(request, lambda login: make_user(login, live=False))
+
+        fetcher = make_fetcher(handler)
+        assert await fetcher.probe_stream_info("streamer") is None
+
+    @pytest.mark.asyncio
+    async def test_channel_not_found(self):
+        """Should return None when the user does not exist."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return gql_response(request, lambda login: None)
+
+        fetcher = make_fetcher(handler)
+        assert await fetcher.probe_stream_info("streamer") is None
+
+    @pytest.mark.asyncio
+    async def test_http_error(self):
+        """Should return None on HTTP errors."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        fetcher = make_fetcher(handler)
+        assert await fetcher.probe_stream_info("streamer") is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_login_skips_request(self):
+        """Should not query for URLs that are not Twitch channels."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("unexpected request")
+
+        fetcher = make_fetcher(handler)
+        assert await fetcher.probe_stream_info("https://example.com/not a login") is None
+
+
+class TestResolveStream:
+    """Tests for playlist resolution."""
+
+    @pytest.mark.asyncio
+    async def test_builds_usher_url(self):
+        """Should build usher URL from access token."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            token = {"value": '{"channel":"streamer"}', "signature": "abc"}
+            return gql_response(request, lambda login: token)
+
+        fetcher = make_fetcher(handler)
+        stream = Stream(
+            url="https://twitch.tv/streamer",
+            metadata=Metadata(author="Streamer", category="Games", title="Test"),
+        )
+        result = await fetcher.resolve_stream(stream)
+
+        assert result is not None
+        assert result.metadata == stream.metadata
+        parsed = urlparse(result.master_url)
+        assert parsed.netloc == "usher.ttvnw.net"
+        assert parsed.path == "/api/channel/hls/streamer.m3u8"
+        params = parse_qs(parsed.query)
+        assert params["sig"] == ["abc"]
+        assert params["token"] == ['{"channel":"streamer"}']
+        assert params["fast_bread"] == ["true"]
+
+    @pytest.mark.asyncio
+    async def test_missing_token(self):
+        """Should return None when no token is issued."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return gql_response(request, lambda login: None)
+
+        fetcher = make_fetcher(handler)
+        stream = Stream(
+            url="https://twitch.tv/streamer",
+            metadata=Metadata(author="Streamer", category="Games", title="Test"),
+        )
+        assert await fetcher.resolve_stream(stream) is None
+
+
+class TestFetchStreamInfo:
+    """Tests for combined fetch."""
+
+    @pytest.mark.asyncio
+    async def test_probe_then_resolve(self):
+        """Should probe metadata and then resolve the playlist."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            if "streamPlaybackAccessToken" in query:
+                return gql_response(request, lambda login: {"value": "token", "signature": "sig"})
+            return gql_response(request, make_user)
+
+        fetcher = make_fetcher(handler)
+        result = await fetcher.fetch_stream_info("https://twitch.tv/streamer")
+
+        assert result is not None
+        assert result.metadata.author == "Streamer"
+        assert result.master_url.startswith("https://usher.ttvnw.net/")
+
+    @pytest.mark.asyncio
+    async def test_offline_skips_token(self):
+        """Should not request a token for offline channels."""
+        queries = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            queries.append(json.loads(request.content)["query"])
+            return gql_response(request, lambda login: make_user(login, live=False))
+
+        fetcher = make_fetcher(handler)
+        assert await fetcher.fetch_stream_info("streamer") is None
+        assert len(queries) == 1
+
+
+class TestFetchMany:
+    """Tests for batched lookups."""
+
+    @pytest.mark.asyncio
+    async def test_probe_many_batches_requests(self):
+        """Should look up batch_size channels per request."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return gql_response(request, lambda login: make_user(login, live=login != "c2"))
+
+        fetcher = make_fetcher(handler, batch_size=2)
+        urls = ["c0", "c1", "c2", "https://twitch.tv/c3", "c4"]
+        results = await fetcher.probe_many(urls)
+
+        assert len(requests) == 3
+        assert set(results) == set(urls)
+        assert results["c2"] is None
+        assert results["https://twitch.tv/c3"].metadata.author == "C3"
+        assert all(results[url] is not None for url in urls if url != "c2")
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_resolves_live_only(self):
+        """Should only request tokens for live channels, in one batch."""
+        token_logins = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if "streamPlaybackAccessToken" in body["query"]:
+                token_logins.extend(body["variables"].values())
+                return gql_response(request, lambda login: {"value": "t", "signature": "s"})
+            return gql_response(request, lambda login: make_user(login, live=login != "off"))
+
+        fetcher = make_fetcher(handler)
+        results = await fetcher.fetch_many(["on1", "off", "on2"])
+
+        assert sorted(token_logins) == ["on1", "on2"]
+        assert results["off"] is None
+        assert results["on1"].master_url is not None
+        assert results["on2"].master_url is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_returns_none(self):
+        """A failed batch request should yield None for its channels only."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "bad" in json.loads(request.content)["variables"].values():
+                return httpx.Response(500)
+            return gql_response(request, make_user)
+
+        fetcher = make_fetcher(handler, batch_size=1)
+        results = await fetcher.probe_many(["good", "bad"])
+
+        assert results["good"] is not None
+        assert results["bad"] is None
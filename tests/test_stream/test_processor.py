@@ -1,10 +1,17 @@
 """Tests for stream processor."""
 
+import asyncio
+from dataclasses import replace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from quadlink.config.models import Config, Credentials, Filters, Ruleset, StreamGroup
+from quadlink.metrics import Metrics
+from quadlink.quad import QuadBuilder
+from quadlink.stream.cache import NegativeCache
+from quadlink.stream.fetcher import StreamlinkFetcher
+from quadlink.stream.gql import TwitchGQLFetcher
 from quadlink.stream.processor import StreamProcessor
 from quadlink.types import Metadata, PrioritizedStream, Stream
 
@@ -35,6 +42,11 @@ def make_config(
     )
 
 
+async def resolve_playlist(stream: Stream) -> Stream:
+    """Mock playlist resolution that sets master_url."""
+    return replace(stream, master_url=f"{stream.url}.m3u8")
+
+
 class TestNormalizeUrl:
     """Tests for URL normalization."""
 
@@ -95,50 +107,55 @@ class TestIsHosted:
         assert processor._is_hosted(stream) is False
 
 
-class TestProcessSingleStream:
-    """Tests for single stream processing."""
+def make_processor(
+    config: Config, fetcher: MagicMock, url: str = "streamer", **group
+) -> StreamProcessor:
+    """Helper to create a processor with one stream group at priority 100."""
+    group.setdefault("rulesets", [])
+    config.priorities = {100: [StreamGroup(urls=[url], **group)]}
+    processor = StreamProcessor(config)
+    processor.fetcher = fetcher
+    return processor
+
+
+class TestProcessStream:
+    """Tests for processing a single configured stream."""
 
     @pytest.fixture
     def mock_fetcher(self):
         """Create a mock fetcher."""
         with patch("quadlink.stream.processor.StreamlinkFetcher") as MockFetcher:
             mock_instance = MagicMock()
-            mock_instance.fetch_stream_info = AsyncMock()
+            mock_instance.probe_stream_info = AsyncMock()
+            mock_instance.resolve_stream = AsyncMock(side_effect=resolve_playlist)
             MockFetcher.return_value = mock_instance
             yield mock_instance
 
     @pytest.mark.asyncio
-    async def test_offline_stream_returns_none(self, mock_fetcher):
-        """Offline stream should return None."""
-        mock_fetcher.fetch_stream_info.return_value = None
-        config = make_config()
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+    async def test_offline_stream_skipped(self, mock_fetcher):
+        """Offline stream should not become a candidate."""
+        mock_fetcher.probe_stream_info.return_value = None
+        processor = make_processor(make_config(), mock_fetcher)
 
-        result = await processor._process_single_stream("streamer", 100, [])
-        assert result is None
+        assert await processor.process_stream_groups() == []
 
     @pytest.mark.asyncio
     async def test_stream_passes_filters(self, mock_fetcher):
-        """Stream passing filters should return PrioritizedStream."""
-        stream = make_stream("Streamer", "Destiny 2")
-        mock_fetcher.fetch_stream_info.return_value = stream
-        config = make_config()
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+        """Stream passing filters should become a PrioritizedStream."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Destiny 2")
+        processor = make_processor(make_config(), mock_fetcher)
 
-        result = await processor._process_single_stream("streamer", 100, [])
+        results = await processor.process_stream_groups()
 
-        assert result is not None
-        assert isinstance(result, PrioritizedStream)
-        assert result.priority == 100
-        assert result.stream.metadata.author == "Streamer"
+        assert len(results) == 1
+        assert isinstance(results[0], PrioritizedStream)
+        assert results[0].priority == 100
+        assert results[0].stream.metadata.author == "Streamer"
 
     @pytest.mark.asyncio
     async def test_stream_fails_filters(self, mock_fetcher):
-        """Stream failing filters should return None."""
-        stream = make_stream("Streamer", "Minecraft")
-        mock_fetcher.fetch_stream_info.return_value = stream
+        """Stream failing filters should be dropped before resolution."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Minecraft")
         config = make_config(
             rulesets=[
                 Ruleset(
@@ -147,11 +164,31 @@ class TestProcessSingleStream:
                 )
             ]
         )
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+        processor = make_processor(config, mock_fetcher, rulesets=["global"])
+
+        assert await processor.process_stream_groups() == []
+        mock_fetcher.resolve_stream.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_accepted_stream_resolved(self, mock_fetcher):
+        """Accepted stream should have its playlist resolved after filtering."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Games")
+        processor = make_processor(make_config(), mock_fetcher)
+
+        results = await processor.process_stream_groups()
 
-        result = await processor._process_single_stream("streamer", 100, ["global"])
-        assert result is None
+        assert results[0].stream.master_url == "https://twitch.tv/streamer.m3u8"
+        mock_fetcher.resolve_stream.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_stream_dropped(self, mock_fetcher):
+        """Stream whose playlist cannot be resolved should be dropped."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Games")
+        mock_fetcher.resolve_stream.side_effect = None
+        mock_fetcher.resolve_stream.return_value = None
+        processor = make_processor(make_config(), mock_fetcher)
+
+        assert await processor.process_stream_groups() == []
 
     @pytest.mark.asyncio
     async def test_hosted_stream_skipped(self, mock_fetcher):
@@ -161,13 +198,10 @@ class TestProcessSingleStream:
             url="https://twitch.tv/hostchannel",
             metadata=Metadata(author="realstreamer", category="Games", title="Test"),
         )
-        mock_fetcher.fetch_stream_info.return_value = stream
-        config = make_config(skip_hosted=True)
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+        mock_fetcher.probe_stream_info.return_value = stream
+        processor = make_processor(make_config(skip_hosted=True), mock_fetcher, "hostchannel")
 
-        result = await processor._process_single_stream("hostchannel", 100, [])
-        assert result is None
+        assert await processor.process_stream_groups() == []
 
     @pytest.mark.asyncio
     async def test_hosted_stream_priority_reduced(self, mock_fetcher):
@@ -176,54 +210,49 @@ class TestProcessSingleStream:
             url="https://twitch.tv/hostchannel",
             metadata=Metadata(author="realstreamer", category="Games", title="Test"),
         )
-        mock_fetcher.fetch_stream_info.return_value = stream
+        mock_fetcher.probe_stream_info.return_value = stream
         config = make_config(skip_hosted=False, hosted_offset=50)
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+        processor = make_processor(config, mock_fetcher, "hostchannel")
 
-        result = await processor._process_single_stream("hostchannel", 100, [])
+        results = await processor.process_stream_groups()
 
-        assert result is not None
-        assert result.priority == 50  # 100 - 50 offset
+        assert len(results) == 1
+        assert results[0].priority == 50  # 100 - 50 offset
 
     @pytest.mark.asyncio
     async def test_duplicate_stream_rejected(self, mock_fetcher):
-        """Duplicate streams should be rejected."""
-        stream = make_stream("Streamer", "Games")
-        mock_fetcher.fetch_stream_info.return_value = stream
+        """The same stream listed twice in a group should be accepted once."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Games")
         config = make_config()
+        config.priorities = {
+            100: [StreamGroup(urls=["streamer", "https://twitch.tv/streamer"], rulesets=[])]
+        }
         processor = StreamProcessor(config)
         processor.fetcher = mock_fetcher
 
-        # first call succeeds
-        result1 = await processor._process_single_stream("streamer", 100, [])
-        assert result1 is not None
+        results = await processor.process_stream_groups()
 
-        # second call with same URL is duplicate
-        result2 = await processor._process_single_stream("streamer", 100, [])
-        assert result2 is None
+        assert len(results) == 1
 
     @pytest.mark.asyncio
-    async def test_exception_returns_none(self, mock_fetcher):
-        """Exception during processing should return None."""
-        mock_fetcher.fetch_stream_info.side_effect = Exception("Network error")
-        config = make_config()
-        processor = StreamProcessor(config)
-        processor.fetcher = mock_fetcher
+    async def test_exception_skips_stream(self, mock_fetcher):
+        """Exception during processing should skip the stream."""
+        mock_fetcher.probe_stream_info.side_effect = Exception("Network error")
+        processor = make_processor(make_config(), mock_fetcher)
 
-        result = await processor._process_single_stream("streamer", 100, [])
-        assert result is None
+        assert await processor.process_stream_groups() == []
 
 
 class TestProcessPriorityLevel:
-    """Tests for priority level processing."""
+    """Tests for processing the groups of one priority level."""
 
     @pytest.fixture
     def mock_fetcher(self):
         """Create a mock fetcher."""
         with patch("quadlink.stream.processor.StreamlinkFetcher") as MockFetcher:
             mock_instance = MagicMock()
-            mock_instance.fetch_stream_info = AsyncMock()
+            mock_instance.probe_stream_info = AsyncMock()
+            mock_instance.resolve_stream = AsyncMock(side_effect=resolve_playlist)
             MockFetcher.return_value = mock_instance
             yield mock_instance
 
@@ -240,16 +269,16 @@ class TestProcessPriorityLevel:
             username = url.replace("https://twitch.tv/", "").lower()
             return streams.get(username)
 
-        mock_fetcher.fetch_stream_info.side_effect = mock_fetch
-        config = make_config()
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+        config = make_config(
+            priorities={
+                100: [StreamGroup(urls=["streamer1", "streamer2", "streamer3"], rulesets=[])],
+            }
+        )
         processor = StreamProcessor(config)
         processor.fetcher = mock_fetcher
 
-        groups = [
-            StreamGroup(urls=["streamer1", "streamer2", "streamer3"], rulesets=[]),
-        ]
-
-        results = await processor._process_priority_level(100, groups)
+        results = await processor.process_stream_groups()
 
         assert len(results) == 2  # streamer3 is offline
         authors = {r.stream.metadata.author for r in results}
@@ -268,17 +297,19 @@ class TestProcessPriorityLevel:
             username = url.replace("https://twitch.tv/", "").lower()
             return streams.get(username)
 
-        mock_fetcher.fetch_stream_info.side_effect = mock_fetch
-        config = make_config()
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+        config = make_config(
+            priorities={
+                100: [
+                    StreamGroup(urls=["streamer1"], rulesets=[]),
+                    StreamGroup(urls=["streamer2"], rulesets=[]),
+                ],
+            }
+        )
         processor = StreamProcessor(config)
         processor.fetcher = mock_fetcher
 
-        groups = [
-            StreamGroup(urls=["streamer1"], rulesets=[]),
-            StreamGroup(urls=["streamer2"], rulesets=[]),
-        ]
-
-        results = await processor._process_priority_level(100, groups)
+        results = await processor.process_stream_groups()
         assert len(results) == 2
 
 
@@ -290,7 +321,8 @@ class TestProcessStreamGroups:
         """Create a mock fetcher."""
         with patch("quadlink.stream.processor.StreamlinkFetcher") as MockFetcher:
             mock_instance = MagicMock()
-            mock_instance.fetch_stream_info = AsyncMock()
+            mock_instance.probe_stream_info = AsyncMock()
+            mock_instance.resolve_stream = AsyncMock(side_effect=resolve_playlist)
             MockFetcher.return_value = mock_instance
             yield mock_instance
 
@@ -304,6 +336,34 @@ class TestProcessStreamGroups:
         results = await processor.process_stream_groups()
         assert results == []
 
+    @pytest.mark.asyncio
+    async def test_rejected_streams_not_resolved(self, mock_fetcher):
+        """Only streams passing filters should have playlists resolved."""
+        streams = {
+            "games": make_stream("Games", "Games"),
+            "chat": make_stream("Chat", "Just Chatting"),
+        }
+
+        async def mock_fetch(url):
+            return streams.get(url.replace("https://twitch.tv/", "").lower())
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+
+        config = make_config(
+            priorities={100: [StreamGroup(urls=["games", "chat"], rulesets=["global"])]},
+            rulesets=[
+                Ruleset(name="global", filters=Filters(block_categories=["^Just Chatting$"]))
+            ],
+        )
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups()
+
+        assert [r.stream.metadata.author for r in results] == ["Games"]
+        resolved = [call.args[0].url for call in mock_fetcher.resolve_stream.call_args_list]
+        assert resolved == ["https://twitch.tv/games"]
+
     @pytest.mark.asyncio
     async def test_process_multiple_priorities(self, mock_fetcher):
         """Should process streams from multiple priority levels."""
@@ -316,7 +376,7 @@ class TestProcessStreamGroups:
             username = url.replace("https://twitch.tv/", "").lower()
             return streams.get(username)
 
-        mock_fetcher.fetch_stream_info.side_effect = mock_fetch
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
 
         config = make_config(
             priorities={
@@ -338,7 +398,7 @@ class TestProcessStreamGroups:
     async def test_seen_urls_cleared_between_cycles(self, mock_fetcher):
         """Seen URLs should be cleared for each processing cycle."""
         stream = make_stream("Streamer", "Games")
-        mock_fetcher.fetch_stream_info.return_value = stream
+        mock_fetcher.probe_stream_info.return_value = stream
 
         config = make_config(priorities={100: [StreamGroup(urls=["streamer"], rulesets=[])]})
         processor = StreamProcessor(config)
@@ -356,7 +416,7 @@ class TestProcessStreamGroups:
     async def test_deduplication_within_cycle(self, mock_fetcher):
         """Same stream at different priorities should be deduplicated."""
         stream = make_stream("Streamer", "Games")
-        mock_fetcher.fetch_stream_info.return_value = stream
+        mock_fetcher.probe_stream_info.return_value = stream
 
         config = make_config(
             priorities={
@@ -372,3 +432,592 @@ class TestProcessStreamGroups:
         # should only have one result (first one at priority 999)
         assert len(results) == 1
         assert results[0].priority == 999
+
+    @pytest.mark.asyncio
+    async def test_levels_fetched_concurrently(self, mock_fetcher):
+        """Fetches from different priority levels should overlap."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def mock_fetch(url):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            username = url.replace("https://twitch.tv/", "").lower()
+            return make_stream(username.capitalize(), "Games")
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a"], rulesets=[])],
+                500: [StreamGroup(urls=["b"], rulesets=[])],
+                100: [StreamGroup(urls=["c"], rulesets=[])],
+            }
+        )
+        processor = StreamProcessor(config, max_concurrent=4)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups()
+
+        assert len(results) == 3
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_deduplication_ignores_completion_order(self, mock_fetcher):
+        """Highest priority should win even when its fetch finishes last."""
+        stream = make_stream("Streamer", "Games")
+
+        async def mock_fetch(url):
+            if url == "slow":
+                await asyncio.sleep(0.02)
+            return stream
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["slow"], rulesets=[])],
+                100: [StreamGroup(urls=["fast"], rulesets=[])],
+            }
+        )
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups()
+
+        assert len(results) == 1
+        assert results[0].priority == 999
+
+    @pytest.mark.asyncio
+    async def test_url_fetched_once_across_levels(self, mock_fetcher):
+        """A URL listed at several priorities should only be fetched once."""
+        mock_fetcher.probe_stream_info.return_value = make_stream("Streamer", "Minecraft")
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["streamer"], rulesets=["strict"])],
+                100: [StreamGroup(urls=["streamer"], rulesets=[])],
+            },
+            rulesets=[Ruleset(name="strict", filters=Filters(block_categories=["^Minecraft$"]))],
+        )
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups()
+
+        mock_fetcher.probe_stream_info.assert_called_once()
+        # rejected by the 999 group's ruleset, accepted by the 100 group
+        assert len(results) == 1
+        assert results[0].priority == 100
+
+    @pytest.mark.asyncio
+    async def test_early_exit_skips_lower_levels(self, mock_fetcher):
+        """Lower levels should not be fetched once the quad is decided."""
+        completed = []
+
+        async def mock_fetch(url):
+            await asyncio.sleep(1 if url.endswith("low") else 0.01)
+            completed.append(url)
+            return make_stream(url.capitalize(), "Games")
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["low"], rulesets=[])],
+            }
+        )
+        config.early_exit = True
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(QuadBuilder(config))
+
+        assert len(results) == 4
+        assert "low" not in completed
+
+    @pytest.mark.asyncio
+    async def test_early_exit_waits_for_resolution(self, mock_fetcher):
+        """A winner failing to resolve should not leave lower levels cancelled."""
+
+        async def mock_fetch(url):
+            return make_stream(url.capitalize(), "Games")
+
+        async def mock_resolve(stream):
+            await asyncio.sleep(0.01)
+            if stream.metadata.author == "A":
+                return None
+            return await resolve_playlist(stream)
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+        mock_fetcher.resolve_stream.side_effect = mock_resolve
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["low"], rulesets=[])],
+            }
+        )
+        config.early_exit = True
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(QuadBuilder(config))
+
+        assert {r.stream.metadata.author for r in results} == {"B", "C", "D", "Low"}
+        assert all(r.stream.master_url for r in results)
+
+    @pytest.mark.asyncio
+    async def test_early_exit_two_phase_replaces_failed_winner(self, mock_fetcher):
+        """With two_phase_fetch, a failed winner should be replaced from lower levels."""
+
+        async def mock_fetch(url):
+            return make_stream(url.capitalize(), "Games")
+
+        async def mock_resolve(stream):
+            if stream.metadata.author == "A":
+                return None
+            return await resolve_playlist(stream)
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+        mock_fetcher.resolve_stream.side_effect = mock_resolve
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["low"], rulesets=[])],
+            }
+        )
+        config.early_exit = True
+        config.two_phase_fetch = True
+        builder = QuadBuilder(config)
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(builder)
+        selected = builder.select(results)
+
+        assert {s.stream.metadata.author for s in selected} == {"B", "C", "D", "Low"}
+        assert all(s.stream.master_url for s in selected)
+
+    @pytest.mark.asyncio
+    async def test_early_exit_disabled_fetches_everything(self, mock_fetcher):
+        """Without early_exit every level should be processed."""
+
+        async def mock_fetch(url):
+            return make_stream(url.capitalize(), "Games")
+
+        mock_fetcher.probe_stream_info.side_effect = mock_fetch
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["low"], rulesets=[])],
+            }
+        )
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(QuadBuilder(config))
+
+        assert len(results) == 5
+
+
+class TestTwoPhaseFetch:
+    """Tests for probing all streams and resolving only the winners."""
+
+    @pytest.fixture
+    def mock_fetcher(self):
+        """Create a mock fetcher with probe/resolve methods."""
+        with patch("quadlink.stream.processor.StreamlinkFetcher") as MockFetcher:
+            mock_instance = MagicMock()
+            mock_instance.probe_stream_info = AsyncMock()
+            mock_instance.resolve_stream = AsyncMock()
+            MockFetcher.return_value = mock_instance
+            yield mock_instance
+
+    @pytest.mark.asyncio
+    async def test_only_winners_resolved(self, mock_fetcher):
+        """Only the 4 selected streams should have their playlist resolved."""
+
+        async def mock_probe(url):
+            return make_stream(url.capitalize(), url)
+
+        async def mock_resolve(stream):
+            return Stream(url=stream.url, metadata=stream.metadata, master_url=stream.url + ".m3u8")
+
+        mock_fetcher.probe_stream_info.side_effect = mock_probe
+        mock_fetcher.resolve_stream.side_effect = mock_resolve
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["e", "f"], rulesets=[])],
+            }
+        )
+        config.two_phase_fetch = True
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(QuadBuilder(config))
+
+        assert mock_fetcher.resolve_stream.call_count == 4
+        resolved = {r.stream.metadata.author for r in results if r.stream.master_url}
+        assert resolved == {"A", "B", "C", "D"}
+
+    @pytest.mark.asyncio
+    async def test_offline_winner_replaced(self, mock_fetcher):
+        """A winner that fails to resolve should be replaced by the next candidate."""
+
+        async def mock_probe(url):
+            return make_stream(url.capitalize(), url)
+
+        async def mock_resolve(stream):
+            if stream.metadata.author == "A":
+                return None
+            return Stream(url=stream.url, metadata=stream.metadata, master_url=stream.url + ".m3u8")
+
+        mock_fetcher.probe_stream_info.side_effect = mock_probe
+        mock_fetcher.resolve_stream.side_effect = mock_resolve
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b", "c", "d"], rulesets=[])],
+                10: [StreamGroup(urls=["e"], rulesets=[])],
+            }
+        )
+        config.two_phase_fetch = True
+        builder = QuadBuilder(config)
+        processor = StreamProcessor(config)
+        processor.fetcher = mock_fetcher
+
+        results = await processor.process_stream_groups(builder)
+        selected = {s.stream.metadata.author for s in builder.select(results)}
+
+        assert "A" not in {r.stream.metadata.author for r in results}
+        assert selected == {"B", "C", "D", "E"}
+        assert all(s.stream.master_url for s in builder.select(results))
+
+
+class TestFetcherBackend:
+    """Tests for fetcher backend selection."""
+
+    def test_default_backend_is_streamlink(self):
+        """Should use the Streamlink fetcher by default."""
+        processor = StreamProcessor(make_config())
+        assert isinstance(processor.fetcher, StreamlinkFetcher)
+
+    def test_gql_backend(self):
+        """Should use the native GQL fetcher when configured."""
+        config = make_config()
+        config.fetcher_backend = "gql"
+        config.max_concurrent = 100
+        processor = StreamProcessor(config)
+
+        assert isinstance(processor.fetcher, TwitchGQLFetcher)
+        assert processor.fetcher.max_connections == 100
+
+    @pytest.mark.asyncio
+    async def test_gql_backend_fetches_levels_in_batches(self):
+        """The gql backend should probe each level and resolve its survivors in batches."""
+
+        async def mock_probe_many(urls):
+            return {url: make_stream(url.capitalize(), "Games") for url in urls}
+
+        async def mock_resolve_many(streams):
+            return [await resolve_playlist(stream) for stream in streams]
+
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a", "b"], rulesets=[]), StreamGroup(urls=["c"])],
+                100: [StreamGroup(urls=["a", "d"], rulesets=[])],
+            }
+        )
+        config.fetcher_backend = "gql"
+        processor = StreamProcessor(config)
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_many = AsyncMock(side_effect=mock_probe_many)
+        processor.fetcher.resolve_many = AsyncMock(side_effect=mock_resolve_many)
+
+        results = await processor.process_stream_groups()
+
+        calls = [call.args[0] for call in processor.fetcher.probe_many.call_args_list]
+        assert calls == [["a", "b", "c"], ["d"]]
+        assert processor.fetcher.resolve_many.call_count == 2
+        assert all(r.stream.master_url for r in results)
+        assert {r.stream.metadata.author for r in results} == {"A", "B", "C", "D"}
+
+
+class TestOfflineCache:
+    """Tests for skipping channels cached as offline."""
+
+    def test_disabled_by_default(self):
+        """No cache should be created unless enabled."""
+        processor = StreamProcessor(make_config())
+        assert processor.offline_cache is None
+
+    def test_cache_shared_with_fetcher(self):
+        """The fetcher should record liveness into the processor's cache."""
+        config = make_config()
+        config.offline_cache.enabled = True
+        processor = StreamProcessor(config)
+
+        assert isinstance(processor.offline_cache, NegativeCache)
+        assert processor.fetcher.offline_cache is processor.offline_cache
+
+    @pytest.mark.asyncio
+    async def test_cached_channels_skipped(self):
+        """Channels cached as offline should not be fetched."""
+        config = make_config(priorities={100: [StreamGroup(urls=["a", "b"], rulesets=[])]})
+        config.offline_cache.enabled = True
+        processor = StreamProcessor(config)
+        processor.offline_cache.mark_offline("a")
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_stream_info = AsyncMock(return_value=make_stream("B", "Games"))
+        processor.fetcher.resolve_stream = AsyncMock(side_effect=resolve_playlist)
+
+        results = await processor.process_stream_groups()
+
+        processor.fetcher.probe_stream_info.assert_called_once_with("b")
+        assert [r.stream.metadata.author for r in results] == ["B"]
+
+    @pytest.mark.asyncio
+    async def test_bypass_priority_always_fetches(self):
+        """Groups at or above bypass_priority should ignore the cache."""
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a"], rulesets=[])],
+                100: [StreamGroup(urls=["b"], rulesets=[])],
+            }
+        )
+        config.offline_cache.enabled = True
+        config.offline_cache.bypass_priority = 900
+        processor = StreamProcessor(config)
+        processor.offline_cache.mark_offline("a")
+        processor.offline_cache.mark_offline("b")
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_stream_info = AsyncMock(return_value=None)
+
+        await processor.process_stream_groups()
+
+        processor.fetcher.probe_stream_info.assert_called_once_with("a")
+
+
+class TestRefreshTiers:
+    """Tests for reusing recent results of live channels."""
+
+    def make_processor(self) -> StreamProcessor:
+        """Helper to create a processor with refresh tiers over two levels."""
+        config = make_config(
+            priorities={
+                999: [StreamGroup(urls=["a"], rulesets=[])],
+                100: [StreamGroup(urls=["b", "c"], rulesets=[])],
+            }
+        )
+        config.refresh_tiers.enabled = True
+        config.refresh_tiers.settle = 0
+        processor = StreamProcessor(config)
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_stream_info = AsyncMock(
+            side_effect=lambda url: make_stream(url.upper(), "Games")
+        )
+        processor.fetcher.resolve_stream = AsyncMock(side_effect=resolve_playlist)
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_stable_channels_reused(self):
+        """Live channels outside the quad should not be re-probed or re-resolved."""
+        processor = self.make_processor()
+        await processor.process_stream_groups()
+        processor.fetcher.probe_stream_info.reset_mock()
+        processor.fetcher.resolve_stream.reset_mock()
+
+        results = await processor.process_stream_groups()
+
+        processor.fetcher.probe_stream_info.assert_not_called()
+        processor.fetcher.resolve_stream.assert_not_called()
+        assert {r.stream.metadata.author for r in results} == {"A", "B", "C"}
+        assert all(r.stream.master_url for r in results)
+        assert processor.refresh.stats()["hits"] == 3
+
+    @pytest.mark.asyncio
+    async def test_quad_members_always_probed(self):
+        """Channels in the quad should be probed every cycle."""
+        processor = self.make_processor()
+        builder = QuadBuilder(processor.config)
+        await processor.process_stream_groups(builder)
+        builder.previous_positions = {"b": 0}
+        processor.fetcher.probe_stream_info.reset_mock()
+
+        await processor.process_stream_groups(builder)
+
+        processor.fetcher.probe_stream_info.assert_called_once_with("b")
+
+    @pytest.mark.asyncio
+    async def test_due_tier_probed(self):
+        """The top level should be re-probed once its shorter age passes."""
+        processor = self.make_processor()
+        with patch("quadlink.stream.refresh.time.monotonic", return_value=0.0):
+            await processor.process_stream_groups()
+        processor.fetcher.probe_stream_info.reset_mock()
+
+        # two levels: 999 reuses for 60s, 100 for 120s
+        with patch("quadlink.stream.refresh.time.monotonic", return_value=90.0):
+            await processor.process_stream_groups()
+
+        processor.fetcher.probe_stream_info.assert_called_once_with("a")
+
+    @pytest.mark.asyncio
+    async def test_bypass_priority_always_probes(self):
+        """Groups at or above bypass_priority should ignore reuse."""
+        processor = self.make_processor()
+        processor.config.refresh_tiers.bypass_priority = 900
+        await processor.process_stream_groups()
+        processor.fetcher.probe_stream_info.reset_mock()
+
+        await processor.process_stream_groups()
+
+        processor.fetcher.probe_stream_info.assert_called_once_with("a")
+
+    @pytest.mark.asyncio
+    async def test_disabling_drops_state(self):
+        """Disabling refresh tiers on reload should probe everything again."""
+        processor = self.make_processor()
+        await processor.process_stream_groups()
+
+        new_config = processor.config.model_copy(deep=True)
+        new_config.refresh_tiers.enabled = False
+        await processor.apply_config(new_config)
+
+        assert processor.refresh is None
+
+
+class TestMetrics:
+    """Tests for probe latency and filter time reporting."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_latency_by_outcome(self):
+        """Each probe should be observed as live, offline, or error."""
+
+        async def probe(url):
+            if url == "broken":
+                raise RuntimeError("boom")
+            return make_stream("Live", "Games") if url == "live" else None
+
+        config = make_config(
+            priorities={100: [StreamGroup(urls=["live", "offline", "broken"], rulesets=[])]}
+        )
+        metrics = Metrics()
+        processor = StreamProcessor(config, metrics=metrics)
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_stream_info = AsyncMock(side_effect=probe)
+        processor.fetcher.resolve_stream = AsyncMock(side_effect=resolve_playlist)
+
+        await processor.process_stream_groups()
+
+        assert metrics.fetch_seconds.count(outcome="live") == 1
+        assert metrics.fetch_seconds.count(outcome="offline") == 1
+        assert metrics.fetch_seconds.count(outcome="error") == 1
+        assert processor.filter_time > 0
+
+    @pytest.mark.asyncio
+    async def test_gql_batch_observed_per_channel(self):
+        """A batched probe should be observed once for each channel it looked up."""
+        config = make_config(priorities={100: [StreamGroup(urls=["a", "b", "c"], rulesets=[])]})
+        config.fetcher_backend = "gql"
+        metrics = Metrics()
+        processor = StreamProcessor(config, metrics=metrics)
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_many = AsyncMock(
+            return_value={"a": make_stream("A", "Games"), "b": None, "c": None}
+        )
+        processor.fetcher.resolve_many = AsyncMock(return_value=[None])
+
+        await processor.process_stream_groups()
+
+        assert metrics.fetch_seconds.count(outcome="live") == 1
+        assert metrics.fetch_seconds.count(outcome="offline") == 2
+
+    @pytest.mark.asyncio
+    async def test_gql_batch_failure_observed_as_error(self):
+        """A failed batch should be observed as an error for each channel."""
+        config = make_config(priorities={100: [StreamGroup(urls=["a", "b"], rulesets=[])]})
+        config.fetcher_backend = "gql"
+        metrics = Metrics()
+        processor = StreamProcessor(config, metrics=metrics)
+        processor.fetcher = MagicMock()
+        processor.fetcher.probe_many = AsyncMock(side_effect=RuntimeError("boom"))
+
+        await processor.process_stream_groups()
+
+        assert metrics.fetch_seconds.count(outcome="error") == 2
+
+
+class TestApplyConfig:
+    """Tests for hot-applying a reloaded config."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_fetcher_and_caches(self):
+        """Unrelated changes should keep the fetcher, pool, and offline cache."""
+        config = make_config()
+        config.offline_cache.enabled = True
+        processor = StreamProcessor(config)
+        fetcher, executor = processor.fetcher, processor.fetcher.executor
+        processor.offline_cache.mark_offline("a")
+
+        new_config = config.model_copy(update={"diversity_bonus": 5, "low_latency": False})
+        await processor.apply_config(new_config)
+
+        assert processor.config is new_config
+        assert processor.filter.config is new_config
+        assert processor.fetcher is fetcher
+        assert fetcher.executor is executor
+        assert fetcher.low_latency is False
+        assert processor.offline_cache.is_offline("a") is True
+        await processor.close()
+
+    @pytest.mark.asyncio
+    async def test_resizes_pool_on_concurrency_change(self):
+        """Changing max_concurrent should resize the pool and semaphore."""
+        config = make_config()
+        processor = StreamProcessor(config)
+        fetcher = processor.fetcher
+
+        await processor.apply_config(config.model_copy(update={"max_concurrent": 8}))
+
+        assert processor.fetcher is fetcher
+        assert fetcher.max_workers == 8
+        assert fetcher.executor._max_workers == 8
+        assert processor.semaphore._value == 8
+        await processor.close()
+
+    @pytest.mark.asyncio
+    async def test_recreates_fetcher_on_backend_change(self):
+        """Changing the backend should replace the fetcher."""
+        config = make_config()
+        processor = StreamProcessor(config)
+        old_fetcher = processor.fetcher
+
+        await processor.apply_config(config.model_copy(update={"fetcher_backend": "gql"}))
+
+        assert isinstance(processor.fetcher, TwitchGQLFetcher)
+        assert old_fetcher.executor._shutdown is True
+
+    @pytest.mark.asyncio
+    async def test_disabling_offline_cache(self):
+        """Disabling the offline cache should detach it from the fetcher."""
+        config = make_config()
+        config.offline_cache.enabled = True
+        processor = StreamProcessor(config)
+
+        new_config = config.model_copy(deep=True)
+        new_config.offline_cache.enabled = False
+        await processor.apply_config(new_config)
+
+        assert processor.offline_cache is None
+        assert processor.fetcher.offline_cache is None
+        await processor.close()
@@ -0,0 +1,148 @@
+"""Tests for per-channel refresh tiers."""
+
+from unittest.mock import patch
+
+import pytest
+
+from quadlink.stream.refresh import RefreshTracker
+from quadlink.types import Metadata, Stream
+
+
+def make_stream(author: str, category: str = "Games", master_url: str | None = None) -> Stream:
+    """Helper to create a stream."""
+    return Stream(
+        url=f"https://twitch.tv/{author.lower()}",
+        metadata=Metadata(author=author, category=category, title="Test"),
+        master_url=master_url,
+    )
+
+
+def at(now: float):
+    """Patch the tracker's clock."""
+    return patch("quadlink.stream.refresh.time.monotonic", return_value=now)
+
+
+def settled_tracker(**kwargs) -> RefreshTracker:
+    """Helper to create a tracker with a live channel probed twice, past settle."""
+    kwargs.setdefault("max_age", 120)
+    kwargs.setdefault("settle", 60)
+    tracker = RefreshTracker(**kwargs)
+    with at(0.0):
+        tracker.record("streamer", make_stream("Streamer"), cost=0.1)
+    with at(100.0):
+        tracker.record("streamer", make_stream("Streamer"), cost=0.1)
+    return tracker
+
+
+class TestRefreshTracker:
+    """Tests for RefreshTracker."""
+
+    def test_unknown_channel_is_miss(self):
+        """Channels never probed should be probed."""
+        tracker = RefreshTracker()
+
+        assert tracker.reusable("streamer", 1.0, set()) is None
+        assert tracker.stats()["misses"] == 1
+
+    def test_settled_live_channel_reused(self):
+        """A live channel past settle should reuse its result until max_age."""
+        tracker = settled_tracker()
+
+        with at(219.0):
+            stream = tracker.reusable("https://twitch.tv/Streamer/", 1.0, set())
+        with at(221.0):
+            expired = tracker.reusable("streamer", 1.0, set())
+
+        assert stream is not None and stream.metadata.author == "Streamer"
+        assert expired is None
+        assert tracker.hits == 1
+
+    def test_recently_live_channel_probed(self):
+        """Channels that just went live should be probed every cycle."""
+        tracker = RefreshTracker(max_age=120, settle=60)
+        with at(0.0):
+            tracker.record("streamer", None, cost=0.1)
+        with at(10.0):
+            tracker.record("streamer", make_stream("Streamer"), cost=0.1)
+
+        with at(30.0):
+            assert tracker.reusable("streamer", 1.0, set()) is None
+        with at(71.0):
+            assert tracker.reusable("streamer", 1.0, set()) is not None
+
+    def test_category_change_restarts_settle(self):
+        """A category change should count as a transition."""
+        tracker = settled_tracker()
+        with at(150.0):
+            tracker.record("streamer", make_stream("Streamer", "Music"), cost=0.1)
+
+        with at(160.0):
+            assert tracker.reusable("streamer", 1.0, set()) is None
+
+    def test_offline_channel_probed(self):
+        """Offline results should never be reused."""
+        tracker = RefreshTracker(settle=0)
+        tracker.record("streamer", None, cost=0.1)
+
+        assert tracker.reusable("streamer", 1.0, set()) is None
+
+    def test_quad_member_probed(self):
+        """Channels in the current quad should be probed every cycle."""
+        tracker = settled_tracker()
+
+        with at(110.0):
+            assert tracker.reusable("streamer", 1.0, {"streamer"}) is None
+
+    def test_tier_scales_age(self):
+        """Higher priority tiers should reuse results for a fraction of max_age."""
+        tracker = settled_tracker()
+
+        with at(150.0):
+            assert tracker.reusable("streamer", 0.25, set()) is None
+            assert tracker.reusable("streamer", 0.5, set()) is not None
+
+    def test_slow_probes_reused_longer(self):
+        """Channels with slow probes should keep results twice as long."""
+        tracker = RefreshTracker(max_age=120, settle=0, slow_fetch=1.0)
+        with at(0.0):
+            tracker.record("streamer", make_stream("Streamer"), cost=5.0)
+
+        with at(200.0):
+            assert tracker.reusable("streamer", 1.0, set()) is not None
+        with at(241.0):
+            assert tracker.reusable("streamer", 1.0, set()) is None
+
+    def test_resolved_playlist_kept(self):
+        """Reused results should carry the last resolved playlist."""
+        tracker = settled_tracker()
+        tracker.record_resolved(make_stream("Streamer", master_url="https://playlist.m3u8"))
+
+        with at(110.0):
+            stream = tracker.reusable("streamer", 1.0, set())
+
+        assert stream is not None and stream.master_url == "https://playlist.m3u8"
+
+    def test_retain_forgets_removed_channels(self):
+        """Channels no longer configured should be dropped."""
+        tracker = RefreshTracker()
+        tracker.record("a", make_stream("A"), cost=0.1)
+        tracker.record("b", make_stream("B"), cost=0.1)
+
+        tracker.retain(["https://twitch.tv/a"])
+
+        assert tracker.stats()["size"] == 1
+
+    def test_snapshot_restore(self):
+        """Restored state should keep streams, playlists, and probe ages."""
+        tracker = settled_tracker()
+        tracker.record_resolved(make_stream("Streamer", master_url="https://playlist.m3u8"))
+
+        restored = RefreshTracker(max_age=120, settle=60)
+        restored.restore(tracker.snapshot())
+
+        original = tracker._entries["https://twitch.tv/streamer"]
+        entry = restored._entries["https://twitch.tv/streamer"]
+        assert entry.stream == make_stream("Streamer", master_url="https://playlist.m3u8")
+        assert entry.probed_at == pytest.approx(original.probed_at, abs=0.01)
+        assert entry.changed_at == pytest.approx(original.changed_at, abs=0.01)
+        assert entry.cost == original.cost
@@ -0,0 +1,298 @@
+"""Tests for background webhook delivery."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from quadlink.config.models import Webhook
+from quadlink.metrics import Metrics
+from quadlink.types import Quad
+from quadlink.webhook import WebhookDispatcher
+
+
+def make_dispatcher(**kwargs) -> WebhookDispatcher:
+    """Helper to create a dispatcher for one endpoint."""
+    kwargs.setdefault("url", "https://webhook.example.com")
+    return WebhookDispatcher(Webhook(enabled=True, **kwargs))
+
+
+def mock_http_client(status_code: int = 200, side_effect=None) -> AsyncMock:
+    """Helper to create a mock HTTP client returning a fixed status."""
+    mock_response = MagicMock()
+    mock_response.status_code = status_code
+    mock_client = AsyncMock()
+    mock_client.post.return_value = mock_response
+    if side_effect is not None:
+        mock_client.post.side_effect = side_effect
+    return mock_client
+
+
+class TestWebhookConfig:
+    """Tests for webhook endpoint configuration."""
+
+    def test_endpoints_include_url_and_urls(self):
+        """url and urls should be merged in order without duplicates."""
+        webhook = Webhook(url="https://a", urls=["https://b", "https://a", "https://c"])
+        assert webhook.endpoints == ["https://a", "https://b", "https://c"]
+
+    def test_empty_url_skipped(self):
+        """An empty url should not become an endpoint."""
+        assert Webhook(url="", urls=["https://b"]).endpoints == ["https://b"]
+        assert Webhook().endpoints == []
+
+
+class TestSend:
+    """Tests for single webhook requests."""
+
+    @pytest.mark.asyncio
+    async def test_successful_webhook(self):
+        """Should return True on successful webhook."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(200)
+
+        result = await dispatcher._send("https://webhook.example.com", None)
+
+        assert result is True
+
+    @pytest.mark.asyncio
+    async def test_webhook_with_quad(self):
+        """Should include quad in payload when provided."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(200)
+
+        result = await dispatcher._send("https://webhook.example.com", Quad(stream1="https://s1"))
+
+        payload = dispatcher._client.post.call_args[1]["json"]
+        assert payload["event"] == "quad_updated"
+        assert payload["quad"]["stream1"] == "https://s1"
+        assert result is True
+
+    @pytest.mark.asyncio
+    async def test_webhook_accepts_multiple_success_codes(self):
+        """Should accept 200, 201, 202, 204 as success."""
+        dispatcher = make_dispatcher()
+
+        for status_code in [200, 201, 202, 204]:
+            dispatcher._client = mock_http_client(status_code)
+            result = await dispatcher._send("https://webhook.example.com", None)
+            assert result is True, f"Status {status_code} should be success"
+
+    @pytest.mark.asyncio
+    async def test_webhook_failure_status(self):
+        """Should return False on failure status."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(500)
+
+        assert await dispatcher._send("https://webhook.example.com", None) is False
+
+    @pytest.mark.asyncio
+    async def test_webhook_timeout(self):
+        """Should return False on timeout."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(side_effect=httpx.TimeoutException("timeout"))
+
+        assert await dispatcher._send("https://webhook.example.com", None) is False
+
+    @pytest.mark.asyncio
+    async def test_webhook_request_error(self):
+        """Should return False on request error."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(side_effect=httpx.RequestError("connection failed"))
+
+        assert await dispatcher._send("https://webhook.example.com", None) is False
+
+    @pytest.mark.asyncio
+    async def test_webhook_unexpected_error(self):
+        """Should return False on unexpected error."""
+        dispatcher = make_dispatcher()
+        dispatcher._client = mock_http_client(side_effect=RuntimeError("unexpected"))
+
+        assert await dispatcher._send("https://webhook.example.com", None) is False
+
+    def test_client_uses_configured_timeout(self):
+        """The HTTP client should use the webhook timeout, not a default."""
+        dispatcher = make_dispatcher(timeout=3)
+
+        with patch("httpx.AsyncClient") as MockClient:
+            dispatcher._get_client()
+
+        MockClient.assert_called_once_with(timeout=3)
+
+
+class TestDispatch:
+    """Tests for background delivery."""
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_block(self):
+        """submit() should return before a slow receiver responds."""
+        dispatcher = make_dispatcher()
+        released = asyncio.Event()
+
+        async def slow_post(url, json):
+            await released.wait()
+            return MagicMock(status_code=200)
+
+        dispatcher._client = mock_http_client(side_effect=slow_post)
+
+        dispatcher.submit(Quad(stream1="https://s1"))
+        assert dispatcher.sent == 0
+
+        released.set()
+        assert await dispatcher.flush(timeout=1) is True
+        assert dispatcher.sent == 1
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_delivers_to_every_endpoint(self):
+        """Each configured endpoint should receive the notification."""
+        dispatcher = make_dispatcher(urls=["https://other.example.com"])
+        dispatcher._client = mock_http_client(200)
+
+        dispatcher.submit(Quad(stream1="https://s1"))
+        await dispatcher.flush(timeout=1)
+
+        urls = sorted(call.args[0] for call in dispatcher._client.post.call_args_list)
+        assert urls == ["https://other.example.com", "https://webhook.example.com"]
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesces_to_latest_quad(self):
+        """Quads queued behind a slow delivery should collapse to the latest."""
+        dispatcher = make_dispatcher()
+        released = asyncio.Event()
+
+        async def slow_post(url, json):
+            await released.wait()
+            return MagicMock(status_code=200)
+
+        dispatcher._client = mock_http_client(side_effect=slow_post)
+
+        dispatcher.submit(Quad(stream1="https://first"))
+        await asyncio.sleep(0)  # worker picks up the first quad
+        dispatcher.submit(Quad(stream1="https://second"))
+        dispatcher.submit(Quad(stream1="https://third"))
+
+        released.set()
+        await dispatcher.flush(timeout=1)
+
+        sent = [
+            call[1]["json"]["quad"]["stream1"] for call in dispatcher._client.post.call_args_list
+        ]
+        assert sent == ["https://first", "https://third"]
+        assert dispatcher.coalesced == 1
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff(self):
+        """Failed deliveries should be retried up to max_retries."""
+        dispatcher = make_dispatcher(max_retries=2)
+        dispatcher._client = mock_http_client(500)
+
+        with patch("quadlink.webhook.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            dispatcher.submit()
+            await dispatcher.flush(timeout=1)
+
+        assert dispatcher._client.post.call_count == 3
+        assert mock_sleep.await_count == 2
+        assert dispatcher.failed == 1
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_succeeds(self):
+        """A delivery that succeeds on retry should count as sent."""
+        dispatcher = make_dispatcher(max_retries=3)
+        dispatcher._client = mock_http_client(
+            side_effect=[MagicMock(status_code=500), MagicMock(status_code=200)]
+        )
+
+        with patch("quadlink.webhook.asyncio.sleep", new_callable=AsyncMock):
+            dispatcher.submit()
+            await dispatcher.flush(timeout=1)
+
+        assert dispatcher.sent == 1
+        assert dispatcher.failed == 0
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_latency_observed_per_attempt(self):
+        """Each request should be observed with its outcome."""
+        metrics = Metrics()
+        dispatcher = WebhookDispatcher(
+            Webhook(enabled=True, url="https://webhook.example.com", max_retries=3),
+            metrics=metrics,
+        )
+        dispatcher._client = mock_http_client(
+            side_effect=[MagicMock(status_code=500), MagicMock(status_code=200)]
+        )
+
+        with patch("quadlink.webhook.asyncio.sleep", new_callable=AsyncMock):
+            dispatcher.submit()
+            await dispatcher.flush(timeout=1)
+
+        assert metrics.webhook_seconds.count(outcome="error") == 1
+        assert metrics.webhook_seconds.count(outcome="ok") == 1
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_newer_quad_abandons_retries(self):
+        """Retries of a stale quad should stop once a newer quad is queued."""
+        dispatcher = make_dispatcher(max_retries=5)
+        dispatcher._client = mock_http_client(
+            side_effect=[MagicMock(status_code=500), MagicMock(status_code=200)]
+        )
+
+        async def submit_newer(delay):
+            dispatcher.submit(Quad(stream1="https://newer"))
+
+        with patch("quadlink.webhook.asyncio.sleep", side_effect=submit_newer):
+            dispatcher.submit(Quad(stream1="https://stale"))
+            await dispatcher.flush(timeout=1)
+
+        sent = [
+            call[1]["json"]["quad"]["stream1"] for call in dispatcher._client.post.call_args_list
+        ]
+        assert sent == ["https://stale", "https://newer"]
+        assert dispatcher.sent == 1
+        assert dispatcher.failed == 0
+        await dispatcher.close()
+
+    def test_backoff_is_capped_with_jitter(self):
+        """Backoff should double per attempt, stay under max_backoff, and be jittered."""
+        dispatcher = make_dispatcher(backoff=1.0, max_backoff=5.0)
+
+        with patch("quadlink.webhook.random.uniform", side_effect=lambda lo, hi: hi):
+            assert [dispatcher._backoff(n) for n in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+        assert all(0 <= dispatcher._backoff(3) <= 5.0 for _ in range(50))
+
+    @pytest.mark.asyncio
+    async def test_flush_timeout(self):
+        """flush() should give up after the timeout."""
+        dispatcher = make_dispatcher()
+
+        async def hang(url, json):
+            await asyncio.Event().wait()
+
+        dispatcher._client = mock_http_client(side_effect=hang)
+
+        dispatcher.submit()
+
+        assert await dispatcher.flush(timeout=0.01) is False
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_workers(self):
+        """close() should cancel workers and close the HTTP client."""
+        dispatcher = make_dispatcher()
+        http_client = mock_http_client(200)
+        dispatcher._client = http_client
+        dispatcher.submit()
+        workers = list(dispatcher._workers)
+
+        await dispatcher.close()
+
+        assert all(task.done() for task in workers)
+        assert dispatcher._client is None
+        http_client.aclose.assert_awaited_once()